@@ -1,23 +1,45 @@
 #!/usr/bin/env python
 """ """
 
+import importlib
 import logging
 import os
 import sys
 from argparse import ArgumentParser
 from collections import OrderedDict
+from io import BytesIO
+from xml.etree import ElementTree
 
-from PyQt5 import QtWidgets, uic
+from PyQt5 import QtCore, QtWidgets, uic
 
 import pyqtuidoc
+from pyqtuidoc._previous.Compiler.defaults import defaultValues
+from pyqtuidoc.uitree import parseUi, subtreeUi, uiDir
 
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "fakemods"))
 
 PROG = "qtuidocmake"
 
+# The sub-commands run as "qtuidocmake COMMAND ..." and the modules that
+# implement them. Each module provides cli(parser) and run(opts).
+COMMANDS = OrderedDict(
+    [
+        ("lint-perf", "perflint"),
+        ("extract", "extract"),
+        ("docs", "docs"),
+        ("regress", "regress"),
+        ("diff", "uidiff"),
+        ("gallery", "gallery"),
+    ]
+)
+
 
 def cli():
-    parser = ArgumentParser(prog="%s" % PROG)
+    parser = ArgumentParser(
+        prog="%s" % PROG,
+        epilog="commands (run '%s COMMAND -h' for help): %s"
+        % (PROG, ", ".join(COMMANDS)),
+    )
     group = parser.add_argument_group("paths and folders")
     group.add_argument("path", metavar="path", help="path to video file")
     group.add_argument(
@@ -28,6 +50,40 @@ def cli():
         default=False,
         help="show a preview of the UI instead of generating code",
     )
+    group.add_argument(
+        "--inspect",
+        dest="inspect",
+        action="store_true",
+        default=False,
+        help="show the UI with an interactive inspector of its object tree",
+    )
+    group.add_argument(
+        "--profile",
+        dest="profile",
+        action="store_true",
+        default=False,
+        help="create the form from code with timing probes and report the cost of each container",
+    )
+    group.add_argument(
+        "--profile-runs",
+        dest="profile_runs",
+        type=int,
+        default=10,
+        metavar="N",
+        help="average the profile over N creations of the form [default: 10]",
+    )
+    group.add_argument(
+        "--profile-out",
+        dest="profile_out",
+        metavar="FILE",
+        help="also write the profile to FILE in the folded stack format of flame graph tools",
+    )
+    group.add_argument(
+        "--root",
+        dest="root",
+        metavar="OBJECTNAME",
+        help="only load the widget or layout OBJECTNAME and its descendants",
+    )
     group.add_argument(
         "-o",
         "--output",
@@ -103,9 +159,83 @@ def cli():
     return parser
 
 
+# The properties and their default values of each class of dumped object, so
+# that the meta-object of a class is only introspected once.
+_CLASS_DEFAULTS = {}
+
+# The default of properties of classes that can't be default-constructed.
+_NO_DEFAULT = object()
+
+
+def classDefaults(cls):
+    """
+    Return the properties of a QObject class that can be set in Designer and
+    their values in a default-constructed instance.
+    Args:
+        cls[type]: The QObject subclass.
+    Returns:
+        A list of (QMetaProperty, default) tuples. If the class can't be
+        constructed without arguments then the defaults are those of the
+        nearest base class that can, or a placeholder that matches no value.
+    """
+    defaults = _CLASS_DEFAULTS.get(cls)
+    if defaults is None:
+        meta = cls.staticMetaObject
+        props = [meta.property(i) for i in range(meta.propertyCount())]
+        props = [p for p in props if p.isReadable() and p.isWritable() and p.isDesignable()]
+        values = None
+        # Only QObject bases share the meta-object, and e.g. a Python mixin
+        # must not be created in their place.
+        for base in cls.__mro__:
+            if issubclass(base, QtCore.QObject):
+                values = defaultValues(base)
+                if values is not None:
+                    break
+        values = values or {}
+        defaults = [(prop, values.get(prop.name(), _NO_DEFAULT)) for prop in props]
+        _CLASS_DEFAULTS[cls] = defaults
+    return defaults
+
+
+def sameValue(a, b):
+    if a is b:
+        return True
+    try:
+        if a == b:
+            return True
+    except TypeError:
+        return False
+    # Null icons, pixmaps etc. don't compare equal to each other.
+    is_null = getattr(a, "isNull", None)
+    return type(a) is type(b) and is_null is not None and is_null() and b.isNull()
+
+
 def dumpQObject(qobject):
-    OrderedDict()
-    # if 'toolTip' in
+    """
+    Return the properties of an object that differ from the defaults of its
+    class, followed by its dynamic properties.
+    Args:
+        qobject[QObject]: The object.
+    Returns:
+        An OrderedDict of the values by property name.
+    """
+    dump = OrderedDict()
+    for prop, default in classDefaults(type(qobject)):
+        value = prop.read(qobject)
+        if default is _NO_DEFAULT or not sameValue(value, default):
+            dump[prop.name()] = value
+    for name in qobject.dynamicPropertyNames():
+        name = bytes(name).decode("utf-8", "replace")
+        # Skip those Qt uses internally.
+        if not name.startswith("_q_"):
+            dump[name] = qobject.property(name)
+    return dump
+
+
+def formatQObject(qobject):
+    """Return the class and the non-default properties of an object as one line."""
+    props = ", ".join("%s=%r" % item for item in dumpQObject(qobject).items())
+    return "%s%s" % (qobject.metaObject().className(), ": " + props if props else "")
 
 
 def dumpQObjectTree(qobject, level=0):
@@ -118,7 +248,7 @@ def dumpQObjectTree(qobject, level=0):
     """
 
     if level == 0:
-        print("+ " + qobject.objectName() + " (" + str(type(qobject)) + ")")
+        print("+ " + qobject.objectName() + " (" + formatQObject(qobject) + ")")
 
     children = qobject.children()
     n = len(children)
@@ -132,36 +262,130 @@ def dumpQObjectTree(qobject, level=0):
             print("|  " * (level + 2))
             prefix = "|  " * (level + 1)
 
-        print(prefix + "+ " + child.objectName() + " (" + dumpQObject(qobject) + ")")
+        print(prefix + "+ " + child.objectName() + " (" + formatQObject(child) + ")")
         dumpQObjectTree(child, level + 1)
 
 
+def loadTree(uipath, root=None):
+    """
+    Parse a .ui file, or the part of it that a root is loaded from.
+    Args:
+        uipath[str]: The name of the .ui file.
+        root[str]: The optional object name of a widget or layout.
+    Returns:
+        The <ui> element.
+    """
+    ui = parseUi(uipath)
+    if root is not None:
+        ui = subtreeUi(ui, root, uiDir(uipath))
+    return ui
+
+
+def loadSubtree(uipath, root):
+    """
+    Load a widget or layout of a .ui file and its descendants, without
+    creating the rest of the form.
+    Args:
+        uipath[str]: The name of the .ui file.
+        root[str]: The object name of the widget or layout.
+    Returns:
+        The widget, or a plain QWidget containing the layout.
+    """
+    return uic.loadUi(BytesIO(ElementTree.tostring(loadTree(uipath, root))))
+
+
 class AppWindow(QtWidgets.QMainWindow):
-    def __init__(self, uipath):
+    def __init__(self, uipath, root=None):
         super().__init__()
-        self.ui = uic.loadUi(uipath, self)
+        if root is None:
+            self.ui = uic.loadUi(uipath, self)
+        else:
+            self.ui = loadSubtree(uipath, root)
+            self.setCentralWidget(self.ui)
+        # The top widget of the form.
+        self.form = self if root is None else self.ui
         # self.show()
 
 
-def main(*args, **kwargs):
-    parser = cli(*args, **kwargs)
-    opts = parser.parse_args()
-    opts.verbose = 40 - (10 * opts.verbose) if opts.verbose > 0 else 0
+def setupLogging(verbose):
     logging.basicConfig(
-        level=opts.verbose,
+        level=40 - (10 * verbose) if verbose > 0 else 0,
         format="%(asctime)s %(levelname)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
+
+
+def runCommand(name, argv):
+    """
+    Run a sub-command.
+    Args:
+        name[str]: The name of the command.
+        argv[list]: The command-line arguments following the name.
+    Returns:
+        The exit status.
+    """
+    module = importlib.import_module(".%s" % COMMANDS[name], "pyqtuidoc")
+    parser = ArgumentParser(prog="%s %s" % (PROG, name))
+    module.cli(parser)
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=1,
+        help="-v show progress, -vv show debug",
+    )
+    opts = parser.parse_args(argv)
+    setupLogging(opts.verbose)
+    logging.debug("Running %s with options:\n%s" % (name, repr(vars(opts))))
+    return module.run(opts)
+
+
+def main(*args, **kwargs):
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        sys.exit(runCommand(sys.argv[1], sys.argv[2:]))
+
+    parser = cli(*args, **kwargs)
+    opts = parser.parse_args()
+    setupLogging(opts.verbose)
     opts = vars(opts)
     logging.debug("Running with options:\n%s" % repr(opts))
     del opts["verbose"]
 
-    QtWidgets.QApplication(sys.argv)
-    w = AppWindow(opts["path"])
-    print(dir(w))
-    help(w)
-    # dumpQObjectTree(w)
-    # sys.exit(app.exec_())
+    app = QtWidgets.QApplication(sys.argv)
+    if opts["profile"]:
+        from .probes import formatTree, profileUi, writeFolded
+
+        runs = max(1, opts["profile_runs"])
+        tree, widget, uiclass = profileUi(opts["path"], runs, root=opts["root"])
+        sys.stdout.write(formatTree(tree, runs))
+        if opts["profile_out"]:
+            with open(opts["profile_out"], "w", encoding="utf-8") as f:
+                writeFolded(tree, f, uiclass, runs)
+        if not opts["preview"]:
+            sys.exit(0)
+        widget.show()
+        sys.exit(app.exec_())
+    w = AppWindow(opts["path"], opts["root"])
+    if opts["inspect"]:
+        from .inspector import InspectorWindow
+
+        inspector = InspectorWindow(w.form)
+        w.show()
+        inspector.show()
+        sys.exit(app.exec_())
+    if opts["preview"]:
+        from .hotreload import FormReloader
+
+        # Edits to the .ui file are applied to the running preview.
+        reloader = FormReloader(
+            opts["path"],
+            w,
+            lambda: AppWindow(opts["path"], opts["root"]),
+            lambda: loadTree(opts["path"], opts["root"]),
+        )
+        w.show()
+        sys.exit(app.exec_())
+    dumpQObjectTree(w.form)
 
 
 if __name__ == "__main__":
@@ -40,13 +40,68 @@
 
 import sys
 
+from ...uitree import (pixmapNames, subtreeConnections, subtreeResources,
+        subtreeTabstops, subtreeWidget, uiDir)
 from ..properties import Properties
 from ..uiparser import UIParser
 from . import qtproxies
-from .indenter import createCodeIndenter, getIndenter, write_code
+from .indenter import (createCodeRecorder, getIndenter, write_code,
+        _IndentedCodeWriter)
+from .passes import GeneratedCode, Pipeline
 from .qobjectcreator import CompilerCreatorPolicy
 
 
+# The Qt bindings that code can be generated for.
+BINDINGS = ("PyQt5", "PySide2")
+
+_BINDING_IMPORT = "from %s import QtCore, QtGui, QtWidgets"
+
+
+class CompiledForm(object):
+    """ The result of parsing a .ui file.  It can be written as Python code
+    any number of times with different options without parsing the .ui file
+    again.
+    """
+
+    def __init__(self, lines, resources, winfo):
+        self.lines = lines
+        self.resources = resources
+        self.winfo = winfo
+
+        # The time taken by each pass, if the form was just parsed.
+        self.timings = {}
+
+    def write(self, output_stream, from_imports=False, resource_suffix='_rc', import_from='.', indent=None, binding="PyQt5"):
+        """ Write the code to a stream.  If indent is None then the current
+        indentation width of the indenter module is used.
+        """
+
+        if binding not in BINDINGS:
+            raise ValueError("unsupported binding %s" % binding)
+
+        writer = _IndentedCodeWriter(output_stream, indent)
+        binding_import = _BINDING_IMPORT % "PyQt5"
+
+        for level, line in self.lines:
+            if line == binding_import:
+                line = _BINDING_IMPORT % binding
+
+            writer.level = level
+            writer.write(line)
+
+        writer.level = 0
+
+        # The modules are sorted by name, as by pyuic5, once the suffix is
+        # known.
+        for res in sorted(res + resource_suffix for res in self.resources):
+            if from_imports:
+                writer.write("from %s import %s" % (import_from, res))
+            else:
+                writer.write("import %s" % res)
+
+        return dict(self.winfo)
+
+
 class UICompiler(UIParser):
     def __init__(self):
         UIParser.__init__(self, qtproxies.QtCore, qtproxies.QtGui,
@@ -56,6 +111,51 @@ class UICompiler(UIParser):
         qtproxies.i18n_strings = []
         UIParser.reset(self)
 
+    def createUserInterface(self, elem):
+        if self._root is not None:
+            elem = self._root_widget = subtreeWidget(elem, self._root)
+
+        self._pipeline.runTree(elem)
+
+        UIParser.createUserInterface(self, elem)
+
+    def createWidget(self, elem):
+        self._recordContainer(UIParser.createWidget, elem)
+
+    def createLayout(self, elem):
+        self._recordContainer(UIParser.createLayout, elem)
+
+    widgetTreeItemHandlers = dict(UIParser.widgetTreeItemHandlers,
+            widget=createWidget, layout=createLayout)
+
+    def _recordContainer(self, handler, elem):
+        """ Create a container and record the range of the lines of its code.
+        """
+
+        start = len(self._recorder.lines)
+        handler(self, elem)
+        self._containers.append((start, len(self._recorder.lines),
+                elem.attrib.get('name')))
+
+    def createConnections(self, elem):
+        if self._root is not None:
+            elem = subtreeConnections(elem, self._root_widget, self.uiname)
+
+        UIParser.createConnections(self, elem)
+
+    def setTaborder(self, elem):
+        if self._root is not None:
+            elem = subtreeTabstops(elem, self._root_widget)
+
+        UIParser.setTaborder(self, elem)
+
+    def readResources(self, elem):
+        if self._root is not None:
+            elem = subtreeResources(elem, pixmapNames(self._root_widget),
+                    self._ui_dir)
+
+        UIParser.readResources(self, elem)
+
     def setContext(self, context):
         qtproxies.i18n_context = context
 
@@ -63,7 +163,7 @@ class UICompiler(UIParser):
         indenter = getIndenter()
         indenter.level = 0
 
-        indenter.write("from PyQt5 import QtCore, QtGui, QtWidgets")
+        indenter.write(_BINDING_IMPORT % "PyQt5")
         indenter.write("")
 
         indenter.write("")
@@ -106,18 +206,58 @@ class UICompiler(UIParser):
         self._resources = self.resources
         self._resources.sort()
 
-    def compileUi(self, input_stream, output_stream, from_imports, resource_suffix, import_from):
-        createCodeIndenter(output_stream)
-        w = self.parse(input_stream, resource_suffix)
+    def parseUi(self, input_stream, hoist_stylesheets=None, share_values=None, root=None, split_lines=None, probes=False, wire_slots=None, elide_defaults=None, optimize=0):
+        """ Parse a .ui file and return the corresponding CompiledForm.  If
+        hoist_stylesheets is set then the style sheets of the widgets are
+        combined into a single style sheet set on the top-level widget.  If
+        share_values is set then identical fonts, palettes and size policies
+        are only created once.  If root is the name of a widget or layout then
+        only it and its descendants are compiled as the top-level widget.  If
+        split_lines is not 0 then the code of each container with at least
+        that many lines is moved from setupUi() to a helper method.  If probes
+        is set then timing probes are added around the code of each container
+        and of setupUi() and retranslateUi().  If wire_slots is a class or a
+        string of the form 'module:Class' then the on_<object>_<signal> slots
+        of that class are connected explicitly instead of by
+        connectSlotsByName().  If elide_defaults is set then setters that set
+        a property to its default value are dropped from setupUi().  If it is
+        a string then it is the directory the default values are kept in.
+        optimize is the optimization level that enables the passes whose
+        arguments are None.  A pass whose argument is False or 0 is never run.
+        The time taken by each pass is in the
+        form's timings.
+        """
+
+        self._pipeline = Pipeline(optimize,
+                hoist_stylesheets=hoist_stylesheets,
+                share_values=share_values, split_lines=split_lines,
+                probes=probes, wire_slots=wire_slots,
+                elide_defaults=elide_defaults)
+        self._root = root
+        self._ui_dir = uiDir(input_stream)
+        recorder = self._recorder = createCodeRecorder()
+        self._containers = []
+
+        # The resource suffix is added when the code is written.
+        w = self.parse(input_stream, '')
 
         self.factory._cpolicy._writeOutImports()
 
-        for res in self._resources:
-            if from_imports:
-                write_code("from %s import %s" % (import_from, res))
-            else:
-                write_code("import %s" % res)
+        winfo = {"widgetname": str(w),
+                 "uiclass" : w.uiclass,
+                 "baseclass" : w.baseclass,
+                 "modules" : self.factory._cpolicy._usedModules()}
+
+        code = GeneratedCode(recorder.lines, self._containers, winfo)
+        self._pipeline.runCode(code)
+
+        form = CompiledForm(code.lines, self._resources, winfo)
+        form.timings = self._pipeline.timings
+
+        return form
+
+    def compileUi(self, input_stream, output_stream, from_imports, resource_suffix, import_from):
+        form = self.parseUi(input_stream)
 
-        return {"widgetname": str(w),
-                "uiclass" : w.uiclass,
-                "baseclass" : w.baseclass}
+        return form.write(output_stream, from_imports, resource_suffix,
+                          import_from)
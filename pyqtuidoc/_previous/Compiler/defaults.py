@@ -0,0 +1,362 @@
+"""
+Support for removing the setting of properties to their default values from
+the generated setupUi().
+
+Designer often saves properties whose values are the defaults of the widget,
+and a setter is called for each one every time a form is created.  The
+default values of the properties of each Qt class are found by creating
+instances of it, once per version of the bindings, and are kept on disk.  A
+setter is dropped if it sets a property of an object created by the form to
+the value it already has.
+
+Only the properties that have the same default in a widget without a parent
+and in one in a dialog are considered, so that defaults that depend on the
+parent (e.g. QPushButton.autoDefault) are kept.  Properties that are
+inherited from the parent or that are re-read from the style unless they have
+been set (e.g. font and QTabWidget.elideMode) are never dropped.  The setters
+of the top-level widget are kept, as it may be of a sub-class whose
+constructor has changed them.  If the application running is not a
+QApplication then no widgets can be created and only the classes whose
+default values are already on disk are considered.  If there is no
+application then one is created while the default values of a class are
+found and is destroyed afterwards.
+"""
+
+
+import contextlib
+import json
+import logging
+import os
+import re
+
+
+logger = logging.getLogger(__name__)
+DEBUG = logger.debug
+
+
+# Changing this rebuilds the tables of default values.
+DEFAULTS_VERSION = 1
+
+# The properties whose values are inherited, come from the style or depend on
+# when they are set.
+_EXCLUDED = frozenset((
+    'cursor', 'elideMode', 'font', 'geometry', 'horizontalSpacing',
+    'layoutDirection', 'locale', 'margin', 'objectName', 'palette', 'pos',
+    'size', 'spacing', 'styleSheet', 'usesScrollButtons', 'verticalSpacing',
+    'visible', 'windowIcon', 'windowTitle'))
+
+_create_re = re.compile(r'^(self\.\w+) = QtWidgets\.(\w+)\(')
+_setter_re = re.compile(r'^(self\.\w+)\.set(\w+)\((.+)\)$')
+
+
+def defaultsDir():
+    """defaultsDir() -> str
+
+    Return the directory the tables of default values are kept in if none is
+    given.
+    """
+
+    base = os.environ.get('PYQTUIDOC_CACHE_DIR') or os.path.join(
+            os.path.expanduser('~'), '.cache', 'pyqtuidoc')
+
+    return os.path.join(base, 'defaults')
+
+
+def defaultValues(cls, parent=None):
+    """defaultValues(cls, parent=None) -> dict
+
+    Return the values of the readable and writable properties of a new
+    instance of a QObject sub-class by name, or None if the class can't be
+    created with parent as its only argument.  The instance is deleted
+    afterwards.  The caller must make sure there is an application that can
+    create instances of the class.
+    """
+
+    from PyQt5 import QtCore
+
+    try:
+        instance = cls() if parent is None else cls(parent)
+    except Exception as e:
+        DEBUG("unable to create a %s: %s" % (cls.__name__, e))
+        return None
+
+    values = {}
+    meta = instance.metaObject()
+
+    for i in range(meta.propertyCount()):
+        prop = meta.property(i)
+
+        if prop.isReadable() and prop.isWritable():
+            values[prop.name()] = instance.property(prop.name())
+
+    instance.deleteLater()
+    QtCore.QCoreApplication.sendPostedEvents(None,
+            QtCore.QEvent.DeferredDelete)
+
+    return values
+
+
+@contextlib.contextmanager
+def _application():
+    """ A context manager that makes sure there is an application, creating
+    a QApplication that renders offscreen if there is none and destroying it
+    on exit.
+    """
+
+    from PyQt5 import QtWidgets
+
+    if QtWidgets.QApplication.instance() is not None:
+        yield
+        return
+
+    app = QtWidgets.QApplication(['pyqtuidoc', '-platform', 'offscreen'])
+
+    try:
+        yield
+    finally:
+        # The wrapper owns the application so this destroys it.
+        del app
+
+
+def _canCreateWidgets():
+    """ Return True if widgets can be created to find their default values.
+    They can't if the application is a QCoreApplication or a QGuiApplication
+    as creating a widget would then abort the process.
+    """
+
+    from PyQt5 import QtCore, QtWidgets
+
+    app = QtCore.QCoreApplication.instance()
+
+    return app is None or isinstance(app, QtWidgets.QApplication)
+
+
+def _canonical(value):
+    """ Return a value as something that can be compared and saved as JSON,
+    or None if it can't be.
+    """
+
+    from PyQt5 import QtCore
+
+    if isinstance(value, bool):
+        return ['bool', value]
+
+    if isinstance(value, float):
+        return ['float', value]
+
+    if isinstance(value, str):
+        return ['str', value]
+
+    if isinstance(value, (QtCore.QSize, QtCore.QSizeF, QtCore.QPoint,
+            QtCore.QPointF, QtCore.QRect)):
+        return [type(value).__name__] + list(value.__reduce__()[1])
+
+    # Integers, enums and flags.
+    try:
+        return ['int', int(value)]
+    except (TypeError, ValueError):
+        return None
+
+
+class DefaultsTable(object):
+    """ The default values of the properties of Qt widget and layout classes
+    for the installed version of the bindings.
+    """
+
+    def __init__(self, directory=None):
+        """ Initialise the table.  directory is the name of the directory
+        the table is kept in.  If it is None then defaultsDir() is used.
+        """
+
+        from PyQt5.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+
+        if directory is None:
+            directory = defaultsDir()
+
+        self.path = os.path.join(directory, 'defaults-%d-PyQt5-%s-Qt-%s.json' % (
+                DEFAULTS_VERSION, PYQT_VERSION_STR, QT_VERSION_STR))
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as table_file:
+                self._classes = json.load(table_file)
+        except (OSError, ValueError):
+            self._classes = {}
+
+        self._changed = False
+
+    def defaults(self, class_name):
+        """ Return the dict of the canonical default values of the properties
+        of a class by name, or None if the class isn't known.
+        """
+
+        defaults = self._classes.get(class_name)
+
+        if defaults is None and class_name not in self._classes:
+            if not _canCreateWidgets():
+                DEBUG("unable to find the default property values of %s "
+                        "without a QApplication" % class_name)
+                return None
+
+            defaults = self._classes[class_name] = self._find(class_name)
+            self._changed = True
+
+        return defaults
+
+    def save(self):
+        """ Write the table if it has changed. """
+
+        if not self._changed:
+            return
+
+        from ..output import writeAtomic
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            writeAtomic(self.path, json.dumps(self._classes, indent=1,
+                    sort_keys=True).encode('utf-8'))
+            self._changed = False
+        except OSError as e:
+            logger.warning("unable to write %s: %s" % (self.path, e))
+
+    @staticmethod
+    def _find(class_name):
+        """ Return the default values of the properties of a class found by
+        creating instances of it.
+        """
+
+        from PyQt5 import QtCore, QtWidgets
+
+        cls = getattr(QtWidgets, class_name, None)
+        if not isinstance(cls, type) or not issubclass(cls, QtCore.QObject):
+            return None
+
+        DEBUG("finding the default property values of %s" % class_name)
+
+        with _application():
+            dialog = QtWidgets.QDialog()
+            plain = defaultValues(cls)
+            in_dialog = defaultValues(cls, dialog)
+            dialog.deleteLater()
+            QtCore.QCoreApplication.sendPostedEvents(None,
+                    QtCore.QEvent.DeferredDelete)
+
+            defaults = None
+
+            if plain is not None and in_dialog is not None:
+                defaults = {}
+
+                for name, value in plain.items():
+                    if name in _EXCLUDED:
+                        continue
+
+                    value = _canonical(value)
+
+                    if value is not None and value == _canonical(in_dialog[name]):
+                        defaults[name] = value
+
+            # Values such as icons must not outlive the application.
+            del plain, in_dialog
+
+        return defaults
+
+
+def _evaluate(code):
+    """ Return the canonical value of the argument of a setter or None if it
+    isn't a constant.
+    """
+
+    from PyQt5 import QtCore, QtGui, QtWidgets
+
+    try:
+        value = eval(code, {'__builtins__': {}},
+                {'QtCore': QtCore, 'QtGui': QtGui, 'QtWidgets': QtWidgets})
+    except Exception:
+        return None
+
+    if isinstance(value, tuple):
+        return None
+
+    return _canonical(value)
+
+
+def elideDefaults(lines, containers, directory=None):
+    """elideDefaults(lines, containers, directory=None) -> (list, list)
+
+    Return the recorded lines of generated code without the setters in
+    setupUi() that set properties to their default values, and the containers
+    with the ranges of their lines updated to match.
+
+    lines is the list of 2-tuples of indentation level and line of code.
+    containers is the list of 3-tuples of the index of the first line, the
+    index after the last line and the object name of each container.
+    directory is the name of the directory the table of default values is
+    kept in.  If it is None then defaultsDir() is used.
+    """
+
+    table = DefaultsTable(directory)
+
+    # The objects created by the form and the number of times each setter is
+    # called on each object.
+    created = {}
+    setters = {}
+
+    for level, line in lines:
+        match = _create_re.match(line)
+        if match is not None:
+            created[match.group(1)] = match.group(2)
+            continue
+
+        match = _setter_re.match(line)
+        if match is not None:
+            key = (match.group(1), match.group(2))
+            setters[key] = setters.get(key, 0) + 1
+
+    # Only the code of setupUi() is considered.
+    in_setup = False
+    dropped = set()
+
+    for i, (level, line) in enumerate(lines):
+        if level <= 1:
+            in_setup = (level == 1 and line.startswith('def setupUi('))
+            continue
+
+        if not in_setup:
+            continue
+
+        match = _setter_re.match(line)
+        if match is None:
+            continue
+
+        obj, setter, arg = match.groups()
+        class_name = created.get(obj)
+        if class_name is None or setters[(obj, setter)] != 1:
+            continue
+
+        defaults = table.defaults(class_name)
+        if not defaults:
+            continue
+
+        default = defaults.get(setter[0].lower() + setter[1:])
+        if default is not None and _evaluate(arg) == default:
+            dropped.add(i)
+
+    table.save()
+
+    if not dropped:
+        return lines, containers
+
+    DEBUG("dropped %d setters of default values" % len(dropped))
+
+    # The index of each line after the dropped lines have been removed.
+    new_index = []
+    count = 0
+    for i in range(len(lines) + 1):
+        new_index.append(count)
+        if i not in dropped:
+            count += 1
+
+    elided = [line for i, line in enumerate(lines) if i not in dropped]
+    updated = [(new_index[start], new_index[end], name)
+            for start, end, name in containers]
+
+    return elided, updated
@@ -43,9 +43,10 @@ indentwidth = 4
 _indenter = None
 
 class _IndentedCodeWriter(object):
-    def __init__(self, output):
+    def __init__(self, output, width=None):
         self.level = 0
         self.output = output
+        self.width = width
 
     def indent(self):
         self.level += 1
@@ -55,8 +56,10 @@ class _IndentedCodeWriter(object):
 
     def write(self, line):
         if line.strip():
-            if indentwidth > 0:
-                indent = " " * indentwidth
+            width = indentwidth if self.width is None else self.width
+
+            if width > 0:
+                indent = " " * width
                 line = line.replace("\t", indent)
             else:
                 indent = "\t"
@@ -66,10 +69,34 @@ class _IndentedCodeWriter(object):
             self.output.write("\n")
 
 
+class _CodeRecorder(object):
+    """ Records the lines of code written to it, with their indentation level,
+    so that they can be written out later any number of times.
+    """
+
+    def __init__(self):
+        self.level = 0
+        self.lines = []
+
+    def indent(self):
+        self.level += 1
+
+    def dedent(self):
+        self.level -= 1
+
+    def write(self, line):
+        self.lines.append((self.level, line))
+
+
 def createCodeIndenter(output):
     global _indenter
     _indenter = _IndentedCodeWriter(output)
 
+def createCodeRecorder():
+    global _indenter
+    _indenter = _CodeRecorder()
+    return _indenter
+
 def getIndenter():
     return _indenter
 
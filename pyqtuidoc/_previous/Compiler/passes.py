@@ -0,0 +1,183 @@
+"""
+The pipeline of passes that transform a form between parsing the .ui file and
+writing the Python code.
+
+A pass is either a tree pass, which is given the top-level <widget> element
+before any code is generated for it, or a code pass, which is given the
+recorded lines of generated code.  Each pass is registered with the option of
+compileUi() that enables it and, for optimizations, the lowest optimization
+level that enables it by default.  Passes are run in the order they are
+registered and the time each one takes is recorded.
+"""
+
+
+import logging
+import time
+from collections import OrderedDict
+
+from .defaults import elideDefaults
+from .probes import addProbes
+from .sharedvalues import shareValues
+from .slots import wireSlots
+from .splitter import splitSetupUi
+from .stylesheets import hoistStyleSheets
+
+
+logger = logging.getLogger(__name__)
+
+
+# The highest optimization level.
+MAX_OPTIMIZE = 2
+
+
+class Pass(object):
+    """ A registered pass. """
+
+    def __init__(self, name, stage, function, level, default, description):
+        self.name = name
+        self.stage = stage
+        self.function = function
+        self.level = level
+        self.default = default
+        self.description = description
+
+
+class GeneratedCode(object):
+    """ The code of a form that is passed to each code pass.  lines is the
+    list of 2-tuples of indentation level and line of code.  containers is
+    the list of 3-tuples of the index of the first line, the index after the
+    last line and the object name of each container, or None once the ranges
+    are no longer known.  winfo is the dict describing the form.
+    """
+
+    def __init__(self, lines, containers, winfo):
+        self.lines = lines
+        self.containers = containers
+        self.winfo = winfo
+
+
+# The registered passes in the order they are run.
+_passes = OrderedDict()
+
+
+def registerPass(name, stage, function, level=None, default=True, description=''):
+    """registerPass(name, stage, function, level=None, default=True, description='')
+
+    Register a pass.  name is the name of the keyword argument of compileUi()
+    that enables the pass.  stage is either 'tree' or 'code'.  function is
+    called with the top-level <widget> element or the GeneratedCode, which it
+    changes in place, and the value of the argument.  level is the lowest
+    optimization level that enables the pass with the value default when the
+    argument is None or isn't given.  If it is None then the pass is only run when it is
+    asked for.  description is a one line description of the pass.
+    """
+
+    if stage not in ('tree', 'code'):
+        raise ValueError("unknown pass stage %s" % stage)
+
+    _passes[name] = Pass(name, stage, function, level, default, description)
+
+
+def registeredPasses():
+    """registeredPasses() -> list
+
+    Return the list of the registered passes in the order they are run.
+    """
+
+    return list(_passes.values())
+
+
+class Pipeline(object):
+    """ The passes selected for compiling a form. """
+
+    def __init__(self, optimize=0, **pass_args):
+        """ Select the passes.  optimize is the optimization level.
+        pass_args are the values of the passes' keyword arguments.  A pass is
+        run if its value is set, or if its value is None or not given and its
+        level is at most optimize.  A value of False or 0 disables the pass.
+        """
+
+        if not 0 <= optimize <= MAX_OPTIMIZE:
+            raise ValueError("optimization level must be between 0 and %d" % MAX_OPTIMIZE)
+
+        for name in pass_args:
+            if name not in _passes:
+                raise TypeError("unknown pass %s" % name)
+
+        self.selected = []
+        self.timings = OrderedDict()
+
+        for p in _passes.values():
+            value = pass_args.get(p.name)
+
+            if value is None and p.level is not None and p.level <= optimize:
+                value = p.default
+
+            if value:
+                self.selected.append((p, value))
+
+    def runTree(self, elem):
+        """ Run the tree passes on the top-level <widget> element. """
+
+        self._run('tree', elem)
+
+    def runCode(self, code):
+        """ Run the code passes on a GeneratedCode. """
+
+        self._run('code', code)
+
+    def _run(self, stage, arg):
+        """ Run the passes of a stage and record how long each one took. """
+
+        for p, value in self.selected:
+            if p.stage != stage:
+                continue
+
+            start = time.perf_counter()
+            p.function(arg, value)
+            self.timings[p.name] = time.perf_counter() - start
+
+            logger.info("%s pass took %.2fms" % (p.name,
+                    1000 * self.timings[p.name]))
+
+
+def _hoistStyleSheets(elem, value):
+    hoistStyleSheets(elem)
+
+
+def _elideDefaults(code, directory):
+    code.lines, code.containers = elideDefaults(code.lines, code.containers,
+            directory if isinstance(directory, str) else None)
+
+
+def _wireSlots(code, target):
+    code.lines, code.containers = wireSlots(code.lines, code.containers,
+            target)
+
+
+def _addProbes(code, value):
+    code.lines, code.containers = addProbes(code.lines, code.containers)
+
+
+def _splitSetupUi(code, split_lines):
+    code.lines = splitSetupUi(code.lines, code.containers, split_lines,
+            code.winfo["widgetname"])
+    code.containers = None
+
+
+def _shareValues(code, value):
+    code.lines = shareValues(code.lines)
+
+
+registerPass('hoist_stylesheets', 'tree', _hoistStyleSheets, level=2,
+        description="combine the widgets' style sheets into one on the top-level widget")
+registerPass('elide_defaults', 'code', _elideDefaults, level=2,
+        description="drop setters that set a widget's property to its default value")
+registerPass('wire_slots', 'code', _wireSlots,
+        description="connect on_<object>_<signal> slots of a known class explicitly")
+registerPass('probes', 'code', _addProbes,
+        description="add timing probes around each container")
+registerPass('split_lines', 'code', _splitSetupUi, level=2, default=200,
+        description="move the code of large containers to methods of their own")
+registerPass('share_values', 'code', _shareValues, level=1,
+        description="create identical fonts, palettes and size policies once")
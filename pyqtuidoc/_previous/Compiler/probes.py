@@ -0,0 +1,124 @@
+"""
+Support for adding timing probes to the generated code.
+
+A probe is started before the code creating each container (a widget or
+layout and everything in it) and stopped after it, and another one covers
+each of setupUi() and retranslateUi().  The probes append (name, time) events
+to the module's _probes list, where a name of None stops the most recently
+started probe.
+"""
+
+
+# The code added to the module before the form class.
+_PROBE_CODE = (
+    (0, "import time as _time"),
+    (0, ""),
+    (0, "# The (name, time) events of the timing probes.  A name of None stops the"),
+    (0, "# most recently started probe."),
+    (0, "_probes = []"),
+    (0, ""),
+    (0, ""),
+    (0, "def _probe(name):"),
+    (1, "_probes.append((name, _time.perf_counter()))"),
+    (0, ""),
+    (0, ""),
+)
+
+
+def _probeLine(level, name):
+    """ Return the recorded line starting or stopping a probe. """
+
+    if name is None:
+        return (level, '_probe(None)')
+
+    return (level, '_probe(%r)' % name)
+
+
+def addProbes(lines, containers):
+    """addProbes(lines, containers) -> (list, list)
+
+    Return the recorded lines of generated code with timing probes added and
+    the containers with the ranges of their lines (now including their
+    probes) updated to match.
+
+    lines is the list of 2-tuples of indentation level and line of code.
+    containers is the list of 3-tuples of the index of the first line, the
+    index after the last line and the object name of each container.
+    """
+
+    # The probes to start and stop before each line.
+    starts = {}
+    stops = {}
+
+    for start, end, name in containers:
+        if start == end:
+            continue
+
+        starts.setdefault(start, []).append((end, name or 'container'))
+        stops.setdefault(end, []).append(start)
+
+    # Cover the methods of the form class.
+    method = None
+
+    for i, (level, line) in enumerate(lines + [(0, '')]):
+        if level <= 1 and method is not None:
+            # Don't include any blank lines after the method.
+            end = i
+            while end > method[0] and not lines[end - 1][1]:
+                end -= 1
+
+            starts.setdefault(method[0], []).append((end, method[1]))
+            stops.setdefault(end, []).append(method[0])
+            method = None
+
+        if level == 1:
+            for name in ('setupUi', 'retranslateUi'):
+                if line.startswith('def %s(' % name):
+                    method = (i + 1, name)
+
+    # Add the helper before the form class.
+    helper_at = 0
+    for i, (level, line) in enumerate(lines):
+        if level == 0 and line.startswith('class '):
+            helper_at = i
+            break
+
+    probed = []
+    new_index = {}
+
+    for i in range(len(lines) + 1):
+        # Stop the innermost probes first.
+        for start in sorted(stops.get(i, ()), reverse=True):
+            probed.append(_probeLine(lines[start][0], None))
+
+        new_index[i] = len(probed)
+
+        if i == helper_at:
+            probed.extend(_PROBE_CODE)
+
+        # Start the outermost probes first.
+        for _, name in sorted(starts.get(i, ()), reverse=True):
+            probed.append(_probeLine(lines[i][0], name))
+
+        if i < len(lines):
+            probed.append(lines[i])
+
+    # A container's range starts at its probe and ends after it.
+    updated = []
+    for start, end, name in containers:
+        if start == end:
+            updated.append((new_index[start], new_index[end], name))
+            continue
+
+        depth = sorted(starts[start], reverse=True).index(
+                (end, name or 'container'))
+        new_start = new_index[start] + depth
+        if start == helper_at:
+            new_start += len(_PROBE_CODE)
+
+        outer = sorted(stops[end], reverse=True).index(start)
+        new_end = new_index[end] - len(stops[end]) + outer + 1
+
+        updated.append((new_start, new_end, name))
+
+    return probed, updated
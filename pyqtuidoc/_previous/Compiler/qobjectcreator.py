@@ -95,6 +95,15 @@ class _ModuleWrapper(object):
         else:
             return None
 
+    def _usedModules(self):
+        if self._used:
+            if self._package is None:
+                return [self._module]
+
+            return ["%s.%s" % (self._package, self._module)]
+
+        return []
+
     def _writeImportCode(self):
         if self._used:
             if self._package is None:
@@ -136,6 +145,10 @@ class _CustomWidgetLoader(object):
 
         return type(cls, (baseClass, ), {"module" : ""})
 
+    def _usedModules(self):
+        return sorted(set(self._widgets[widget][1]
+                          for widget in self._usedWidgets))
+
     def _writeImportCode(self):
         imports = {}
         for widget in self._usedWidgets:
@@ -175,6 +188,15 @@ class CompilerCreatorPolicy(object):
     def asString(self, s):
         return as_string(s)
 
+    def _usedModules(self):
+        modules = []
+        for module in self._modules:
+            for name in module._usedModules():
+                if name not in modules:
+                    modules.append(name)
+
+        return modules
+
     def _writeOutImports(self):
         for module in self._modules:
             module._writeImportCode()
@@ -0,0 +1,131 @@
+"""
+Support for sharing identical value objects (fonts, palettes and size
+policies) in the generated setupUi().
+
+The generated code creates a new value object each time a widget sets one,
+even when it is identical to one created earlier.  Because Qt copies these
+values when they are set, each distinct value can instead be created once as a
+local variable and then be reused.  Icons are already shared by the icon cache.
+"""
+
+
+import re
+
+
+# The local variables holding the values that can be shared, and the local
+# variables that may be used while a value is being built.
+_VALUES = {
+    'font': (),
+    'palette': ('brush', 'gradient'),
+    'sizePolicy': (),
+}
+
+_value_re = re.compile(r'^(%s) = Qt\w+\.' % '|'.join(_VALUES))
+_assign_re = re.compile(r'^([\w, ]+) = ')
+
+# The code that must be run for each use of a size policy because it depends
+# on the widget.
+_per_use_re = re.compile(r'^sizePolicy\.setHeightForWidth\(')
+
+_string_re = re.compile(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')')
+
+
+def _isPartOf(line, name):
+    """ Return True if a line of code is part of the building of a value. """
+
+    for var in (name, ) + _VALUES[name]:
+        if line.startswith(var + '.') or line.startswith(var + ' = '):
+            return True
+
+    return False
+
+
+def _rename(line, name, new_name):
+    """ Return a line of code with a value variable renamed. """
+
+    if name == new_name:
+        return line
+
+    # Don't change string literals.
+    parts = _string_re.split(line)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r'(?<![\w.])%s\b' % name, new_name, parts[i])
+
+    return ''.join(parts)
+
+
+def shareValues(lines):
+    """shareValues(lines) -> list
+
+    Return the recorded lines of generated code with the code that creates
+    values identical to ones already created removed.
+
+    lines is the list of 2-tuples of indentation level and line of code as
+    recorded while parsing a .ui file.  Each distinct value is given a
+    variable of its own (e.g. font, font1, font2...) that is used in place of
+    the one originally used.
+    """
+
+    shared = []
+
+    # The values created so far keyed by the code that builds them, the number
+    # of distinct values of each kind, and the current names of the value
+    # variables.
+    values = {}
+    counts = {}
+    current = {}
+
+    i = 0
+    while i < len(lines):
+        level, line = lines[i]
+
+        # Values are local to the method they are created in.
+        if level <= 1:
+            values = {}
+            counts = {}
+            current = {}
+
+        m = _value_re.match(line)
+        if m is None:
+            for name, new_name in current.items():
+                line = _rename(line, name, new_name)
+
+            # Forget any values whose variables are assigned something else
+            # (e.g. by a helper method).
+            m = _assign_re.match(line)
+            if m is not None:
+                targets = [t.strip() for t in m.group(1).split(',')]
+                for key, new_name in list(values.items()):
+                    if new_name in targets:
+                        del values[key]
+
+            shared.append((level, line))
+            i += 1
+            continue
+
+        name = m.group(1)
+
+        # Find the end of the code building the value.
+        end = i + 1
+        while end < len(lines) and lines[end][0] == level and _isPartOf(lines[end][1], name) and not lines[end][1].startswith(name + ' = '):
+            end += 1
+
+        block = lines[i:end]
+        key = tuple(l for _, l in block if not _per_use_re.match(l))
+        per_use = [(lvl, l) for lvl, l in block if _per_use_re.match(l)]
+
+        new_name = values.get(key)
+        if new_name is None:
+            count = counts.get(name, 0)
+            counts[name] = count + 1
+            new_name = name if count == 0 else '%s%d' % (name, count)
+            values[key] = new_name
+
+            shared.extend((lvl, _rename(l, name, new_name)) for lvl, l in block if not _per_use_re.match(l))
+
+        shared.extend((lvl, _rename(l, name, new_name)) for lvl, l in per_use)
+        current[name] = new_name
+
+        i = end
+
+    return shared
@@ -0,0 +1,350 @@
+"""
+Support for connecting the signals of a form to the slots of a known class
+when the form is compiled.
+
+The generated setupUi() normally ends with a call to
+QMetaObject.connectSlotsByName(), which looks up every on_<object>_<signal>
+method of the widget's class among the objects of the form each time a form
+is created.  When the class of the widget is known in advance the matching
+slots are found once by the compiler and connected by explicit connect()
+calls instead.  The generated code checks that the class of the widget has the
+same slots as the one the form was compiled for and calls
+connectSlotsByName() if it hasn't.
+"""
+
+
+import importlib
+import logging
+import re
+
+
+logger = logging.getLogger(__name__)
+DEBUG = logger.debug
+
+
+# The code added to the module before the form class.  _slotNames() must
+# return the same as slotNames().
+_WIRING_CODE = (
+    (0, "# The classes of the widgets the form has been created in and whether"),
+    (0, "# they have the slots the form was compiled for."),
+    (0, "_wired_classes = {}"),
+    (0, ""),
+    (0, ""),
+    (0, "def _slotNames(cls):"),
+    (1, "names = set(n for n in dir(cls) if n.startswith('on_'))"),
+    (1, "meta = cls.staticMetaObject"),
+    (1, "for i in range(meta.methodCount()):"),
+    (2, "signature = bytes(meta.method(i).methodSignature()).decode()"),
+    (2, "if signature.startswith('on_'):"),
+    (3, "names.add(signature)"),
+    (1, "return ' '.join(sorted(names))"),
+    (0, ""),
+    (0, ""),
+    (0, "def _slotsWired(widget, names):"),
+    (1, "cls = type(widget)"),
+    (1, "wired = _wired_classes.get(cls)"),
+    (1, "if wired is None:"),
+    (2, "wired = _wired_classes[cls] = _slotNames(cls) == names"),
+    (1, "return wired"),
+    (0, ""),
+    (0, ""),
+)
+
+_connect_re = re.compile(r'^QtCore\.QMetaObject\.connectSlotsByName\((\w+)\)$')
+_create_re = re.compile(r'^([\w.]+) = ([\w.]+)\(')
+_name_re = re.compile(r'^([\w.]+)\.setObjectName\("(\w+)"\)$')
+_import_re = re.compile(r'^from ([\w.]+) import (\w+)$')
+
+
+def slotClass(target):
+    """slotClass(target) -> class
+
+    Return the class of the widgets a form is compiled for.  target is either
+    the class or a string of the form 'module:Class'.  ValueError is raised if
+    the class cannot be imported.
+    """
+
+    if not isinstance(target, str):
+        return target
+
+    module_name, _, class_name = target.partition(':')
+    if not module_name or not class_name:
+        raise ValueError("%s is not of the form module:Class" % target)
+
+    try:
+        cls = importlib.import_module(module_name)
+        for name in class_name.split('.'):
+            cls = getattr(cls, name)
+    except (ImportError, AttributeError) as e:
+        raise ValueError("unable to import %s: %s" % (target, e))
+
+    return cls
+
+
+def slotNames(cls):
+    """slotNames(cls) -> str
+
+    Return a string identifying the slots of a class that
+    connectSlotsByName() may connect to: the names of its on_* attributes and
+    the signatures of those decorated with pyqtSlot().
+    """
+
+    names = set(n for n in dir(cls) if n.startswith('on_'))
+
+    meta = cls.staticMetaObject
+    for i in range(meta.methodCount()):
+        signature = bytes(meta.method(i).methodSignature()).decode()
+        if signature.startswith('on_'):
+            names.add(signature)
+
+    return ' '.join(sorted(names))
+
+
+def _decoratedSignatures(cls, name):
+    """ Return the list of the parameter types of each pyqtSlot() decoration
+    of a slot or None if it isn't decorated.
+    """
+
+    meta = cls.staticMetaObject
+    signatures = []
+
+    for i in range(meta.methodCount()):
+        method = meta.method(i)
+        if bytes(method.name()).decode() == name:
+            signatures.append(
+                    tuple(bytes(t).decode() for t in method.parameterTypes()))
+
+    return signatures or None
+
+
+def _overloads(cls, name):
+    """ Return the list of 2-tuples of the parameter types of each overload
+    of a signal and the unbound signal used to connect to it.  The signal is
+    None for the overloads that Qt creates for default arguments, which can't
+    be connected to on their own.
+    """
+
+    from PyQt5.QtCore import QMetaMethod
+
+    unbound = getattr(cls, name, None)
+    if unbound is None:
+        return []
+
+    meta = cls.staticMetaObject
+    overloads = []
+
+    for i in range(meta.methodCount()):
+        method = meta.method(i)
+        if method.methodType() != QMetaMethod.Signal or bytes(method.name()).decode() != name:
+            continue
+
+        types = tuple(bytes(t).decode() for t in method.parameterTypes())
+
+        try:
+            overloads.append((types, unbound[types]))
+        except (KeyError, TypeError):
+            overloads.append((types, None))
+
+    return overloads
+
+
+def _resolveClass(path, imports):
+    """ Return the class created by the generated code or None if it can't be
+    imported.
+    """
+
+    module_name, _, class_name = path.rpartition('.')
+    if module_name:
+        module_name = 'PyQt5.' + module_name
+    else:
+        module_name = imports.get(class_name)
+        if module_name is None or module_name.startswith('.'):
+            return None
+
+    try:
+        return getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError):
+        return None
+
+
+def _connections(cls, objects, classes):
+    """ Return the list of 3-tuples of the code referring to the sender, the
+    code selecting the signal and the name of the slot of each connection
+    that connectSlotsByName() would make, or None if a slot refers to an
+    object whose class is unknown.
+    """
+
+    connections = []
+
+    for slot in sorted(n for n in dir(cls) if n.startswith('on_')):
+        if not callable(getattr(cls, slot, None)):
+            continue
+
+        # As with PyQt, the signal name follows the last underscore.
+        object_name, _, signal = slot[3:].rpartition('_')
+        if object_name not in objects or not signal:
+            continue
+
+        sender = objects[object_name]
+        sender_cls = classes.get(sender)
+        if sender_cls is None:
+            logger.warning("the class of %s is unknown so %s() isn't connected explicitly" % (object_name, slot))
+            return None
+
+        overloads = _overloads(sender_cls, signal)
+        connectable = [types for types, unbound in overloads if unbound is not None]
+
+        def selector(types):
+            if len(connectable) == 1:
+                return signal
+
+            if not types:
+                return '%s[()]' % signal
+
+            return '%s[%s]' % (signal, ', '.join(repr(t) for t in types))
+
+        decorated = _decoratedSignatures(cls, slot)
+        if decorated is None:
+            # connectSlotsByName() connects an undecorated slot to every
+            # overload, including those for default arguments, so it would be
+            # called more than once for each emit.
+            if len(overloads) > 1:
+                logger.warning("%s() is connected to every overload of %s.%s "
+                        "so the slots aren't connected explicitly" % (
+                                slot, object_name, signal))
+                return None
+
+            targets = connectable
+        else:
+            # A decorated slot is connected to the overloads with the same
+            # arguments.  The overloads for default arguments are emitted with
+            # the overload they are created from.
+            targets = []
+            for signature in decorated:
+                for types, unbound in overloads:
+                    if types != signature:
+                        continue
+
+                    if unbound is None:
+                        types = next((t for t in connectable
+                                if t[:len(signature)] == signature), None)
+
+                    if types is None:
+                        continue
+
+                    # Both a default argument overload and the one it is
+                    # created from would be connected.
+                    if types in targets:
+                        logger.warning("%s() is connected to more than one "
+                                "overload of %s.%s so the slots aren't "
+                                "connected explicitly" % (
+                                        slot, object_name, signal))
+                        return None
+
+                    targets.append(types)
+
+        if not targets:
+            DEBUG("no signal of %s matches %s()" % (object_name, slot))
+
+        for types in targets:
+            connections.append((sender, selector(types), slot))
+
+    return connections
+
+
+def wireSlots(lines, containers, target):
+    """wireSlots(lines, containers, target) -> (list, list)
+
+    Return the recorded lines of generated code with the call to
+    connectSlotsByName() replaced by explicit connections to the slots of a
+    class, and the containers with the ranges of their lines updated to
+    match.
+
+    lines is the list of 2-tuples of indentation level and line of code.
+    containers is the list of 3-tuples of the index of the first line, the
+    index after the last line and the object name of each container.  target
+    is the class of the widgets the form will be created in or a string of
+    the form 'module:Class'.
+    """
+
+    cls = slotClass(target)
+
+    # Find the objects of the form, their classes and the call to replace.
+    objects = {}
+    created = {}
+    imports = {}
+    call_at = receiver = None
+
+    for i, (level, line) in enumerate(lines):
+        match = _create_re.match(line)
+        if match is not None:
+            created[match.group(1)] = match.group(2)
+            continue
+
+        match = _name_re.match(line)
+        if match is not None:
+            objects.setdefault(match.group(2), match.group(1))
+            continue
+
+        match = _import_re.match(line)
+        if match is not None and level == 0:
+            imports[match.group(2)] = match.group(1)
+            continue
+
+        match = _connect_re.match(line)
+        if match is not None:
+            call_at = i
+            receiver = match.group(1)
+
+    if call_at is None:
+        return lines, containers
+
+    # connectSlotsByName() doesn't connect the signals of the widget itself.
+    objects = dict((name, code) for name, code in objects.items()
+            if code != receiver)
+
+    classes = {}
+    for code in objects.values():
+        if code in created:
+            classes[code] = _resolveClass(created[code], imports)
+
+    connections = _connections(cls, objects, classes)
+    if connections is None:
+        return lines, containers
+
+    level = lines[call_at][0]
+    check = '_slotsWired(%s, %r)' % (receiver, slotNames(cls))
+    fallback = (level + 1, lines[call_at][1])
+
+    if connections:
+        wiring = [(level, 'if %s:' % check)]
+        wiring.extend((level + 1, '%s.%s.connect(%s.%s)' % (sender, signal, receiver, slot))
+                for sender, signal, slot in connections)
+        wiring.append((level, 'else:'))
+        wiring.append(fallback)
+    else:
+        wiring = [(level, 'if not %s:' % check), fallback]
+
+    # Add the helpers before the form class.
+    helper_at = 0
+    for i, (line_level, line) in enumerate(lines):
+        if line_level == 0 and line.startswith('class '):
+            helper_at = i
+            break
+
+    wired = (lines[:helper_at] + list(_WIRING_CODE) +
+            lines[helper_at:call_at] + wiring + lines[call_at + 1:])
+
+    def moved(i):
+        if i > call_at:
+            return i + len(_WIRING_CODE) + len(wiring) - 1
+
+        if i >= helper_at:
+            return i + len(_WIRING_CODE)
+
+        return i
+
+    updated = [(moved(start), moved(end), name)
+            for start, end, name in containers]
+
+    return wired, updated
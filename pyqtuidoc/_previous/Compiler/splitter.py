@@ -0,0 +1,218 @@
+"""
+Support for splitting the generated setupUi() into helper methods.
+
+The code creating a large container (a widget or layout and everything in
+it) is moved to a method of its own that is called from setupUi() or from the
+method of the enclosing container.  Local variables (e.g. icons) that are used
+across methods are passed as arguments and returned as results.
+"""
+
+
+import ast
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+def _names(line):
+    """ Return the 2-tuple of the names loaded and of the names stored by a
+    line of code, in the order they are evaluated.
+    """
+
+    try:
+        tree = ast.parse(line.strip())
+    except SyntaxError:
+        return [], []
+
+    loaded = []
+    stored = []
+
+    for stmt in tree.body:
+        # The right hand side of an assignment is evaluated first.
+        if isinstance(stmt, ast.Assign):
+            parts = [stmt.value] + stmt.targets
+        else:
+            parts = [stmt]
+
+        for part in parts:
+            for node in ast.walk(part):
+                if isinstance(node, ast.Name):
+                    if isinstance(node.ctx, ast.Store):
+                        stored.append(node.id)
+                    else:
+                        loaded.append(node.id)
+
+    return loaded, stored
+
+
+def _children(ranges, start, end):
+    """ Return the outermost of a list of ranges that are strictly within
+    another range, sorted by their start.
+    """
+
+    children = []
+
+    for s, e, n in sorted(ranges, key=lambda r: (r[0], -r[1])):
+        if start <= s and e <= end and (s, e) != (start, end):
+            if children and children[-1][0] <= s and e <= children[-1][1]:
+                continue
+
+            children.append((s, e, n))
+
+    return children
+
+
+def splitSetupUi(lines, containers, min_lines, toplevel):
+    """splitSetupUi(lines, containers, min_lines, toplevel) -> list
+
+    Return the recorded lines of generated code with the code of large
+    containers moved from setupUi() to helper methods.
+
+    lines is the list of 2-tuples of indentation level and line of code as
+    recorded while parsing a .ui file.  containers is a list of 3-tuples of
+    the index of the first line, the index after the last line and the object
+    name of each container, in the order in which their code was completed.
+    min_lines is the smallest number of lines, not counting those already
+    moved to the helpers of the containers it contains, that a container must
+    have to be moved to a helper.  toplevel is the name of the top-level
+    widget argument of setupUi().
+    """
+
+    # Find the body of setupUi().
+    setup_start = None
+    setup_end = len(lines)
+
+    for i, (level, line) in enumerate(lines):
+        if setup_start is None:
+            if level == 1 and line.startswith('def setupUi('):
+                setup_start = i + 1
+        elif level <= 1:
+            setup_end = i
+            break
+
+    if setup_start is None:
+        return lines
+
+    # Select the containers innermost first.  The containers are recorded
+    # when their code is complete so an inner container is always before the
+    # container it is in.
+    selected = []
+
+    for start, end, name in containers:
+        if not (setup_start <= start < end <= setup_end):
+            continue
+
+        size = end - start
+        for s, e, _ in _children(selected, start, end):
+            size -= e - s - 1
+
+        if size >= min_lines:
+            selected.append((start, end, name))
+
+    if not selected:
+        return lines
+
+    # Analyse the names used by each line.
+    names = [_names(line) for _, line in lines]
+
+    # The local variables of setupUi() (including its argument).
+    local_names = set([toplevel])
+    for i in range(setup_start, setup_end):
+        local_names.update(names[i][1])
+
+    # The local variables that are live (i.e. used before being assigned
+    # again) at the end of each container.
+    ends = set(e for _, e, _ in selected)
+    live_at = {}
+    live = set()
+
+    for i in range(setup_end - 1, setup_start - 1, -1):
+        if i + 1 in ends:
+            live_at[i + 1] = set(live)
+
+        loaded, stored = names[i]
+        live.difference_update(stored)
+        live.update(n for n in loaded if n in local_names)
+
+    by_start = sorted(selected)
+    helpers = {}
+    method_names = set()
+
+    def body(start, end):
+        """ Return the code of a range of lines with the helpers of the
+        containers in it replaced by calls, the names it uses before storing
+        them and the names it stores.
+        """
+
+        code = []
+        inputs = []
+        stored = set()
+
+        i = start
+        for s, e, _ in _children(by_start, start, end) + [(end, end, None)]:
+            while i < s:
+                code.append(lines[i])
+
+                loaded, assigned = names[i]
+                for name in loaded:
+                    if name in local_names and name not in stored and name not in inputs:
+                        inputs.append(name)
+
+                stored.update(assigned)
+                i += 1
+
+            if s == end:
+                break
+
+            helper = helpers[(s, e)]
+            for name in helper['inputs']:
+                if name not in stored and name not in inputs:
+                    inputs.append(name)
+
+            code.append((lines[s][0], helper['call']))
+            stored.update(helper['outputs'])
+            i = e
+
+        return code, inputs, stored
+
+    for start, end, name in selected:
+        code, inputs, stored = body(start, end)
+
+        # Return the names that are used after the container.
+        outputs = sorted(stored & live_at.get(end, set()))
+
+        method_name = base_name = '_setupUi_%s' % (name or 'container')
+        count = 1
+        while method_name in method_names:
+            method_name = '%s%d' % (base_name, count)
+            count += 1
+
+        method_names.add(method_name)
+
+        call = 'self.%s(%s)' % (method_name, ', '.join(inputs))
+        if outputs:
+            call = '%s = %s' % (', '.join(outputs), call)
+            code.append((code[-1][0], 'return %s' % ', '.join(outputs)))
+
+        helpers[(start, end)] = dict(method_name=method_name, inputs=inputs,
+                outputs=outputs, call=call, code=code)
+
+        logger.debug("moved %d lines of %s to %s()" % (end - start, name,
+                method_name))
+
+    # Rewrite setupUi() and add the helpers after it.
+    split = list(lines[:setup_start])
+    split.extend(body(setup_start, setup_end)[0])
+
+    for start, end, _ in by_start:
+        helper = helpers[(start, end)]
+
+        split.append((1, ''))
+        split.append((1, 'def %s(%s):' % (helper['method_name'],
+                ', '.join(['self'] + helper['inputs']))))
+        split.extend(helper['code'])
+
+    split.extend(lines[setup_end:])
+
+    return split
@@ -0,0 +1,227 @@
+"""
+Support for hoisting the style sheets of the widgets of a form into a single
+style sheet set on the top-level widget.
+
+Each call to setStyleSheet() makes Qt re-polish the widget and its children,
+so a form with many widget style sheets is slow to create.  The rules of a
+style sheet set on a widget are rewritten so that they only match that widget
+(using its object name) and its children, which is what they would have
+matched.  A form is left unchanged if the rewritten rules might behave
+differently because of the different precedence of rules from the style sheet
+of a widget and from that of one of its parents.
+"""
+
+
+import logging
+import re
+from xml.etree.ElementTree import SubElement
+
+
+logger = logging.getLogger(__name__)
+
+_comment_re = re.compile(r'/\*.*?\*/', re.DOTALL)
+_rule_re = re.compile(r'\s*([^{}]+?)\s*\{([^{}]*)\}\s*')
+_bracketed_re = re.compile(r'\[[^\]]*\]')
+_head_re = re.compile(r'^(\*|\.?[A-Za-z_][\w-]*)?')
+
+
+class _CannotHoist(Exception):
+    """ Raised when the style sheets of a form cannot be hoisted. """
+
+
+def _styleSheetProperty(elem):
+    for prop in elem.findall('property'):
+        if prop.get('name') == 'styleSheet':
+            return prop
+
+    return None
+
+
+def _styleSheetText(prop):
+    if prop is None:
+        return ''
+
+    return prop.findtext('string') or ''
+
+
+def _scopeSelector(selector, name):
+    """ Return the selectors that match what selector matches when used in the
+    style sheet of the widget called name.
+    """
+
+    if '>' in selector or '+' in selector or '~' in selector or len(_bracketed_re.sub('', selector).split()) > 1:
+        raise _CannotHoist("selector '%s' has a combinator" % selector)
+
+    own_id = '#' + name
+    scoped = []
+
+    # The selector matching the widget itself.
+    head = _head_re.match(selector).group(0)
+    rest = selector[len(head):]
+    ids = re.findall(r'#([\w-]+)', _bracketed_re.sub('', rest))
+
+    if not ids:
+        scoped.append(head + own_id + rest)
+    elif ids == [name]:
+        scoped.append(selector)
+
+    # The selector matching its children.
+    scoped.append('%s %s' % (own_id, selector))
+
+    return scoped
+
+
+def _parseStyleSheet(sheet, name):
+    """ Return the list of 2-tuples of the list of selectors and the
+    declarations of each rule of the style sheet of the widget called name.
+    """
+
+    sheet = _comment_re.sub('', sheet).strip()
+
+    if not sheet:
+        return []
+
+    if '@' in sheet:
+        raise _CannotHoist("style sheet of %s has an at-rule" % name)
+
+    # A style sheet without any selectors applies to the widget and all its
+    # children.
+    if '{' not in sheet:
+        sheet = '* { %s }' % sheet
+
+    rules = []
+    end = 0
+
+    for m in _rule_re.finditer(sheet):
+        if m.start() != end:
+            break
+
+        end = m.end()
+
+        rules.append(([selector.strip() for selector in m.group(1).split(',')],
+                m.group(2).strip()))
+
+    if end != len(sheet):
+        raise _CannotHoist("unable to parse the style sheet of %s" % name)
+
+    return rules
+
+
+def _scopeStyleSheet(sheet, name):
+    """ Return the rules of the style sheet of the widget called name rewritten
+    so that they can be set on a parent.
+    """
+
+    rules = []
+
+    for selectors, declarations in _parseStyleSheet(sheet, name):
+        scoped = []
+        for selector in selectors:
+            scoped.extend(_scopeSelector(selector, name))
+
+        rules.append('%s { %s }' % (', '.join(scoped), declarations))
+
+    return '\n'.join(rules)
+
+
+def _checkTopStyleSheet(widget, sheet, styled):
+    """ Check that no rule of the style sheet of the top-level widget uses the
+    id of a widget whose style is affected by hoisting.  Such a rule could
+    then take precedence over the hoisted rules, whereas it had none over the
+    style sheet of a child.  styled is the list of the elements of the widgets
+    with a style sheet.
+    """
+
+    top_name = widget.get('name')
+
+    parents = {}
+    for parent in widget.iter():
+        for child in parent:
+            parents[child] = parent
+
+    # The widgets matched by the hoisted rules and their ancestors.
+    affected = set()
+    for elem in styled:
+        affected.update(w.get('name') for w in elem.iter('widget'))
+
+        while elem is not widget:
+            elem = parents[elem]
+            if elem.tag == 'widget':
+                affected.add(elem.get('name'))
+
+    for selectors, _ in _parseStyleSheet(sheet, top_name):
+        for selector in selectors:
+            for id_name in re.findall(r'#([\w-]+)', _bracketed_re.sub('', selector)):
+                if id_name in affected:
+                    raise _CannotHoist("the style sheet of %s has the id selector '%s'" % (top_name, selector))
+
+
+def _collect(elem, sheets, in_styled):
+    """ Collect the widgets with a style sheet under elem in document order.
+    """
+
+    for child in elem:
+        if child.tag in ('widget', 'layout', 'item'):
+            styled = in_styled
+
+            if child.tag == 'widget':
+                prop = _styleSheetProperty(child)
+
+                if _styleSheetText(prop).strip():
+                    if in_styled:
+                        raise _CannotHoist("%s and one of its parents both have a style sheet" % child.get('name'))
+
+                    if not child.get('name'):
+                        raise _CannotHoist("a %s with a style sheet has no name" % child.get('class'))
+
+                    sheets.append((child, prop))
+                    styled = True
+
+            _collect(child, sheets, styled)
+
+
+def hoistStyleSheets(widget):
+    """hoistStyleSheets(widget) -> bool
+
+    Move the style sheets of the widgets of a form to its top-level widget.
+
+    widget is the element of the top-level widget.  It is modified in place.
+    Returns True if the style sheets were hoisted.  If the form would behave
+    differently then a warning is logged and the form is left unchanged.
+    """
+
+    top_name = widget.get('name')
+
+    try:
+        top_prop = _styleSheetProperty(widget)
+        top_sheet = _styleSheetText(top_prop)
+
+        sheets = []
+        _collect(widget, sheets, False)
+
+        _checkTopStyleSheet(widget, top_sheet, [child for child, _ in sheets])
+
+        rules = [_scopeStyleSheet(_styleSheetText(prop), child.get('name'))
+                for child, prop in sheets]
+    except _CannotHoist as e:
+        logger.warning("not hoisting the style sheets of %s: %s" % (top_name, e))
+        return False
+
+    if not sheets:
+        return False
+
+    for child, prop in sheets:
+        child.remove(prop)
+
+    if top_sheet.strip():
+        rules.insert(0, top_sheet.strip())
+
+    if top_prop is not None:
+        widget.remove(top_prop)
+
+    # The combined style sheet isn't translatable so that it is set in
+    # setupUi().
+    top_prop = SubElement(widget, 'property', name='styleSheet')
+    SubElement(top_prop, 'string', notr='true').text = '\n'.join(r for r in rules if r)
+
+    return True
@@ -48,17 +48,20 @@ MIT license. Python 3.8+
 __version__ = "0.1.0"
 
 
-__all__ = ("compileUi", "compileUiDir", "loadUiType", "loadUi", "widgetPluginPath")
+__all__ = ("compileUi", "compileUiDir", "compileUiTargets", "loadUiType", "loadUi", "widgetPluginPath")
 
 from .Compiler import indenter, compiler
+from .cache import CompileCache
+from .factory import FormFactory
+from .importer import installImportHook
 
 _header = """# -*- coding: utf-8 -*-
 
 # Form implementation generated from reading ui file '%s'
 #
-# Created by: PyQt5 UI code generator %s
+# Created by: %s
 #
-# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# WARNING: Any manual changes made to this file will be lost when %s is
 # run again.  Do not edit this file unless you know what you are doing.
 
 
@@ -76,8 +79,8 @@ if __name__ == "__main__":
 \tsys.exit(app.exec_())"""
 
 
-def compileUiDir(dir, recurse=False, map=None, **compileUi_args):
-    """compileUiDir(dir, recurse=False, map=None, **compileUi_args)
+def compileUiDir(dir, recurse=False, map=None, write_if_changed=False, depfiles=False, variants=None, archive=None, compile_pyc=False, **compileUi_args):
+    """compileUiDir(dir, recurse=False, map=None, write_if_changed=False, depfiles=False, variants=None, archive=None, compile_pyc=False, **compileUi_args)
 
     Creates Python modules from Qt Designer .ui files in a directory or
     directory tree.
@@ -92,23 +95,89 @@ def compileUiDir(dir, recurse=False, map=None, **compileUi_args):
     created.  The callable should return a tuple of the name of the directory
     in which the Python module will be created and the (possibly modified)
     name of the module.  The default is None.
+    write_if_changed is optionally set to generate each module in memory and
+    only write it (atomically) if it differs from the existing file so that
+    unchanged modules keep their modification times.  The default is False.
+    depfiles is optionally set to write a Makefile/Ninja style dependency file
+    next to each Python module.  It has the same name as the module but ends
+    with '.d'.  The default is False.
+    variants is an optional sequence of 2-tuples of a map callable and a dict
+    of compileUi() keyword arguments.  A module is created for each variant
+    from each .ui file, which is only parsed once.  If specified then map and
+    compileUi_args are ignored.  The default is None.
+    archive is the optional name of a zip file to write all the Python modules
+    to instead of creating them as separate files.  The name of each module
+    within the archive is its name relative to dir, so the archive can be
+    added to sys.path to import the modules using zipimport.  If
+    write_if_changed is set then the archive is only written if its content
+    changed.  If depfiles is set then a single dependency file for the archive
+    is written next to it.  The default is None.
+    compile_pyc is optionally set to also add the compiled bytecode of each
+    module to the archive so that it doesn't have to be compiled when it is
+    imported.  The default is False.
     compileUi_args are any additional keyword arguments that are passed to
     the compileUi() function that is called to create each Python module.
+    Those that affect the parsing of the .ui file (e.g. hoist_stylesheets)
+    and cache also apply to all variants.
     """
 
     import os
+    from io import StringIO
+
+    parse_args = {}
+    for name in _PARSE_ARGS:
+        if name in compileUi_args:
+            parse_args[name] = compileUi_args.pop(name)
+
+    cache = compileUi_args.pop('cache', None)
+
+    if variants is None:
+        variants = [(map, compileUi_args)]
+
+    if archive is not None:
+        from .output import ModuleArchive
+
+        module_archive = ModuleArchive(archive, compile_pyc)
+        archive_deps = []
 
     # Compile a single .ui file.
     def compile_ui(ui_dir, ui_file):
         # Ignore if it doesn't seem to be a .ui file.
-        if ui_file.endswith('.ui'):
+        if not ui_file.endswith('.ui'):
+            return
+
+        ui_path = os.path.join(ui_dir, ui_file)
+
+        with open(ui_path, 'r') as ui_fobj:
+            form = _parseForm(ui_fobj, cache, **parse_args)
+
+        for variant_map, variant_args in variants:
             py_dir = ui_dir
             py_file = ui_file[:-3] + '.py'
 
             # Allow the caller to change the name of the .py file or generate
             # it in a different directory.
-            if map is not None:
-                py_dir, py_file = map(py_dir, py_file)
+            if variant_map is not None:
+                py_dir, py_file = variant_map(py_dir, py_file)
+
+            py_path = os.path.join(py_dir, py_file)
+
+            if archive is not None:
+                name = os.path.relpath(py_path, dir)
+                if name.startswith(os.pardir):
+                    raise ValueError("%s is not within %s" % (py_path, dir))
+
+                code_string = StringIO()
+                winfo = _writeForm(form, ui_path, code_string, **variant_args)
+                module_archive.add(name, code_string.getvalue())
+
+                if depfiles:
+                    from .depends import uiDependencies
+
+                    archive_deps.extend(uiDependencies(ui_path,
+                            winfo["modules"]))
+
+                continue
 
             # Make sure the destination directory exists.
             try:
@@ -116,17 +185,21 @@ def compileUiDir(dir, recurse=False, map=None, **compileUi_args):
             except:
                 pass
 
-            ui_path = os.path.join(ui_dir, ui_file)
-            py_path = os.path.join(py_dir, py_file)
+            if write_if_changed:
+                from .output import writeIfChanged
 
-            ui_file = open(ui_path, 'r')
-            py_file = open(py_path, 'w')
+                code_string = StringIO()
+                winfo = _writeForm(form, ui_path, code_string, **variant_args)
+                writeIfChanged(py_path, code_string.getvalue())
+            else:
+                with open(py_path, 'w') as py_fobj:
+                    winfo = _writeForm(form, ui_path, py_fobj, **variant_args)
 
-            try:
-                compileUi(ui_file, py_file, **compileUi_args)
-            finally:
-                ui_file.close()
-                py_file.close()
+            if depfiles:
+                from .depends import uiDependencies, writeDepfile
+
+                writeDepfile(os.path.splitext(py_path)[0] + '.d', py_path,
+                             uiDependencies(ui_path, winfo["modules"]))
 
     if recurse:
         for root, _, files in os.walk(dir):
@@ -137,9 +210,61 @@ def compileUiDir(dir, recurse=False, map=None, **compileUi_args):
             if os.path.isfile(os.path.join(dir, ui)):
                 compile_ui(dir, ui)
 
+    if archive is not None:
+        module_archive.close(write_if_changed)
+
+        if depfiles:
+            from .depends import writeDepfile
+
+            writeDepfile(os.path.splitext(archive)[0] + '.d', archive,
+                         sorted(set(archive_deps)))
+
+
+# The keyword arguments of compileUi() that are used when parsing the .ui file
+# rather than when writing the Python module.
+_PARSE_ARGS = ('hoist_stylesheets', 'share_values', 'root', 'split_lines',
+        'probes', 'wire_slots', 'elide_defaults', 'optimize')
+
+
+def _parseForm(uifile, cache, **parse_args):
+    """ Parse a .ui file, using a CompileCache if one is given, and return
+    the CompiledForm.
+    """
 
-def compileUi(uifile, pyfile, execute=False, indent=4, from_imports=False, resource_suffix='_rc', import_from='.'):
-    """compileUi(uifile, pyfile, execute=False, indent=4, from_imports=False, resource_suffix='_rc', import_from='.')
+    if cache is not None:
+        return cache.parseUi(uifile, **parse_args)
+
+    return compiler.UICompiler().parseUi(uifile, **parse_args)
+
+
+def _writeForm(form, uifname, pyfile, execute=False, indent=4, from_imports=False, resource_suffix='_rc', import_from='.', binding='PyQt5'):
+    """ Write a parsed form as a Python module and return the dict describing
+    it.
+    """
+
+    from PyQt5.QtCore import PYQT_VERSION_STR
+
+    # The code for PyQt5 is the same as pyuic5's.
+    if binding == 'PyQt5':
+        generator = 'PyQt5 UI code generator %s' % PYQT_VERSION_STR
+        tool = 'pyuic5'
+    else:
+        generator = 'qtuidocmake %s for %s' % (__version__, binding)
+        tool = 'qtuidocmake'
+
+    pyfile.write(_header % (uifname, generator, tool))
+
+    winfo = form.write(pyfile, from_imports, resource_suffix, import_from,
+                       indent, binding)
+
+    if execute:
+        indenter._IndentedCodeWriter(pyfile, indent).write(_display_code % winfo)
+
+    return winfo
+
+
+def compileUi(uifile, pyfile, execute=False, indent=4, from_imports=False, resource_suffix='_rc', import_from='.', binding='PyQt5', hoist_stylesheets=None, share_values=None, root=None, split_lines=None, probes=False, wire_slots=None, elide_defaults=None, optimize=0, cache=None):
+    """compileUi(uifile, pyfile, execute=False, indent=4, from_imports=False, resource_suffix='_rc', import_from='.', binding='PyQt5', hoist_stylesheets=None, share_values=None, root=None, split_lines=None, probes=False, wire_slots=None, elide_defaults=None, optimize=0, cache=None) -> dict
 
     Creates a Python module from a Qt Designer .ui file.
 
@@ -158,23 +283,102 @@ def compileUi(uifile, pyfile, execute=False, indent=4, from_imports=False, resou
     module is foo_rc.
     import_from is optionally set to the package used for relative import
     statements.  The default is ``'.'``.
+    binding is the optional name of the Qt binding the generated code imports,
+    either 'PyQt5' or 'PySide2'.  The default is 'PyQt5'.
+    hoist_stylesheets is optionally set to combine the style sheets of the
+    widgets into a single style sheet set on the top-level widget so that
+    widgets are only polished once.  The rules are rewritten using object names
+    so that they match the same widgets.  If that cannot be done safely then a
+    warning is logged and the style sheets are left unchanged.  If it is None
+    then it is enabled by optimize.  The default is None.
+    share_values is optionally set to only create each distinct font, palette
+    and size policy once in the generated setupUi() and to reuse it for every
+    widget that sets it.  If it is None then it is enabled by optimize.  The
+    default is None.
+    root is the optional object name of a widget or layout.  If it is
+    specified then only it and its descendants are compiled, as the top-level
+    widget of the form, with the connections, resources and custom widgets
+    they use.  The default is None.
+    split_lines is the optional number of lines of generated code above which
+    the code creating a container widget or layout is moved from setupUi() to
+    a method of its own.  Local variables used across methods are passed as
+    arguments and returned as results.  If it is 0 then setupUi() is not
+    split.  If it is None then it is enabled by optimize.  The default is None.
+    probes is optionally set to add timing probes to the generated code around
+    the creation of each container widget or layout and around setupUi() and
+    retranslateUi().  The probes append (name, time) events to the module's
+    _probes list, where a name of None stops the most recently started probe.
+    The default is False.
+    wire_slots is the optional class of the widgets the form will be created
+    in, or a string of the form 'module:Class' naming it.  If it is specified
+    then the on_<object>_<signal> slots of the class are found when the form is
+    compiled and connected by explicit connect() calls rather than by
+    QMetaObject.connectSlotsByName() each time the form is created.  If the
+    widget's class has different slots when the form is created then
+    connectSlotsByName() is called instead.  The default is None.
+    elide_defaults is optionally set to drop the setters in the generated
+    setupUi() that set a property of a Qt widget or layout to its default
+    value.  The default values of each class are found by creating instances
+    of it (creating an offscreen QApplication if there isn't one, or skipping
+    classes not known yet if the application isn't a QApplication) and are kept
+    on disk for each version of PyQt and Qt.  If it is a string then it is the
+    name of the directory they are kept in, otherwise they are kept in
+    $PYQTUIDOC_CACHE_DIR/defaults or ~/.cache/pyqtuidoc/defaults.  If it is
+    None then it is enabled by optimize.  The default is None.
+    optimize is the optional optimization level, from 0 to 2.  It enables the
+    optimization passes of that level whose arguments are None: share_values
+    at level 1, and also hoist_stylesheets, elide_defaults and split_lines=200
+    at level 2.  Setting an argument to False (or split_lines to 0) disables
+    its pass at any level.  The default is 0.
+    cache is an optional CompileCache.  If the .ui file has already been
+    parsed with the same options then the parsed form is taken from the cache
+    and the .ui file isn't parsed again.  The default is None.
+    Returns a dict describing the form.  Its "modules" item is the list of the
+    names of the modules that the custom widgets used by the form are imported
+    from.
     """
 
-    from PyQt5.QtCore import PYQT_VERSION_STR
+    return compileUiTargets(uifile, [(pyfile, dict(execute=execute,
+            indent=indent, from_imports=from_imports,
+            resource_suffix=resource_suffix, import_from=import_from,
+            binding=binding))], hoist_stylesheets=hoist_stylesheets,
+            share_values=share_values, root=root, split_lines=split_lines,
+            probes=probes, wire_slots=wire_slots,
+            elide_defaults=elide_defaults, optimize=optimize,
+            cache=cache)
+
+
+def compileUiTargets(uifile, targets, hoist_stylesheets=None, share_values=None, root=None, split_lines=None, probes=False, wire_slots=None, elide_defaults=None, optimize=0, cache=None):
+    """compileUiTargets(uifile, targets, hoist_stylesheets=None, share_values=None, root=None, split_lines=None, probes=False, wire_slots=None, elide_defaults=None, optimize=0, cache=None) -> dict
+
+    Creates several Python modules from a Qt Designer .ui file that is only
+    parsed once.
+
+    uifile is a file name or file-like object containing the .ui file.
+    targets is a sequence of 2-tuples of the file-like object to which the
+    Python code will be written to and a dict of any of the keyword arguments
+    of compileUi() (execute, indent, from_imports, resource_suffix,
+    import_from and binding) to use for that module.
+    hoist_stylesheets, share_values, root, split_lines, probes, wire_slots,
+    elide_defaults, optimize and cache are as for compileUi().
+    Returns a dict describing the form as returned by compileUi().
+    """
 
     try:
         uifname = uifile.name
     except AttributeError:
         uifname = uifile
 
-    indenter.indentwidth = indent
-
-    pyfile.write(_header % (uifname, PYQT_VERSION_STR))
+    form = _parseForm(uifile, cache, hoist_stylesheets=hoist_stylesheets,
+            share_values=share_values, root=root, split_lines=split_lines,
+            probes=probes, wire_slots=wire_slots,
+            elide_defaults=elide_defaults, optimize=optimize)
 
-    winfo = compiler.UICompiler().compileUi(uifile, pyfile, from_imports, resource_suffix, import_from)
+    winfo = dict(form.winfo)
+    for pyfile, compileUi_args in targets:
+        winfo = _writeForm(form, uifname, pyfile, **compileUi_args)
 
-    if execute:
-        indenter.write_code(_display_code % winfo)
+    return winfo
 
 
 def loadUiType(uifile, from_imports=False, resource_suffix='_rc', import_from='.'):
@@ -239,6 +443,8 @@ def loadUi(uifile, baseinstance=None, package='', resource_suffix='_rc'):
     from the resource file by pyrcc4.  The default is '_rc', i.e. if the .ui
     file specified a resource file called foo.qrc then the corresponding Python
     module is foo_rc.
+    The .ui file is parsed every time.  Use a FormFactory to create many
+    instances of the same form.
     """
 
     from PyQt5.uic.Loader.loader import DynamicUILoader
@@ -247,4 +453,4 @@ def loadUi(uifile, baseinstance=None, package='', resource_suffix='_rc'):
 
 
 # The list of directories that are searched for widget plugins.
-from PyQt5.uic.objcreator import widgetPluginPath
+from .objcreator import widgetPluginPath
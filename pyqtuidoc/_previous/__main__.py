@@ -3,11 +3,16 @@
 """
 """
 
+import os
 import sys
 import pyqtuidoc
 from argparse import ArgumentParser
 import logging
-from . import compileUi, loadUi
+from . import compileUi, compileUiDir, loadUi
+from .cache import CompileCache, parseSize
+from .exceptions import NoSuchClassError, NoSuchWidgetError
+from .Compiler.passes import MAX_OPTIMIZE
+from .Compiler.slots import slotClass
 
 PROG = 'qtuidocmake'
 
@@ -33,12 +38,25 @@ class Driver(object):
         self._opts = opts
         self._ui_file = ui_file
 
+        if opts.cache:
+            self._cache = CompileCache(opts.cache, parseSize(opts.cache_size))
+        else:
+            self._cache = None
+
     def invoke(self):
         """ Generate the Python code. """
 
+        if self._opts.zip:
+            return self._invoke_archive()
+
         needs_close = False
+        write_if_changed = self._opts.write_if_changed and self._opts.output != '-'
 
-        if sys.hexversion >= 0x03000000:
+        if write_if_changed:
+            from io import StringIO
+
+            pyfile = StringIO()
+        elif sys.hexversion >= 0x03000000:
             if self._opts.output == '-':
                 from io import TextIOWrapper
 
@@ -63,11 +81,61 @@ class Driver(object):
         else:
             from_imports = False
 
-        compileUi(self._ui_file, pyfile, self._opts.execute, self._opts.indent,
-                  from_imports, self._opts.resource_suffix, import_from)
-
-        if needs_close:
+        winfo = compileUi(self._ui_file, pyfile, self._opts.execute,
+                          self._opts.indent, from_imports,
+                          self._opts.resource_suffix, import_from,
+                          self._opts.binding, self._opts.hoist_stylesheets,
+                          self._opts.share_values, self._opts.root,
+                          self._opts.split_lines, self._opts.probes,
+                          self._opts.wire_slots, self._opts.elide_defaults,
+                          self._opts.optimize,
+                          self._cache)
+
+        if write_if_changed:
+            from .output import writeIfChanged
+
+            writeIfChanged(self._opts.output, pyfile.getvalue())
+        elif needs_close:
             pyfile.close()
+
+        if self._opts.depfile:
+            from .depends import uiDependencies, writeDepfile
+
+            writeDepfile(self._opts.depfile, self._opts.output,
+                         uiDependencies(self._ui_file, winfo["modules"]))
+
+        return 0
+
+    def report_cache_stats(self):
+        """ Write the statistics of the compile cache to stderr. """
+
+        if self._cache is not None:
+            stats = self._cache.stats()
+            sys.stderr.write("cache: %d hits, %d misses, %d bytes in %s\n" % (
+                    stats['hits'], stats['misses'], stats['size'],
+                    self._cache.directory))
+
+    def _invoke_archive(self):
+        """ Generate a zip archive of the modules of a directory tree. """
+
+        import_from = self._opts.import_from or '.'
+        from_imports = bool(self._opts.import_from) or self._opts.from_imports
+
+        compileUiDir(self._ui_file, recurse=True,
+                     write_if_changed=self._opts.write_if_changed,
+                     archive=self._opts.output, compile_pyc=self._opts.pyc,
+                     execute=self._opts.execute, indent=self._opts.indent,
+                     from_imports=from_imports,
+                     resource_suffix=self._opts.resource_suffix,
+                     import_from=import_from, binding=self._opts.binding,
+                     hoist_stylesheets=self._opts.hoist_stylesheets,
+                     share_values=self._opts.share_values,
+                     split_lines=self._opts.split_lines,
+                     probes=self._opts.probes,
+                     wire_slots=self._opts.wire_slots,
+                     elide_defaults=self._opts.elide_defaults,
+                     optimize=self._opts.optimize, cache=self._cache)
+
         return 0
 
     def on_IOError(self, e):
@@ -127,6 +195,33 @@ def cli():
         metavar="FILE",
         help="write generated code to FILE instead of stdout"
     )
+    group.add_argument(
+        "--write-if-changed",
+        dest="write_if_changed",
+        action="store_true",
+        default=False,
+        help="only write FILE if the generated code differs from its content"
+    )
+    group.add_argument(
+        "--depfile",
+        dest="depfile",
+        metavar="DEPFILE",
+        help="write a Makefile/Ninja style dependency file for FILE to DEPFILE"
+    )
+    group.add_argument(
+        "--zip",
+        dest="zip",
+        action="store_true",
+        default=False,
+        help="compile the .ui files in the directory tree path into the zip archive FILE"
+    )
+    group.add_argument(
+        "--pyc",
+        dest="pyc",
+        action="store_true",
+        default=False,
+        help="also add the compiled bytecode of each module to the zip archive"
+    )
     group.add_argument(
         "-x", "--execute",
         dest="execute",
@@ -172,6 +267,108 @@ def cli():
         metavar="SUFFIX",
         help="append SUFFIX to the basename of resource files [default: _rc]"
     )
+    group.add_argument(
+        "--binding",
+        dest="binding",
+        choices=("PyQt5", "PySide2"),
+        default="PyQt5",
+        help="generate code for the Qt binding BINDING [default: PyQt5]"
+    )
+    group.add_argument(
+        "--hoist-stylesheets",
+        dest="hoist_stylesheets",
+        action="store_true",
+        default=None,
+        help="combine the stylesheets of the widgets into one stylesheet set on the top-level widget"
+    )
+    group.add_argument(
+        "--no-hoist-stylesheets",
+        dest="hoist_stylesheets",
+        action="store_false",
+        help="don't hoist the stylesheets even if -O enables it"
+    )
+    group.add_argument(
+        "--share-values",
+        dest="share_values",
+        action="store_true",
+        default=None,
+        help="create identical fonts, palettes and size policies only once"
+    )
+    group.add_argument(
+        "--no-share-values",
+        dest="share_values",
+        action="store_false",
+        help="don't share values even if -O enables it"
+    )
+    group.add_argument(
+        "--root",
+        dest="root",
+        metavar="OBJECTNAME",
+        help="only compile the widget or layout OBJECTNAME and its descendants"
+    )
+    group.add_argument(
+        "--split-setupui",
+        dest="split_lines",
+        type=int,
+        metavar="N",
+        help="move the code of containers longer than N lines from setupUi() to methods of their own, 0 never splits setupUi() even if -O enables it"
+    )
+    group.add_argument(
+        "--probes",
+        dest="probes",
+        action="store_true",
+        default=False,
+        help="add timing probes around the code creating each container and around setupUi() and retranslateUi()"
+    )
+    group.add_argument(
+        "--wire-slots",
+        dest="wire_slots",
+        metavar="MODULE:CLASS",
+        help="connect the on_<object>_<signal> slots of the class CLASS explicitly instead of by connectSlotsByName()"
+    )
+    group.add_argument(
+        "--elide-defaults",
+        dest="elide_defaults",
+        action="store_true",
+        default=None,
+        help="drop the setters in setupUi() that set a property of a Qt widget or layout to its default value"
+    )
+    group.add_argument(
+        "--no-elide-defaults",
+        dest="elide_defaults",
+        action="store_false",
+        help="don't drop default setters even if -O enables it"
+    )
+    group.add_argument(
+        "-O",
+        dest="optimize",
+        type=int,
+        choices=range(MAX_OPTIMIZE + 1),
+        default=0,
+        metavar="LEVEL",
+        help="enable the optimization passes of LEVEL 0-%d: 1 shares values, 2 also hoists stylesheets, elides defaults and splits setupUi() [default: 0]" % MAX_OPTIMIZE
+    )
+    group.add_argument(
+        "--cache",
+        dest="cache",
+        default=os.environ.get("PYQTUIDOC_CACHE_DIR"),
+        metavar="DIR",
+        help="reuse forms parsed with the same options from the cache in DIR [default: $PYQTUIDOC_CACHE_DIR]"
+    )
+    group.add_argument(
+        "--cache-size",
+        dest="cache_size",
+        default="512M",
+        metavar="SIZE",
+        help="remove the least recently used forms when the cache grows beyond SIZE [default: 512M]"
+    )
+    group.add_argument(
+        "--cache-stats",
+        dest="cache_stats",
+        action="store_true",
+        default=False,
+        help="write the hit and miss statistics of the cache to stderr"
+    )
     group.add_argument(
         '-v', '--verbose',
         action='count',
@@ -191,6 +388,23 @@ def cli():
 def main(*args, **kwargs):
     parser = cli(*args, **kwargs)
     opts = parser.parse_args()
+    if opts.depfile and opts.output == '-':
+        parser.error("--depfile requires --output")
+    if opts.zip and opts.output == '-':
+        parser.error("--zip requires --output")
+    if opts.zip and (opts.depfile or opts.root):
+        parser.error("--zip cannot be used with --depfile or --root")
+    if opts.pyc and not opts.zip:
+        parser.error("--pyc requires --zip")
+    try:
+        parseSize(opts.cache_size)
+        if opts.wire_slots:
+            # The class is usually in the application being built.
+            if os.getcwd() not in sys.path:
+                sys.path.insert(0, os.getcwd())
+            slotClass(opts.wire_slots)
+    except ValueError as e:
+        parser.error(str(e))
     opts.verbose = 40 - (10 * opts.verbose) if opts.verbose > 0 else 0
     logging.basicConfig(level=opts.verbose, format='%(asctime)s %(levelname)s: %(message)s',
                     datefmt='%Y-%m-%d %H:%M:%S')
@@ -219,6 +433,9 @@ def main(*args, **kwargs):
     except Exception as e:
         driver.on_Exception(e)
 
+    if opts.cache_stats:
+        driver.report_cache_stats()
+
     sys.exit(exit_status)
 
 if __name__ == '__main__':
@@ -0,0 +1,316 @@
+"""
+A content addressed cache of parsed .ui files.
+
+A cache is a directory that may be shared by any number of checkouts and
+processes.  Each entry is the parsed form of a .ui file, i.e. everything
+needed to write its Python module, and is named after the hash of the content
+of the .ui file, the options that affect parsing and the versions of the
+generator and of PyQt.  Entries are written atomically and the least recently
+used are removed when the cache grows beyond its maximum size.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .output import writeAtomic
+
+
+logger = logging.getLogger(__name__)
+DEBUG = logger.debug
+
+
+# Changing this invalidates all existing entries.
+CACHE_VERSION = 1
+
+# The default maximum size of a cache in bytes.
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+# When the cache is cleaned up it is reduced to this fraction of its maximum
+# size so that it isn't cleaned up again by the next few entries.
+_CLEANUP_FRACTION = 0.8
+
+_STATS_FILE = 'stats.json'
+_LOCK_FILE = 'stats.lock'
+
+_size_re = re.compile(r'^\s*(\d+(?:\.\d*)?)\s*([kmgt]?)i?b?\s*$', re.I)
+
+
+def parseSize(text):
+    """parseSize(text) -> int
+
+    Return the number of bytes of a size such as '500M' or '2G'.  A ValueError
+    is raised if the size is invalid.
+    """
+
+    m = _size_re.match(text)
+    if m is None:
+        raise ValueError("invalid size %s" % text)
+
+    value, unit = m.groups()
+
+    return int(float(value) * 1024 ** ' kmgt'.index(unit.lower() or ' '))
+
+
+class CompileCache(object):
+    """ A directory of parsed .ui files. """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        """ Initialise the cache.  directory is the name of the directory,
+        which is created if necessary.  max_size is the size in bytes above
+        which the least recently used entries are removed.
+        """
+
+        self.directory = directory
+        self.max_size = max_size
+
+        try:
+            os.makedirs(directory)
+        except OSError:
+            pass
+
+    def key(self, ui_data, parse_args, base_dir='', ui_dir=''):
+        """ Return the key of a .ui file.  ui_data is the content of the .ui
+        file as bytes.  parse_args is the dict of the keyword arguments passed
+        to UICompiler.parseUi().  base_dir is the directory that relative
+        pixmap file names are prefixed with in the generated code, i.e. the
+        directory of the .ui file as it was named.  ui_dir is the absolute
+        directory of the .ui file.  It is only part of the key when a root is
+        being compiled as the .qrc files it includes are then read.
+        """
+
+        import pyqtuidoc
+        from PyQt5.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+
+        # An argument set to False disables a pass that optimize would
+        # enable, so only the unset arguments are left out.
+        args = dict((name, value) for name, value in parse_args.items()
+                if value is not None)
+        if not args.get('root'):
+            ui_dir = ''
+
+        # The generated code also depends on the slots of the class.
+        if args.get('wire_slots'):
+            from .Compiler.slots import slotClass, slotNames
+
+            cls = slotClass(args['wire_slots'])
+            args['wire_slots'] = '%s.%s %s' % (cls.__module__,
+                    cls.__qualname__, slotNames(cls))
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps([CACHE_VERSION, pyqtuidoc.__version__,
+                PYQT_VERSION_STR, QT_VERSION_STR, sorted(args.items()),
+                base_dir, ui_dir]).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(ui_data)
+
+        return digest.hexdigest()
+
+    def get(self, key):
+        """ Return the CompiledForm cached with a key or None if there isn't
+        one.
+        """
+
+        from .Compiler.compiler import CompiledForm
+
+        path = self._path(key)
+
+        try:
+            with open(path, 'rb') as entry_file:
+                entry = json.loads(entry_file.read().decode('utf-8'))
+
+            form = CompiledForm([tuple(line) for line in entry['lines']],
+                    entry['resources'], entry['winfo'])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._updateStats(misses=1)
+            return None
+
+        # Mark the entry as recently used.
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        self._updateStats(hits=1)
+
+        return form
+
+    def put(self, key, form):
+        """ Add a CompiledForm to the cache. """
+
+        data = json.dumps(dict(lines=form.lines, resources=form.resources,
+                winfo=form.winfo), separators=(',', ':')).encode('utf-8')
+
+        path = self._path(key)
+
+        try:
+            os.makedirs(os.path.dirname(path))
+        except OSError:
+            pass
+
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+
+        writeAtomic(path, data)
+
+        stats = self._updateStats(size=len(data) - old_size)
+
+        if stats['size'] > self.max_size:
+            self.cleanup()
+
+    def parseUi(self, uifile, **parse_args):
+        """ Return the CompiledForm of a .ui file, which is only parsed if
+        it isn't in the cache.  uifile is a file name or a seekable file-like
+        object.  parse_args are the keyword arguments of
+        UICompiler.parseUi().
+        """
+
+        from .Compiler import compiler
+        from ..uitree import uiDir
+
+        # The parser prefixes pixmap file names with the directory of a .ui
+        # file given by name.
+        if hasattr(uifile, 'read'):
+            ui_data = uifile.read()
+            uifile.seek(0)
+            base_dir = ''
+
+            if not isinstance(ui_data, bytes):
+                ui_data = ui_data.encode('utf-8')
+        else:
+            with open(uifile, 'rb') as ui_fobj:
+                ui_data = ui_fobj.read()
+
+            base_dir = os.path.dirname(str(uifile))
+
+        key = self.key(ui_data, parse_args, base_dir, uiDir(uifile))
+
+        form = self.get(key)
+        if form is None:
+            DEBUG("cache miss for %s" % getattr(uifile, 'name', uifile))
+
+            form = compiler.UICompiler().parseUi(uifile, **parse_args)
+            self.put(key, form)
+
+        return form
+
+    def cleanup(self, max_size=None):
+        """ Remove the least recently used entries until the cache is smaller
+        than a fraction of max_size, which defaults to the maximum size of
+        the cache.
+        """
+
+        if max_size is None:
+            max_size = self.max_size
+
+        entries = []
+        size = 0
+
+        for dirpath, _, filenames in os.walk(self.directory):
+            if dirpath == self.directory:
+                continue
+
+            for filename in filenames:
+                # Ignore the temporary files of entries being written.
+                if filename.startswith('.'):
+                    continue
+
+                path = os.path.join(dirpath, filename)
+
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+
+                entries.append((st.st_mtime, st.st_size, path))
+                size += st.st_size
+
+        entries.sort()
+        removed = 0
+
+        for _, entry_size, path in entries:
+            if size <= max_size * _CLEANUP_FRACTION:
+                break
+
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+
+            size -= entry_size
+            removed += 1
+
+        DEBUG("removed %d cache entries" % removed)
+
+        self._updateStats(total_size=size)
+
+    def stats(self):
+        """ Return a dict of the numbers of hits and misses and the total
+        size of the entries in bytes.
+        """
+
+        return self._updateStats()
+
+    def clearStats(self):
+        """ Reset the numbers of hits and misses. """
+
+        self._updateStats(reset=True)
+
+    def _path(self, key):
+        """ Return the name of the file of an entry. """
+
+        return os.path.join(self.directory, key[:2], key[2:] + '.json')
+
+    def _updateStats(self, hits=0, misses=0, size=0, total_size=None, reset=False):
+        """ Update the statistics shared by all users of the cache and return
+        them.  total_size replaces the size rather than incrementing it.  If
+        reset is set then the numbers of hits and misses are reset.
+        """
+
+        stats_path = os.path.join(self.directory, _STATS_FILE)
+        lock_file = None
+
+        if fcntl is not None:
+            try:
+                lock_file = open(os.path.join(self.directory, _LOCK_FILE),
+                        'a')
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except OSError:
+                lock_file = None
+
+        try:
+            stats = dict(hits=0, misses=0, size=0)
+
+            try:
+                with open(stats_path) as stats_file:
+                    stats.update(json.load(stats_file))
+            except (OSError, ValueError):
+                pass
+
+            if hits or misses or size or total_size is not None or reset:
+                if reset:
+                    stats['hits'] = stats['misses'] = 0
+
+                stats['hits'] += hits
+                stats['misses'] += misses
+
+                if total_size is not None:
+                    stats['size'] = total_size
+                else:
+                    stats['size'] = max(0, stats['size'] + size)
+
+                writeAtomic(stats_path, json.dumps(stats).encode('utf-8'))
+        finally:
+            if lock_file is not None:
+                lock_file.close()
+
+        return stats
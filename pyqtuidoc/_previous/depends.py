@@ -0,0 +1,123 @@
+"""
+Support for writing Makefile/Ninja style dependency files for generated
+modules.
+"""
+
+import importlib.machinery
+import logging
+import os
+import sys
+
+from ..uitree import assetFiles, parseUi, resourceFiles, uiDir
+
+
+logger = logging.getLogger(__name__)
+DEBUG = logger.debug
+
+
+def _findModule(parts, directory):
+    """ Return the file implementing the module with the dotted name parts
+    below a directory or None if there isn't one.
+    """
+
+    base = os.path.join(directory, *parts)
+
+    for suffix in (importlib.machinery.SOURCE_SUFFIXES +
+            importlib.machinery.EXTENSION_SUFFIXES):
+        if os.path.isfile(base + suffix):
+            return base + suffix
+
+    init = os.path.join(base, '__init__.py')
+    if os.path.isfile(init):
+        return init
+
+    return None
+
+
+def _moduleFile(name, ui_dir):
+    """ Return the file implementing the module name or None if it can't be
+    found.  The module is looked for along sys.path without importing it or
+    its parent packages, as that would run their code.
+    """
+
+    parts = name.lstrip('.').split('.')
+
+    # Relative imports are resolved from the directory of the .ui file.
+    if name.startswith('.'):
+        directories = [ui_dir]
+    else:
+        module = sys.modules.get(name)
+        path = getattr(module, '__file__', None)
+        if path is not None:
+            return path
+
+        directories = [entry or os.curdir for entry in sys.path
+                if isinstance(entry, str) and os.path.isdir(entry or os.curdir)]
+        directories.append(ui_dir)
+
+    for directory in directories:
+        path = _findModule(parts, directory)
+        if path is not None:
+            return path
+
+    DEBUG("unable to find the file of custom widget module %s" % name)
+
+    return None
+
+
+def uiDependencies(uifile, modules=()):
+    """uiDependencies(uifile, modules=()) -> list
+
+    Return the names of the files that a module generated from a Qt Designer
+    .ui file depends on.
+
+    uifile is the name of the .ui file.
+    modules is the sequence of the names of the modules containing custom
+    widgets, as returned by compileUi().
+    The list contains the .ui file, the existing .qrc files it includes, the
+    existing pixmap files it uses (including those referred to by resource
+    paths) and the files implementing the custom widget modules.
+    """
+
+    ui_dir = uiDir(uifile)
+    ui = parseUi(uifile)
+
+    deps = [os.path.abspath(uifile)]
+    deps.extend(path for path in resourceFiles(ui, ui_dir) + assetFiles(ui, ui_dir)
+                if os.path.isfile(path))
+
+    for module in modules:
+        path = _moduleFile(module, ui_dir)
+        if path is not None:
+            deps.append(os.path.abspath(path))
+
+    unique = []
+    for dep in deps:
+        if dep not in unique:
+            unique.append(dep)
+
+    return unique
+
+
+def _escape(path):
+    """ Escape a file name for use in a depfile. """
+
+    return path.replace('\\', '/').replace('$', '$$').replace('#', '\\#').replace(' ', '\\ ')
+
+
+def writeDepfile(depfile, target, dependencies):
+    """writeDepfile(depfile, target, dependencies)
+
+    Write a Makefile/Ninja style dependency file.
+
+    depfile is the name of the file to write.
+    target is the name of the generated module.
+    dependencies is the sequence of the names of the files the target depends
+    on.
+    """
+
+    lines = ["%s:" % _escape(target)]
+    lines.extend(" %s" % _escape(dep) for dep in dependencies)
+
+    with open(depfile, 'w') as dep_file:
+        dep_file.write(" \\\n".join(lines) + "\n")
@@ -0,0 +1,139 @@
+"""
+Support for creating many instances of the same form.
+
+A FormFactory parses a .ui file and compiles the generated code once, so that
+the cost of creating an instance of the form doesn't depend on the size of
+the XML.
+"""
+
+import logging
+import os
+import time
+
+
+logger = logging.getLogger(__name__)
+DEBUG = logger.debug
+
+
+class FormFactory(object):
+    """ A factory for the instances of a form defined by a .ui file. """
+
+    def __init__(self, uifile, from_imports=False, resource_suffix='_rc', import_from='.', check_interval=1.0):
+        """ Initialise the factory.  uifile is the name of the .ui file.
+        from_imports, resource_suffix and import_from are as for
+        loadUiType().  check_interval is the minimum number of seconds
+        between checks of whether the .ui file has changed.  If it is None
+        then the file is never checked.
+        """
+
+        self.uifile = uifile
+        self.check_interval = check_interval
+
+        self._type_args = (from_imports, resource_suffix, import_from)
+        self._form_class = None
+        self._base_class = None
+        self._signature = None
+        self._checked = 0.0
+        self._pool = []
+
+    def create(self, baseinstance=None):
+        """ Return an instance of the form.  baseinstance is an optional
+        instance of the Qt base class.  If specified then the user interface
+        is created in it.  Otherwise an instance is taken from the pool or a
+        new instance of the base class is created.  As with loadUi() the
+        objects of the form are attributes of the returned widget.
+        """
+
+        self._check()
+
+        if baseinstance is None and self._pool:
+            return self._pool.pop()
+
+        return self._create(baseinstance)
+
+    def fill(self, count):
+        """ Create instances of the form in advance, e.g. while the
+        application is idle, so that the next count calls of create() only
+        take one from the pool.
+        """
+
+        self._check()
+
+        while len(self._pool) < count:
+            self._pool.append(self._create(None))
+
+    def clear(self):
+        """ Delete the instances in the pool. """
+
+        for widget in self._pool:
+            widget.deleteLater()
+
+        self._pool = []
+
+    def invalidate(self):
+        """ Discard the compiled form and the pool so that the .ui file is
+        parsed again by the next call of create().
+        """
+
+        self.clear()
+        self._form_class = None
+
+    def formClass(self):
+        """ Return the 2-tuple of the generated form class and the Qt base
+        class, as returned by loadUiType().
+        """
+
+        self._check()
+
+        return self._form_class, self._base_class
+
+    def _create(self, baseinstance):
+        """ Create an instance of the form. """
+
+        if baseinstance is None:
+            baseinstance = self._base_class()
+
+        ui = self._form_class()
+        ui.setupUi(baseinstance)
+
+        baseinstance.__dict__.update(ui.__dict__)
+
+        return baseinstance
+
+    def _check(self):
+        """ Load the form if it hasn't been loaded or the .ui file has
+        changed since it was.
+        """
+
+        if self._form_class is not None:
+            if self.check_interval is None:
+                return
+
+            now = time.monotonic()
+            if now - self._checked < self.check_interval:
+                return
+
+            self._checked = now
+
+            if self._stat() == self._signature:
+                return
+
+            DEBUG("%s has changed" % self.uifile)
+            self.invalidate()
+
+        from . import loadUiType
+
+        self._signature = self._stat()
+        self._checked = time.monotonic()
+        self._form_class, self._base_class = loadUiType(self.uifile,
+                *self._type_args)
+
+    def _stat(self):
+        """ Return what identifies a version of the .ui file. """
+
+        try:
+            st = os.stat(self.uifile)
+        except OSError:
+            return None
+
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
@@ -0,0 +1,205 @@
+"""
+Support for importing .ui files as modules.
+
+Once the import hook is installed, importing a module whose name ends with
+'_ui', e.g. forms.settings_ui, finds the .ui file without the suffix, e.g.
+forms/settings.ui, and imports the code generated from it.  The compiled code
+is cached in the __pycache__ directory next to the .ui file as a hash based
+.pyc file that is checked against the content of the .ui file, so the .ui
+file is only compiled again after it changes.
+"""
+
+import importlib.abc
+import importlib.util
+import logging
+import marshal
+import os
+import sys
+
+
+logger = logging.getLogger(__name__)
+DEBUG = logger.debug
+
+
+# The flags of a hash based .pyc file whose source is checked.
+_HASH_BASED_CHECKED = 3
+
+
+class UiFinder(importlib.abc.MetaPathFinder):
+    """ A meta path finder for the modules generated from .ui files. """
+
+    def __init__(self, suffix='_ui', **compileUi_args):
+        """ Initialise the finder.  suffix is the end of the names of the
+        modules that are looked for as .ui files.  compileUi_args are any
+        keyword arguments of compileUi() used when compiling the .ui files.
+        """
+
+        self.suffix = suffix
+        self.compileUi_args = compileUi_args
+
+    def find_spec(self, fullname, path, target=None):
+        """ Return the spec of a module if it is generated from a .ui file.
+        """
+
+        name = fullname.rpartition('.')[2]
+        if not name.endswith(self.suffix) or name == self.suffix:
+            return None
+
+        ui_file = name[:-len(self.suffix)] + '.ui'
+
+        for entry in (sys.path if path is None else path):
+            if not isinstance(entry, str):
+                continue
+
+            ui_path = os.path.join(entry or os.curdir, ui_file)
+            if os.path.isfile(ui_path):
+                loader = UiLoader(fullname, os.path.abspath(ui_path),
+                        self.compileUi_args)
+
+                return importlib.util.spec_from_file_location(fullname,
+                        loader.path, loader=loader)
+
+        return None
+
+
+class UiLoader(importlib.abc.Loader):
+    """ A loader of the module generated from a .ui file. """
+
+    def __init__(self, fullname, path, compileUi_args):
+        self.name = fullname
+        self.path = path
+        self.compileUi_args = compileUi_args
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        exec(self.get_code(module.__name__), module.__dict__)
+
+    def is_package(self, fullname):
+        return False
+
+    def get_filename(self, fullname):
+        return self.path
+
+    def get_source(self, fullname):
+        """ Return the generated code of the module. """
+
+        from io import StringIO
+
+        from . import compileUi
+
+        code_string = StringIO()
+        compileUi(self.path, code_string, **self.compileUi_args)
+
+        return code_string.getvalue()
+
+    def get_code(self, fullname):
+        """ Return the code object of the module, from the cached .pyc file
+        if it is up to date.
+        """
+
+        with open(self.path, 'rb') as ui_file:
+            source_hash = importlib.util.source_hash(self._signature() +
+                    ui_file.read())
+
+        pyc_path = self.cachePath()
+        header = importlib.util.MAGIC_NUMBER + \
+                _HASH_BASED_CHECKED.to_bytes(4, 'little') + source_hash
+
+        if pyc_path is not None:
+            try:
+                with open(pyc_path, 'rb') as pyc_file:
+                    data = pyc_file.read()
+
+                if data[:len(header)] == header:
+                    return marshal.loads(data[len(header):])
+            except (OSError, ValueError, EOFError, TypeError):
+                pass
+
+        DEBUG("compiling %s" % self.path)
+
+        code = compile(self.get_source(fullname), self.path, 'exec',
+                dont_inherit=True)
+
+        if pyc_path is not None and not sys.dont_write_bytecode:
+            from .output import writeAtomic
+
+            try:
+                os.makedirs(os.path.dirname(pyc_path), exist_ok=True)
+                writeAtomic(pyc_path, header + marshal.dumps(code))
+            except OSError as e:
+                DEBUG("unable to write %s: %s" % (pyc_path, e))
+
+        return code
+
+    def cachePath(self):
+        """ Return the name of the .pyc file of the module or None if
+        bytecode isn't cached.  It is named after the .ui file so that it
+        doesn't clash with the .pyc file of a .py file with the same stem.
+        """
+
+        tag = sys.implementation.cache_tag
+        if tag is None:
+            return None
+
+        dirname, basename = os.path.split(self.path)
+
+        return os.path.join(dirname, '__pycache__',
+                '%s.%s.pyc' % (basename, tag))
+
+    def _signature(self):
+        """ Return what, besides the .ui file, the generated code depends on.
+        """
+
+        import pyqtuidoc
+        from PyQt5.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+
+        # The cache doesn't change the generated code and its repr() isn't
+        # the same from one run to the next.
+        args = dict((name, value)
+                for name, value in self.compileUi_args.items()
+                if name != 'cache')
+
+        # The generated code also depends on the slots of the class.
+        if args.get('wire_slots'):
+            from .Compiler.slots import slotClass, slotNames
+
+            cls = slotClass(args['wire_slots'])
+            args['wire_slots'] = '%s.%s %s' % (cls.__module__,
+                    cls.__qualname__, slotNames(cls))
+
+        options = sorted((name, repr(value)) for name, value in args.items())
+
+        # The default values elided at -O2 depend on the version of Qt.
+        return repr((pyqtuidoc.__version__, PYQT_VERSION_STR, QT_VERSION_STR,
+                options)).encode('utf-8') + b'\0'
+
+
+def installImportHook(suffix='_ui', **compileUi_args):
+    """installImportHook(suffix='_ui', **compileUi_args) -> UiFinder
+
+    Install an import hook so that importing a module whose name ends with
+    suffix imports the code generated from the .ui file with the same name
+    without the suffix.  The hook comes after the standard ones, so an
+    existing module with that name is imported instead.
+
+    suffix is the end of the names of the modules to look for as .ui files.
+    The default is '_ui'.
+    compileUi_args are any keyword arguments of compileUi() (e.g.
+    from_imports or optimize) to use when compiling the .ui files.
+    Returns the finder.  Remove it from sys.meta_path to uninstall the hook.
+    """
+
+    for finder in sys.meta_path:
+        if isinstance(finder, UiFinder) and finder.suffix == suffix:
+            sys.meta_path.remove(finder)
+            break
+
+    finder = UiFinder(suffix, **compileUi_args)
+    sys.meta_path.append(finder)
+
+    # Forget any earlier failures to find a module.
+    importlib.invalidate_caches()
+
+    return finder
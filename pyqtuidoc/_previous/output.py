@@ -0,0 +1,179 @@
+"""
+Helpers for writing generated modules to disk.
+"""
+
+import os
+
+
+def _createTemp(dirname, basename):
+    """ Create a new temporary file in a directory for the file basename and
+    return its descriptor and name.  It is created with the permissions of a
+    new file, i.e. those allowed by the umask, which is never changed so that
+    files created by other threads aren't affected.
+    """
+
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+    while True:
+        tmp_path = os.path.join(dirname,
+                '.%s.%s.tmp' % (basename, os.urandom(6).hex()))
+
+        try:
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            pass
+
+
+def writeAtomic(path, data):
+    """writeAtomic(path, data)
+
+    Write the bytes data to the file path so that readers only ever see the
+    old or the new content.
+
+    The data is written to a temporary file in the same directory which is
+    then renamed over path.  The permissions of an existing file are kept and
+    a new file gets those allowed by the umask.
+    """
+
+    dirname, basename = os.path.split(path)
+    fd, tmp_path = _createTemp(dirname or '.', basename)
+
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data)
+
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+
+        os.replace(tmp_path, path)
+    except:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+        raise
+
+
+def writeIfChanged(path, text, encoding='utf-8'):
+    """writeIfChanged(path, text, encoding='utf-8') -> bool
+
+    Write text to the file path unless the file already has that content.
+
+    The size of the existing file is compared first so that the file only has
+    to be read if the sizes match.  The file is written with writeAtomic() so
+    its modification time is only changed when its content is.  Returns True
+    if the file was written.
+    """
+
+    data = text.replace('\n', os.linesep).encode(encoding)
+
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as old_file:
+                if old_file.read() == data:
+                    return False
+    except OSError:
+        pass
+
+    writeAtomic(path, data)
+
+    return True
+
+
+class ModuleArchive(object):
+    """ A zip archive of generated modules that can be imported using
+    zipimport.
+
+    The modules are collected in memory and the archive is written when it is
+    closed.  Its content only depends on the names and content of the modules
+    so that an unchanged archive doesn't need to be written again.
+    """
+
+    # The timestamp given to every member of the archive.
+    DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+    def __init__(self, path, compile_pyc=False):
+        """ Initialise the archive.  path is the name of the zip file.
+        compile_pyc is set if a .pyc file is added next to each module.
+        """
+
+        self.path = path
+        self.compile_pyc = compile_pyc
+        self._members = {}
+
+    def add(self, name, text):
+        """ Add the source code of a module.  name is the name of its .py file
+        within the archive using '/' as the separator.
+        """
+
+        name = name.replace(os.sep, '/')
+        data = text.encode('utf-8')
+
+        self._members[name] = data
+
+        if self.compile_pyc:
+            self._members[name + 'c'] = self._compile(name, data)
+
+        # Add an entry for each directory so that it can be imported as a
+        # namespace package.
+        parts = name.split('/')[:-1]
+        for i in range(len(parts)):
+            self._members.setdefault('/'.join(parts[:i + 1]) + '/', b'')
+
+    def close(self, write_if_changed=False):
+        """ Write the archive and return True if it was written.
+        write_if_changed is set if an existing archive with the same content
+        should be left unchanged.
+        """
+
+        import io
+        import zipfile
+
+        buf = io.BytesIO()
+
+        with zipfile.ZipFile(buf, 'w') as zf:
+            for name in sorted(self._members):
+                info = zipfile.ZipInfo(name, self.DATE_TIME)
+
+                if name.endswith('/'):
+                    info.external_attr = (0o40755 << 16) | 0x10
+                else:
+                    info.external_attr = 0o644 << 16
+                    info.compress_type = zipfile.ZIP_DEFLATED
+
+                zf.writestr(info, self._members[name])
+
+        data = buf.getvalue()
+
+        if write_if_changed:
+            try:
+                if os.path.getsize(self.path) == len(data):
+                    with open(self.path, 'rb') as old_file:
+                        if old_file.read() == data:
+                            return False
+            except OSError:
+                pass
+
+        writeAtomic(self.path, data)
+
+        return True
+
+    @staticmethod
+    def _compile(name, data):
+        """ Return the content of a .pyc file of a module.  A hash based .pyc
+        is used as the timestamps in the archive are fixed.  Its source isn't
+        checked when it is imported, as the archive is always written as a
+        whole, so that zipimport doesn't read and hash the source as well.
+        """
+
+        import importlib.util
+        import marshal
+
+        code = compile(data, name, 'exec', dont_inherit=True)
+
+        # The flags say the .pyc is hash based and its source isn't checked.
+        return (importlib.util.MAGIC_NUMBER + (1).to_bytes(4, 'little') +
+                importlib.util.source_hash(data) + marshal.dumps(code))
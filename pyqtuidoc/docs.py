@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Generation of a static HTML documentation site for a library of Qt Designer
+.ui files. Each form gets a page of its own, rendered from its XML alone, and
+the forms are listed by sharded index pages. Pages are rendered and written by
+a pool of worker processes and only the small summaries needed by the index
+are kept in memory. Forms whose source didn't change since the last run are
+not rendered again.
+"""
+
+import hashlib
+import html
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .uitree import findProperty, parseUi, uiFiles
+
+# Changing this re-renders all pages.
+DOCS_VERSION = 2
+
+# The file in the output directory that records what has been rendered.
+MANIFEST = ".pyqtuidoc-docs.json"
+
+# The number of forms listed by each index page.
+SHARD_SIZE = 500
+
+# The properties that are shown as the documentation of a widget.
+DOC_PROPERTIES = ("toolTip", "statusTip", "whatsThis")
+
+STYLE = """body { font-family: sans-serif; margin: 2em; }
+ul.tree, ul.tree ul { list-style: none; padding-left: 1.5em; }
+.class { color: #666; }
+.doc { color: #075; }
+table { border-collapse: collapse; }
+td, th { border: 1px solid #ccc; padding: 0.2em 0.5em; text-align: left; vertical-align: top; }
+details { margin: 0.2em 0; }
+"""
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>%(title)s</title>
+<style>
+%(style)s</style>
+</head>
+<body>
+%(body)s
+</body>
+</html>
+"""
+
+
+def sourceHash(path):
+    """Return the hash a page is rendered from: that of the .ui file and of the renderer."""
+    digest = hashlib.sha1(("pyqtuidoc-docs %d\n" % DOCS_VERSION).encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pageName(rel_path):
+    """
+    Return the name of the page of a form relative to the output directory.
+    Pages are kept under forms/ so that they never clash with the index pages.
+    """
+    return "forms/" + os.path.splitext(rel_path)[0].replace(os.sep, "/") + ".html"
+
+
+def valueText(value):
+    """Return a short textual representation of the value element of a property."""
+    if len(value) == 0:
+        return (value.text or "").strip()
+    if value.tag in ("iconset", "pixmap") and (value.text or "").strip():
+        return value.text.strip()
+    parts = ["%s=%s" % item for item in value.attrib.items()]
+    parts.extend("%s=%s" % (child.tag, valueText(child)) for child in value)
+    return "%s(%s)" % (value.tag, ", ".join(parts))
+
+
+def renderWidget(elem, out):
+    """Append the HTML of a widget, layout or spacer and its children to the list out."""
+    kind = "spacer" if elem.tag == "spacer" else elem.attrib.get("class", "")
+    name = elem.attrib.get("name", "")
+    out.append(
+        '<li><b id="%s">%s</b> <span class="class">%s</span>'
+        % (html.escape(name, True), html.escape(name), html.escape(kind))
+    )
+
+    for prop in DOC_PROPERTIES:
+        value = findProperty(elem, prop)
+        if value is not None and (value.text or "").strip():
+            out.append(
+                '<div class="doc">%s: %s</div>' % (prop, html.escape(value.text.strip()))
+            )
+
+    props = [
+        (p.attrib.get("name", ""), valueText(p[0]))
+        for p in elem.findall("property")
+        if len(p) and p.attrib.get("name") not in DOC_PROPERTIES
+    ]
+    props.extend(
+        ("[%s]" % a.attrib.get("name", ""), valueText(a[0]))
+        for a in elem.findall("attribute")
+        if len(a)
+    )
+    if props:
+        out.append("<details><summary>Properties (%d)</summary><table>" % len(props))
+        for prop, text in props:
+            out.append(
+                "<tr><td>%s</td><td>%s</td></tr>" % (html.escape(prop), html.escape(text))
+            )
+        out.append("</table></details>")
+
+    children = []
+    for child in elem:
+        if child.tag in ("widget", "layout", "spacer"):
+            children.append(child)
+        elif child.tag == "item":
+            children.extend(c for c in child if c.tag in ("widget", "layout", "spacer"))
+    if children:
+        out.append("<ul>")
+        for child in children:
+            renderWidget(child, out)
+        out.append("</ul>")
+    out.append("</li>")
+
+
+def renderForm(ui, title, index_href="index.html"):
+    """
+    Render the documentation page of a form.
+    Args:
+        ui[Element]: The root <ui> element of the form.
+        title[str]: The title of the page.
+        index_href[str]: The link to the index page.
+    Returns:
+        A (html, summary) tuple where summary is a dict describing the form
+        for the index.
+    """
+    top = ui.find("widget")
+    cls = ui.findtext("class", "")
+    out = [
+        '<p><a href="%s">Index</a></p>' % html.escape(index_href, True),
+        "<h1>%s</h1>" % html.escape(title),
+    ]
+    summary = {
+        "title": title,
+        "class": cls,
+        "base": top.attrib.get("class", "") if top is not None else "",
+        "widgets": len(list(ui.iter("widget"))),
+        "tooltip": "",
+    }
+    if top is not None:
+        tooltip = findProperty(top, "toolTip")
+        if tooltip is not None:
+            summary["tooltip"] = (tooltip.text or "").strip()
+        window_title = findProperty(top, "windowTitle")
+        if window_title is not None and window_title.text:
+            out.append("<p>%s</p>" % html.escape(window_title.text))
+
+    out.append("<h2>Widgets</h2>")
+    if top is not None:
+        out.append('<ul class="tree">')
+        renderWidget(top, out)
+        out.append("</ul>")
+
+    customwidgets = ui.findall("customwidgets/customwidget")
+    if customwidgets:
+        out.append("<h2>Custom widgets</h2>")
+        out.append("<table><tr><th>Class</th><th>Extends</th><th>Header</th></tr>")
+        for cw in customwidgets:
+            out.append(
+                "<tr><td>%s</td><td>%s</td><td>%s</td></tr>"
+                % tuple(
+                    html.escape(cw.findtext(tag, "")) for tag in ("class", "extends", "header")
+                )
+            )
+        out.append("</table>")
+
+    connections = ui.findall("connections/connection")
+    if connections:
+        out.append("<h2>Connections</h2>")
+        out.append(
+            "<table><tr><th>Sender</th><th>Signal</th><th>Receiver</th><th>Slot</th></tr>"
+        )
+        for conn in connections:
+            out.append(
+                "<tr><td>%s</td><td>%s</td><td>%s</td><td>%s</td></tr>"
+                % tuple(
+                    html.escape(conn.findtext(tag, ""))
+                    for tag in ("sender", "signal", "receiver", "slot")
+                )
+            )
+        out.append("</table>")
+
+    return "\n".join(out), summary
+
+
+def writePage(path, title, body):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(PAGE % {"title": html.escape(title), "style": STYLE, "body": body})
+
+
+def buildPage(job):
+    """
+    Render the page of a form and write it. This runs in a worker process so
+    that only the summary is sent back.
+    Args:
+        job[tuple]: (ui_path, page_path, rel_path, source_hash, index_href)
+    Returns:
+        A (rel_path, source_hash, summary, error) tuple.
+    """
+    ui_path, page_path, rel_path, source_hash, index_href = job
+    try:
+        body, summary = renderForm(
+            parseUi(ui_path), rel_path.replace(os.sep, "/"), index_href
+        )
+        os.makedirs(os.path.dirname(page_path), exist_ok=True)
+        writePage(page_path, summary["title"], body)
+    except Exception as e:
+        return rel_path, source_hash, None, str(e)
+    return rel_path, source_hash, summary, None
+
+
+def readManifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def writeManifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def writeIndex(out_dir, manifest, shard_size=SHARD_SIZE):
+    """
+    Write the index pages: index.html listing the shards, and each shard
+    listing up to shard_size forms.
+    """
+    names = sorted(manifest)
+    shards = [names[i : i + shard_size] for i in range(0, len(names), shard_size)] or [[]]
+
+    rows = []
+    for n, shard in enumerate(shards, 1):
+        shard_name = "index-%04d.html" % n
+        out = ["<p><a href=\"index.html\">Index</a></p>", "<h1>Forms %d</h1>" % n]
+        out.append(
+            "<table><tr><th>Form</th><th>Class</th><th>Base class</th><th>Widgets</th><th>Tooltip</th></tr>"
+        )
+        for rel_path in shard:
+            summary = manifest[rel_path]["summary"]
+            out.append(
+                '<tr><td><a href="%s">%s</a></td><td>%s</td><td>%s</td><td>%d</td><td>%s</td></tr>'
+                % (
+                    html.escape(pageName(rel_path), True),
+                    html.escape(summary["title"]),
+                    html.escape(summary["class"]),
+                    html.escape(summary["base"]),
+                    summary["widgets"],
+                    html.escape(summary["tooltip"]),
+                )
+            )
+        out.append("</table>")
+        writePage(os.path.join(out_dir, shard_name), "Forms %d" % n, "\n".join(out))
+        if shard:
+            rows.append(
+                '<li><a href="%s">%s &ndash; %s</a> (%d forms)</li>'
+                % (
+                    shard_name,
+                    html.escape(shard[0].replace(os.sep, "/")),
+                    html.escape(shard[-1].replace(os.sep, "/")),
+                    len(shard),
+                )
+            )
+
+    # Remove shards left over from a run with more forms.
+    n = len(shards) + 1
+    while os.path.exists(os.path.join(out_dir, "index-%04d.html" % n)):
+        os.remove(os.path.join(out_dir, "index-%04d.html" % n))
+        n += 1
+
+    body = "<h1>Forms</h1>\n<p>%d forms</p>\n<ul>\n%s\n</ul>" % (len(names), "\n".join(rows))
+    writePage(os.path.join(out_dir, "index.html"), "Forms", body)
+
+
+def buildSite(src_dir, out_dir, jobs=None, shard_size=SHARD_SIZE, force=False):
+    """
+    Build or update the documentation site of the .ui files in a directory.
+    Args:
+        src_dir[str]: The directory searched recursively for .ui files.
+        out_dir[str]: The directory the site is written to.
+        jobs[int]: The number of worker processes, None for the number of CPUs.
+        shard_size[int]: The number of forms listed by each index page.
+        force[bool]: Render all pages even if their source didn't change.
+    Returns:
+        A (rendered, skipped, failed) tuple of counts.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    # The old manifest is read even when forced, to remove the pages of
+    # deleted forms.
+    old = readManifest(out_dir)
+    manifest = {}
+    pending = []
+    for ui_path in uiFiles([src_dir]):
+        rel_path = os.path.relpath(ui_path, src_dir)
+        source_hash = sourceHash(ui_path)
+        page_path = os.path.join(out_dir, pageName(rel_path))
+        entry = None if force else old.get(rel_path)
+        if entry and entry["hash"] == source_hash and os.path.exists(page_path):
+            manifest[rel_path] = entry
+            continue
+        index_href = os.path.relpath(
+            os.path.join(out_dir, "index.html"), os.path.dirname(page_path)
+        ).replace(os.sep, "/")
+        pending.append((ui_path, page_path, rel_path, source_hash, index_href))
+
+    skipped = len(manifest)
+    failed = 0
+    if pending:
+        if jobs == 1 or len(pending) < 2:
+            results = map(buildPage, pending)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(jobs)
+            results = executor.map(buildPage, pending, chunksize=max(1, len(pending) // 256))
+        try:
+            for rel_path, source_hash, summary, error in results:
+                if error is not None:
+                    logging.error("Unable to document %s: %s" % (rel_path, error))
+                    failed += 1
+                    continue
+                logging.info("Wrote %s" % pageName(rel_path))
+                manifest[rel_path] = {
+                    "hash": source_hash,
+                    "summary": summary,
+                    "page": pageName(rel_path),
+                }
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    # Remove the pages of forms that no longer exist, and those written under
+    # another name by an earlier version. The last page of a form that failed
+    # to render is kept.
+    pages = set(entry["page"] for entry in manifest.values())
+    for rel_path, entry in old.items():
+        page = entry.get("page", os.path.splitext(rel_path)[0].replace(os.sep, "/") + ".html")
+        if page in pages:
+            continue
+        if page == pageName(rel_path) and os.path.exists(os.path.join(src_dir, rel_path)):
+            continue
+        page_path = os.path.join(out_dir, page)
+        if os.path.exists(page_path):
+            os.remove(page_path)
+
+    writeIndex(out_dir, manifest, shard_size)
+    writeManifest(out_dir, manifest)
+    return len(pending) - failed, skipped, failed
+
+
+def cli(parser):
+    parser.add_argument("dir", metavar="DIR", help="directory to search for .ui files")
+    parser.add_argument(
+        "--out",
+        dest="out",
+        required=True,
+        metavar="DIR",
+        help="write the site to DIR",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        metavar="N",
+        help="use N worker processes [default: number of CPUs]",
+    )
+    parser.add_argument(
+        "--shard-size",
+        dest="shard_size",
+        type=int,
+        default=SHARD_SIZE,
+        metavar="N",
+        help="list N forms on each index page [default: %d]" % SHARD_SIZE,
+    )
+    parser.add_argument(
+        "--force",
+        dest="force",
+        action="store_true",
+        default=False,
+        help="render all pages even if their .ui file didn't change",
+    )
+    return parser
+
+
+def run(opts):
+    rendered, skipped, failed = buildSite(
+        opts.dir, opts.out, opts.jobs, max(1, opts.shard_size), opts.force
+    )
+    logging.info(
+        "%d pages written, %d unchanged, %d failed" % (rendered, skipped, failed)
+    )
+    return 1 if failed else 0
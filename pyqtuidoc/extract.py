@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Extraction of the translatable strings of Qt Designer .ui files into a single
+catalog, as a Qt Linguist .ts file or as JSON. Only the .ui files are read, so
+this is much faster than running pylupdate over a whole source tree.
+"""
+
+import json
+import logging
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from xml.parsers import expat
+from xml.sax.saxutils import escape, quoteattr
+
+from .uitree import uiFiles
+
+TS_VERSION = "2.1"
+
+
+class Message:
+    """A translatable string and the places it is used."""
+
+    def __init__(self, context, source, comment=""):
+        self.context = context
+        self.source = source
+        self.comment = comment
+        self.extracomments = []
+        self.locations = []
+
+    def add(self, filename, line, extracomment=""):
+        if (filename, line) not in self.locations:
+            self.locations.append((filename, line))
+        if extracomment and extracomment not in self.extracomments:
+            self.extracomments.append(extracomment)
+
+    def row(self):
+        return OrderedDict(
+            [
+                ("context", self.context),
+                ("source", self.source),
+                ("comment", self.comment),
+                ("extracomments", self.extracomments),
+                ("locations", [{"filename": f, "line": n} for f, n in self.locations]),
+            ]
+        )
+
+
+def extractUi(path):
+    """
+    Extract the translatable strings of a .ui file.
+    Args:
+        path[str]: The name of the .ui file.
+    Returns:
+        A list of (context, source, comment, extracomment, line) tuples in
+        document order. The context is the name of the form's class, as used
+        by the generated retranslateUi().
+    """
+    found = []
+    stack = []
+    state = {"context": "", "text": None}
+
+    def start(tag, attrs):
+        parent = stack[-1] if stack else None
+        stack.append(tag)
+        if tag == "class" and len(stack) == 2:
+            state["text"] = []
+        elif tag == "stringlist":
+            state["list"] = attrs
+        elif tag == "string":
+            # The items of a string list share its attributes.
+            if parent == "stringlist":
+                attrs = dict(state["list"], **attrs)
+            if attrs.get("notr") != "true":
+                state["text"] = []
+                state["string"] = (
+                    attrs.get("comment", ""),
+                    attrs.get("extracomment", ""),
+                    parser.CurrentLineNumber,
+                )
+
+    def end(tag):
+        stack.pop()
+        text = state["text"]
+        if tag == "class" and len(stack) == 1 and text is not None:
+            state["context"] = "".join(text).strip()
+        elif tag == "string" and text is not None:
+            comment, extracomment, line = state.pop("string")
+            text = "".join(text)
+            if text:
+                found.append([comment, extracomment, line, text])
+        else:
+            return
+        state["text"] = None
+
+    def chars(data):
+        if state["text"] is not None:
+            state["text"].append(data)
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = chars
+    with open(path, "rb") as f:
+        parser.ParseFile(f)
+
+    # The class of the form may come after its strings.
+    context = state["context"]
+    return [(context, text, comment, extracomment, line) for comment, extracomment, line, text in found]
+
+
+def buildCatalog(results, base_dir=""):
+    """
+    Merge the strings extracted from several .ui files into a catalog with
+    one message for each distinct (context, source, comment).
+    Args:
+        results[iterable]: (path, strings) tuples, where strings is as returned by extractUi().
+        base_dir[str]: The directory locations are made relative to.
+    Returns:
+        An OrderedDict mapping each context to a list of Messages, both in the
+        order they were first found.
+    """
+    messages = OrderedDict()
+    for path, strings in results:
+        filename = os.path.relpath(path, base_dir or os.curdir).replace(os.sep, "/")
+        for context, source, comment, extracomment, line in strings:
+            key = (context, source, comment)
+            message = messages.get(key)
+            if message is None:
+                message = messages[key] = Message(context, source, comment)
+            message.add(filename, line, extracomment)
+
+    catalog = OrderedDict()
+    for message in messages.values():
+        catalog.setdefault(message.context, []).append(message)
+    return catalog
+
+
+def writeTs(catalog, output, language=None):
+    """Write a catalog as a Qt Linguist .ts file."""
+    attrs = ' version="%s"' % TS_VERSION
+    if language:
+        attrs += " language=%s" % quoteattr(language)
+    output.write('<?xml version="1.0" encoding="utf-8"?>\n')
+    output.write("<!DOCTYPE TS>\n")
+    output.write("<TS%s>\n" % attrs)
+    for context, messages in catalog.items():
+        output.write("<context>\n")
+        output.write("    <name>%s</name>\n" % escape(context))
+        for message in messages:
+            output.write("    <message>\n")
+            for filename, line in message.locations:
+                output.write(
+                    "        <location filename=%s line=\"%d\"/>\n" % (quoteattr(filename), line)
+                )
+            output.write("        <source>%s</source>\n" % escape(message.source))
+            if message.comment:
+                output.write("        <comment>%s</comment>\n" % escape(message.comment))
+            if message.extracomments:
+                output.write(
+                    "        <extracomment>%s</extracomment>\n"
+                    % escape("\n".join(message.extracomments))
+                )
+            output.write('        <translation type="unfinished"></translation>\n')
+            output.write("    </message>\n")
+        output.write("</context>\n")
+    output.write("</TS>\n")
+
+
+def writeJson(catalog, output):
+    """Write a catalog as a JSON list of messages."""
+    rows = [message.row() for messages in catalog.values() for message in messages]
+    json.dump(rows, output, indent=2, ensure_ascii=False)
+    output.write("\n")
+
+
+def _extract(path):
+    try:
+        return path, extractUi(path), None
+    except Exception as e:
+        return path, [], str(e)
+
+
+def extractFiles(paths, jobs=None):
+    """
+    Extract the translatable strings of .ui files in parallel.
+    Args:
+        paths[list]: The names of the .ui files.
+        jobs[int]: The number of worker processes, 1 to work in this process,
+            None for the number of CPUs.
+    Yields:
+        (path, strings) tuples in the order of paths. Files that can't be
+        read are logged and skipped.
+    """
+    if jobs == 1 or len(paths) < 2:
+        results = map(_extract, paths)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(jobs)
+        results = executor.map(_extract, paths, chunksize=max(1, len(paths) // 64))
+    try:
+        for path, strings, error in results:
+            if error is not None:
+                logging.error("Unable to extract strings from %s: %s" % (path, error))
+                continue
+            logging.info("Extracted %d strings from %s" % (len(strings), path))
+            yield path, strings
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def cli(parser):
+    parser.add_argument(
+        "paths",
+        metavar="path",
+        nargs="+",
+        help=".ui file or directory to search for .ui files",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="output",
+        default="-",
+        metavar="FILE",
+        help="write the catalog to FILE instead of stdout",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        dest="format",
+        choices=("ts", "json"),
+        help="catalog format [default: json if FILE ends with .json, otherwise ts]",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        metavar="N",
+        help="use N worker processes [default: number of CPUs]",
+    )
+    parser.add_argument(
+        "--language",
+        dest="language",
+        metavar="LANG",
+        help="the target language of the .ts file, e.g. de_DE",
+    )
+    return parser
+
+
+def run(opts):
+    fmt = opts.format
+    if fmt is None:
+        fmt = "json" if opts.output.endswith(".json") else "ts"
+
+    if opts.output == "-":
+        base_dir = os.curdir
+    else:
+        base_dir = os.path.dirname(os.path.abspath(opts.output))
+
+    paths = uiFiles(opts.paths)
+    catalog = buildCatalog(extractFiles(paths, opts.jobs), base_dir)
+    logging.info(
+        "%d messages in %d contexts"
+        % (sum(len(m) for m in catalog.values()), len(catalog))
+    )
+
+    if opts.output == "-":
+        output = sys.stdout
+    else:
+        output = open(opts.output, "w", encoding="utf-8")
+    try:
+        if fmt == "json":
+            writeJson(catalog, output)
+        else:
+            writeTs(catalog, output, opts.language)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
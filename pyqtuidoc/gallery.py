@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+A gallery of the forms of a project, shown as a scrollable grid of
+thumbnails. A form is only rendered when its thumbnail is first scrolled into
+view, and thumbnails are kept on disk by the hash of the form's inputs, so
+browsing thousands of forms neither creates thousands of widgets nor renders
+a form again until it changes. Only one form is alive at a time: the one
+being rendered or the one opened for a closer look.
+"""
+
+import hashlib
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict
+
+from PyQt5 import QtCore, QtGui, QtWidgets, uic
+
+from ._previous.output import writeAtomic
+from .regress import inputHash
+from .render import importResources, renderUi, thumbnail
+from .uitree import uiFiles
+
+# The default size of the box thumbnails are scaled to fit.
+GALLERY_SIZE = 192
+
+# The number of thumbnails kept in memory. Others are read from disk again
+# when they are scrolled back into view.
+MAX_PIXMAPS = 300
+
+# How long to spend loading thumbnails before letting the view repaint, in
+# seconds.
+LOAD_SLICE = 0.05
+
+
+def defaultCacheDir():
+    """Return the directory thumbnails are kept in if none is given."""
+    base = os.environ.get("PYQTUIDOC_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "pyqtuidoc"
+    )
+    return os.path.join(base, "gallery")
+
+
+class ThumbnailCache:
+    """Thumbnails of forms on disk, by the hash of everything a rendering of the form depends on."""
+
+    def __init__(self, directory, size=GALLERY_SIZE):
+        self.directory = directory
+        self.size = size
+
+    def key(self, uipath):
+        style = QtWidgets.QApplication.style().objectName()
+        digest = hashlib.sha1(("%s %s %d\n" % (inputHash(uipath), style, self.size)).encode())
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".png")
+
+    def thumbnail(self, uipath):
+        """Return the thumbnail of a form as a QImage, rendering it if it isn't on disk."""
+        key = self.key(uipath)
+        path = self.path(key)
+        image = QtGui.QImage(path)
+        if not image.isNull():
+            return image
+
+        image = thumbnail(renderUi(uipath), self.size)
+        data = QtCore.QByteArray()
+        buf = QtCore.QBuffer(data)
+        buf.open(QtCore.QIODevice.WriteOnly)
+        if image.save(buf, "PNG"):
+            # Write atomically through a temporary file of its own, as several
+            # galleries may share the directory.
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            writeAtomic(path, bytes(data))
+        return image
+
+
+class GalleryModel(QtCore.QAbstractListModel):
+    """
+    A list model of forms whose thumbnails are loaded on demand. A thumbnail
+    is requested when the view first asks for it, and requests are served
+    most recent first, skipping the forms that have been scrolled out of view
+    since.
+    """
+
+    def __init__(self, uipaths, cache, root="", parent=None):
+        """
+        Args:
+            uipaths[list]: The names of the .ui files.
+            cache[ThumbnailCache]: Where the thumbnails are kept.
+            root[str]: The directory the names shown are relative to.
+        """
+        super().__init__(parent)
+        self.uipaths = uipaths
+        self.cache = cache
+        self.root = root
+        # A callable telling whether a row is visible, set by the view.
+        self.isVisible = lambda row: True
+        self._pixmaps = OrderedDict()
+        self._errors = {}
+        self._pending = OrderedDict()
+
+        self._placeholder = QtGui.QPixmap(cache.size, cache.size)
+        self._placeholder.fill(QtGui.QColor(QtCore.Qt.lightGray))
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.loadPending)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.uipaths)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        uipath = self.uipaths[row]
+        if role == QtCore.Qt.DisplayRole:
+            return os.path.relpath(uipath, self.root) if self.root else uipath
+        if role == QtCore.Qt.ToolTipRole:
+            error = self._errors.get(row)
+            return uipath if error is None else "%s\n%s" % (uipath, error)
+        if role == QtCore.Qt.DecorationRole:
+            pixmap = self._pixmaps.get(row)
+            if pixmap is not None:
+                self._pixmaps.move_to_end(row)
+                return pixmap
+            if row not in self._errors:
+                self.request(row)
+            return self._placeholder
+        return None
+
+    def request(self, row):
+        self._pending[row] = True
+        self._pending.move_to_end(row)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def loadPending(self):
+        """Load the thumbnails of the most recently requested visible forms for a short while."""
+        started = time.monotonic()
+        while self._pending and time.monotonic() - started < LOAD_SLICE:
+            row, _ = self._pending.popitem()
+            if row in self._pixmaps or not self.isVisible(row):
+                continue
+            self.load(row)
+        if not self._pending:
+            self._timer.stop()
+
+    def load(self, row):
+        uipath = self.uipaths[row]
+        try:
+            image = self.cache.thumbnail(uipath)
+        except Exception as e:
+            logging.error("Unable to render %s: %s" % (uipath, e))
+            self._errors[row] = str(e)
+            image = None
+        if image is not None:
+            self._pixmaps[row] = QtGui.QPixmap.fromImage(image)
+            while len(self._pixmaps) > MAX_PIXMAPS:
+                self._pixmaps.popitem(last=False)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [QtCore.Qt.DecorationRole, QtCore.Qt.ToolTipRole])
+
+
+class GalleryWindow(QtWidgets.QMainWindow):
+    """A window showing a grid of the thumbnails of forms. Activating a thumbnail opens the form."""
+
+    def __init__(self, uipaths, cache, root=""):
+        super().__init__()
+        self.setWindowTitle("%s (%d forms)" % (root or "Gallery", len(uipaths)))
+        self.model = GalleryModel(uipaths, cache, root, self)
+        self.model.isVisible = self.isRowVisible
+        self.preview = None
+
+        view = self.view = QtWidgets.QListView(self)
+        view.setViewMode(QtWidgets.QListView.IconMode)
+        view.setMovement(QtWidgets.QListView.Static)
+        view.setResizeMode(QtWidgets.QListView.Adjust)
+        # Uniform, batched items let the view lay out thousands of forms
+        # without asking for all of their data.
+        view.setUniformItemSizes(True)
+        view.setLayoutMode(QtWidgets.QListView.Batched)
+        view.setBatchSize(256)
+        view.setIconSize(QtCore.QSize(cache.size, cache.size))
+        view.setGridSize(QtCore.QSize(cache.size + 24, cache.size + 2 * view.fontMetrics().height() + 8))
+        view.setTextElideMode(QtCore.Qt.ElideMiddle)
+        view.setWordWrap(True)
+        view.setModel(self.model)
+        view.activated.connect(self.openForm)
+        self.setCentralWidget(view)
+        self.resize(1200, 800)
+
+    def isRowVisible(self, row):
+        rect = self.view.visualRect(self.model.index(row))
+        return rect.isValid() and rect.intersects(self.view.viewport().rect())
+
+    def openForm(self, index):
+        """Show a form, closing the one shown before."""
+        if self.preview is not None:
+            self.preview.close()
+            self.preview = None
+        uipath = self.model.uipaths[index.row()]
+        try:
+            importResources(uipath)
+            widget = uic.loadUi(uipath)
+        except Exception as e:
+            QtWidgets.QMessageBox.warning(self, "Unable to load form", "%s\n%s" % (uipath, e))
+            return
+        widget.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        widget.setWindowTitle(os.path.basename(uipath))
+        widget.destroyed.connect(self.previewDestroyed)
+        widget.show()
+        self.preview = widget
+
+    def previewDestroyed(self):
+        self.preview = None
+
+
+def cli(parser):
+    parser.add_argument(
+        "paths",
+        metavar="path",
+        nargs="+",
+        help=".ui file or directory to search for .ui files",
+    )
+    parser.add_argument(
+        "--cache",
+        dest="cache",
+        default=defaultCacheDir(),
+        metavar="DIR",
+        help="keep the thumbnails in DIR [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--size",
+        dest="size",
+        type=int,
+        default=GALLERY_SIZE,
+        metavar="PIXELS",
+        help="the size of the thumbnails [default: %d]" % GALLERY_SIZE,
+    )
+    parser.add_argument(
+        "--style",
+        dest="style",
+        metavar="STYLE",
+        help="the widget style to render the forms with",
+    )
+    return parser
+
+
+def run(opts):
+    uipaths = uiFiles(opts.paths)
+    if not uipaths:
+        logging.error("No .ui files found")
+        return 1
+    root = opts.paths[0] if len(opts.paths) == 1 and os.path.isdir(opts.paths[0]) else ""
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    if opts.style:
+        app.setStyle(opts.style)
+    window = GalleryWindow(uipaths, ThumbnailCache(opts.cache, opts.size), root)
+    window.show()
+    return app.exec_()
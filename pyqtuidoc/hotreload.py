@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Hot reloading of a previewed form. When the .ui file changes, the new form is
+loaded offscreen and compared with the live one by object name and class.
+Only the properties that changed are set on the live widgets, and only the
+widgets whose children changed are replaced by their new versions.
+"""
+
+import hashlib
+import logging
+import time
+from xml.etree import ElementTree
+
+from PyQt5 import QtCore, QtWidgets
+
+# How long to wait after a change before reloading, in milliseconds, so that
+# a file that is saved in several writes is only reloaded once.
+RELOAD_DELAY = 150
+
+
+def childWidgets(elem):
+    """Return the widget elements directly below a widget element, including those in its layouts."""
+    found = []
+    for child in elem:
+        if child.tag == "widget":
+            found.append(child)
+        elif child.tag in ("layout", "item"):
+            found.extend(childWidgets(child))
+    return found
+
+
+def shape(elem, top=True):
+    """
+    Return a hashable summary of a widget element that leaves out its own
+    properties and the content of its child widgets. Two versions of a
+    widget with the same shape have the same children and layouts, so they
+    can be updated in place.
+    """
+    if elem.tag == "widget" and not top:
+        # A child widget's attributes, e.g. its tab title, belong to its parent.
+        return (
+            "widget",
+            elem.get("class"),
+            elem.get("name"),
+            tuple(ElementTree.tostring(a) for a in elem.findall("attribute")),
+        )
+    skip = ("property", "attribute") if top else ()
+    return (
+        elem.tag,
+        tuple(sorted(elem.attrib.items())),
+        (elem.text or "").strip(),
+        tuple(shape(child, False) for child in elem if child.tag not in skip),
+    )
+
+
+def properties(elem):
+    """Return a dict of the serialized properties of a widget element by name."""
+    return {p.get("name"): ElementTree.tostring(p) for p in elem.findall("property")}
+
+
+def diffForms(old_ui, new_ui):
+    """
+    Compare two versions of a form.
+    Args:
+        old_ui[Element], new_ui[Element]: The <ui> elements.
+    Returns:
+        A (changed, rebuilt) tuple of a dict mapping object names to the
+        names of their properties that changed, and a list of the object
+        names of the widgets that must be replaced, or None if the whole form
+        must be reloaded.
+    """
+    for old, new in zip(list(old_ui), list(new_ui)):
+        if old.tag != new.tag:
+            return None
+        if old.tag != "widget" and ElementTree.tostring(old) != ElementTree.tostring(new):
+            return None
+    if len(old_ui) != len(new_ui):
+        return None
+
+    old_top = old_ui.find("widget")
+    new_top = new_ui.find("widget")
+    if shape(old_top) != shape(new_top):
+        return None
+
+    changed = {}
+    rebuilt = []
+    pending = [(old_top, new_top)]
+    while pending:
+        old, new = pending.pop()
+        old_props = properties(old)
+        new_props = properties(new)
+        names = [n for n in set(old_props) | set(new_props) if old_props.get(n) != new_props.get(n)]
+        if names:
+            changed[new.get("name")] = sorted(names)
+        # Matching shapes mean the child widgets have the same names and classes.
+        for old_child, new_child in zip(childWidgets(old), childWidgets(new)):
+            if shape(old_child) == shape(new_child):
+                pending.append((old_child, new_child))
+            else:
+                rebuilt.append(new_child.get("name"))
+    return changed, rebuilt
+
+
+def namedObjects(widget):
+    """Return a dict of a widget and its descendants by object name."""
+    objects = {}
+    for obj in [widget] + widget.findChildren(QtCore.QObject):
+        name = obj.objectName()
+        if name and name not in objects:
+            objects[name] = obj
+    return objects
+
+
+def replaceWidget(old, new):
+    """
+    Put a widget in the place of another one in a live widget tree and
+    delete the old one.
+    Returns:
+        False if the kind of container holding the old widget isn't
+        supported.
+    """
+    parent = old.parentWidget()
+    if parent is None:
+        return False
+    grandparent = parent.parentWidget()
+
+    if isinstance(grandparent, QtWidgets.QTabWidget) and grandparent.indexOf(old) >= 0:
+        # Take the tab's title and icon from the new form.
+        tabs = new.parentWidget().parentWidget()
+        source = tabs.indexOf(new)
+        index = grandparent.indexOf(old)
+        grandparent.removeTab(index)
+        grandparent.insertTab(index, new, tabs.tabIcon(source), tabs.tabText(source))
+        grandparent.setTabToolTip(index, tabs.tabToolTip(source))
+        grandparent.setTabWhatsThis(index, tabs.tabWhatsThis(source))
+    elif isinstance(grandparent, QtWidgets.QScrollArea) and grandparent.widget() is old:
+        grandparent.takeWidget()
+        grandparent.setWidget(new)
+    elif isinstance(parent, QtWidgets.QMainWindow) and parent.centralWidget() is old:
+        parent.takeCentralWidget()
+        parent.setCentralWidget(new)
+    elif isinstance(parent, QtWidgets.QDockWidget) and parent.widget() is old:
+        parent.setWidget(new)
+    elif isinstance(parent, QtWidgets.QStackedWidget):
+        index = parent.indexOf(old)
+        parent.insertWidget(index, new)
+        parent.removeWidget(old)
+    elif isinstance(parent, QtWidgets.QSplitter):
+        parent.replaceWidget(parent.indexOf(old), new)
+    else:
+        for layout in [parent.layout()] + parent.findChildren(QtWidgets.QLayout):
+            if layout is not None and layout.indexOf(old) >= 0:
+                new.setParent(parent)
+                layout.replaceWidget(old, new)
+                break
+        else:
+            return False
+
+    if not old.isHidden() and not isinstance(parent, QtWidgets.QStackedWidget):
+        new.show()
+    old.hide()
+    old.setParent(None)
+    old.deleteLater()
+    return True
+
+
+def connect(sender, signal, receiver, slot):
+    """Connect a signal to a slot given by their signatures in a .ui file, e.g. "toggled(bool)"."""
+    name, _, args = signal.partition("(")
+    bound = getattr(sender, name)
+    args = args.rstrip(")")
+    if args:
+        try:
+            bound = bound[args]
+        except (KeyError, TypeError):
+            pass
+    bound.connect(getattr(receiver, slot.partition("(")[0]))
+
+
+class FormReloader(QtCore.QObject):
+    """
+    Watches the .ui file of a previewed window and updates the window when
+    the file changes.
+    """
+
+    def __init__(self, uipath, window, load, loadTree):
+        """
+        Args:
+            uipath[str]: The name of the .ui file.
+            window[QWidget]: The live window. Its form attribute is the top
+                widget of the form, i.e. the window itself or the widget in
+                it, and its object names are attributes of that widget.
+            load[callable]: Returns a new, hidden window for the .ui file.
+            loadTree[callable]: Returns the <ui> element the window is
+                created from.
+        """
+        super().__init__()
+        self.uipath = uipath
+        self.window = window
+        self.load = load
+        self.loadTree = loadTree
+        self.ui = loadTree()
+        self.digest = self.fileDigest()
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(RELOAD_DELAY)
+        self.timer.timeout.connect(self.reload)
+
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.changed)
+        self.watcher.directoryChanged.connect(self.changed)
+        self.watch()
+
+    def watch(self):
+        """
+        Watch the .ui file, and its directory to notice when an editor
+        replaces the file instead of writing it.
+        """
+        info = QtCore.QFileInfo(self.uipath)
+        for path in (info.absolutePath(), info.absoluteFilePath()):
+            if QtCore.QFileInfo(path).exists() and path not in self.watcher.files() + self.watcher.directories():
+                self.watcher.addPath(path)
+
+    def fileDigest(self):
+        try:
+            with open(self.uipath, "rb") as f:
+                return hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def changed(self, path):
+        self.watch()
+        self.timer.start()
+
+    def reload(self):
+        digest = self.fileDigest()
+        if digest is None or digest == self.digest:
+            return
+        started = time.monotonic()
+        try:
+            ui = self.loadTree()
+            window = self.load()
+        except Exception as e:
+            logging.error("Unable to reload %s: %s" % (self.uipath, e))
+            return
+        self.digest = digest
+
+        diff = diffForms(self.ui, ui)
+        self.ui = ui
+        if diff is None or not self.update(window, *diff):
+            if diff is not None:
+                # Parts of the new window may have been moved already.
+                window.deleteLater()
+                window = self.load()
+            self.replaceWindow(window)
+            logging.info("Reloaded %s in %.3fs" % (self.uipath, time.monotonic() - started))
+            return
+
+        window.deleteLater()
+        changed, rebuilt = diff
+        logging.info(
+            "Updated %s in %.3fs: %d properties set, %d widgets replaced"
+            % (
+                self.uipath,
+                time.monotonic() - started,
+                sum(len(names) for names in changed.values()),
+                len(rebuilt),
+            )
+        )
+
+    def update(self, window, changed, rebuilt):
+        """
+        Update the live window in place from a new window.
+        Returns:
+            False if the window must be replaced instead.
+        """
+        live = namedObjects(self.window.form)
+        new = namedObjects(window.form)
+
+        # Widgets with properties that aren't Qt properties are replaced.
+        rebuilt = list(rebuilt)
+        for name, names in changed.items():
+            obj = live.get(name)
+            if obj is None or new.get(name) is None:
+                return False
+            if name not in rebuilt and any(obj.metaObject().indexOfProperty(n) < 0 for n in names):
+                rebuilt.append(name)
+
+        for name in rebuilt:
+            if live.get(name) is None or new.get(name) is None:
+                return False
+
+        # Widgets inside a replaced widget are replaced with it.
+        touched = set()
+        for name in rebuilt:
+            touched.update(n for n in namedObjects(new[name]) if n != name)
+        rebuilt = [n for n in rebuilt if n not in touched]
+        touched.update(rebuilt)
+
+        for name in rebuilt:
+            if not self.rebuild(live[name], new[name]):
+                return False
+
+        # The replaced widgets are still connected to the new window's
+        # objects, so connect them to the live ones.
+        live = namedObjects(self.window.form)
+        for connection in self.ui.findall("connections/connection") if rebuilt else []:
+            sender = connection.findtext("sender")
+            receiver = connection.findtext("receiver")
+            if (sender in touched) != (receiver in touched):
+                try:
+                    connect(
+                        live[sender],
+                        connection.findtext("signal"),
+                        live[receiver],
+                        connection.findtext("slot"),
+                    )
+                except (AttributeError, KeyError, TypeError):
+                    return False
+
+        for name, names in changed.items():
+            if name in touched:
+                continue
+            for prop in names:
+                live[name].setProperty(prop, new[name].property(prop))
+
+        self.relink()
+        return True
+
+    def rebuild(self, old, new):
+        """Replace a live widget by its new version."""
+        live = namedObjects(self.window.form)
+        for name, obj in namedObjects(old).items():
+            if getattr(self.window.form, name, None) is obj:
+                delattr(self.window.form, name)
+
+        # Use the live actions rather than those of the new window.
+        for widget in [new] + new.findChildren(QtWidgets.QWidget):
+            for action in widget.actions():
+                replacement = live.get(action.objectName())
+                if isinstance(replacement, QtWidgets.QAction) and replacement is not action:
+                    widget.insertAction(action, replacement)
+                    widget.removeAction(action)
+
+        if not replaceWidget(old, new):
+            return False
+        for name, obj in namedObjects(new).items():
+            setattr(self.window.form, name, obj)
+        return True
+
+    def relink(self):
+        """Set the buddies and the tab order of the live form from the .ui file."""
+        live = namedObjects(self.window.form)
+        for elem in self.ui.iter("widget"):
+            for prop in elem.findall("property"):
+                if prop.get("name") == "buddy":
+                    label = live.get(elem.get("name"))
+                    buddy = live.get(prop.findtext("cstring") or "")
+                    if isinstance(label, QtWidgets.QLabel) and isinstance(buddy, QtWidgets.QWidget):
+                        label.setBuddy(buddy)
+        tabstops = [live.get(t.text) for t in self.ui.findall("tabstops/tabstop")]
+        tabstops = [w for w in tabstops if isinstance(w, QtWidgets.QWidget)]
+        for first, second in zip(tabstops, tabstops[1:]):
+            QtWidgets.QWidget.setTabOrder(first, second)
+
+    def replaceWindow(self, window):
+        """Show a new window in place of the live one."""
+        window.restoreGeometry(self.window.saveGeometry())
+        window.show()
+        self.window.close()
+        self.window.deleteLater()
+        self.window = window
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+An interactive inspector for the QObject tree of a previewed form. The tree
+is fetched lazily so that it stays responsive on forms with tens of thousands
+of objects.
+"""
+
+from PyQt5 import QtCore, QtWidgets
+
+# The number of children added to the model by one fetchMore() call.
+FETCH_BATCH = 256
+
+
+class ObjectNode:
+    """
+    A node of the QObject tree. The children of the object are only wrapped
+    when they are fetched, and its properties are only read when they are
+    first asked for.
+    """
+
+    def __init__(self, qobject, parent=None, row=0):
+        self.qobject = qobject
+        self.parent = parent
+        self.row = row
+        self.children = []
+        self._pending = None
+        self._properties = None
+
+    def pending(self):
+        """Return the children of the object that have not been fetched yet."""
+        if self._pending is None:
+            self._pending = self.qobject.children()
+        return len(self._pending) - len(self.children)
+
+    def fetch(self, count):
+        """Wrap up to count more children and return the new nodes."""
+        self.pending()
+        start = len(self.children)
+        new = [
+            ObjectNode(child, self, start + i)
+            for i, child in enumerate(self._pending[start : start + count])
+        ]
+        self.children.extend(new)
+        return new
+
+    def className(self):
+        return self.qobject.metaObject().className()
+
+    def properties(self):
+        """
+        Return a snapshot of the properties of the object as a list of
+        (name, value) tuples. The snapshot is taken the first time it is
+        asked for.
+        """
+        if self._properties is None:
+            meta = self.qobject.metaObject()
+            self._properties = []
+            for i in range(meta.propertyCount()):
+                prop = meta.property(i)
+                if prop.isReadable():
+                    self._properties.append((prop.name(), prop.read(self.qobject)))
+        return self._properties
+
+
+class ObjectTreeModel(QtCore.QAbstractItemModel):
+    """A model of a QObject tree that fetches the children of objects on demand."""
+
+    HEADERS = ("Object", "Class")
+
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self._root = ObjectNode(None)
+        self._root.children.append(ObjectNode(root, self._root, 0))
+        self._root._pending = [root]
+        self._fetching = False
+
+    def node(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        node = self.node(parent)
+        if 0 <= row < len(node.children) and 0 <= column < len(self.HEADERS):
+            return self.createIndex(row, column, node.children[row])
+        return QtCore.QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QtCore.QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.node(parent).children)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return False
+        node = self.node(parent)
+        return bool(node.children) or node.pending() > 0
+
+    def canFetchMore(self, parent):
+        # Views may ask for more while being told about the rows being added.
+        if parent.column() > 0 or self._fetching:
+            return False
+        return self.node(parent).pending() > 0
+
+    def fetchMore(self, parent):
+        if parent.column() > 0 or self._fetching:
+            return
+        node = self.node(parent)
+        count = min(node.pending(), FETCH_BATCH)
+        if count <= 0:
+            return
+        start = len(node.children)
+        self._fetching = True
+        try:
+            self.beginInsertRows(parent, start, start + count - 1)
+            node.fetch(count)
+            self.endInsertRows()
+        finally:
+            self._fetching = False
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or role != QtCore.Qt.DisplayRole:
+            return None
+        node = index.internalPointer()
+        if index.column() == 0:
+            return node.qobject.objectName()
+        return node.className()
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+
+class InspectorWindow(QtWidgets.QSplitter):
+    """A window showing the QObject tree of a widget and the properties of the selected object."""
+
+    def __init__(self, qobject, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Inspector: %s" % qobject.objectName())
+
+        self.model = ObjectTreeModel(qobject, self)
+
+        self.tree = QtWidgets.QTreeView(self)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setModel(self.model)
+        self.tree.selectionModel().currentChanged.connect(self.showProperties)
+
+        self.properties = QtWidgets.QTableWidget(0, 2, self)
+        self.properties.setHorizontalHeaderLabels(("Property", "Value"))
+        self.properties.horizontalHeader().setStretchLastSection(True)
+        self.properties.verticalHeader().hide()
+        self.properties.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+
+        self.resize(800, 600)
+        self.tree.expand(self.model.index(0, 0))
+
+    def showProperties(self, current, previous=None):
+        props = self.model.node(current).properties() if current.isValid() else []
+        self.properties.setRowCount(len(props))
+        for row, (name, value) in enumerate(props):
+            self.properties.setItem(row, 0, QtWidgets.QTableWidgetItem(name))
+            self.properties.setItem(row, 1, QtWidgets.QTableWidgetItem(repr(value)))
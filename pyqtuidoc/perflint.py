@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Static estimation of the runtime cost of Qt Designer .ui files. The forms are
+only read as XML, no widgets are created.
+"""
+
+import csv
+import json
+import logging
+import os
+import sys
+from collections import OrderedDict
+
+from .uitree import assetFiles, findProperty, parseUi, uiDir, uiFiles
+
+# The thresholds above which a finding is reported.
+MAX_LAYOUT_DEPTH = 6
+MAX_WIDGETS = 500
+MAX_PIXMAP_SIZE = 64 * 1024
+MAX_ITEMS = 100
+MAX_PAGES = 6
+
+# The contribution of each unit of cost to the score of a form.
+WEIGHTS = {
+    "widgets": 1.0,
+    "layouts": 0.5,
+    "excess_depth": 20.0,
+    "stylesheets": 25.0,
+    "pixmap_kb": 0.5,
+    "items": 0.5,
+    "eager_widgets": 0.5,
+}
+
+ITEM_WIDGETS = ("QComboBox", "QListWidget", "QTableWidget", "QTreeWidget")
+PAGE_WIDGETS = ("QStackedWidget", "QTabWidget", "QToolBox")
+
+# The columns of the report, in order.
+FIELDS = (
+    "score",
+    "widgets",
+    "layouts",
+    "depth",
+    "stylesheets",
+    "pixmap_kb",
+    "items",
+    "pages",
+    "path",
+)
+
+
+class FormCost:
+    """The estimated runtime cost of a form."""
+
+    def __init__(self, path):
+        self.path = path
+        self.widgets = 0
+        self.layouts = 0
+        self.depth = 0
+        self.stylesheets = 0
+        self.pixmap_kb = 0
+        self.items = 0
+        self.pages = 0
+        self.eager_widgets = 0
+        self.findings = []
+
+    @property
+    def score(self):
+        excess_depth = max(0, self.depth - MAX_LAYOUT_DEPTH)
+        return round(
+            WEIGHTS["widgets"] * self.widgets
+            + WEIGHTS["layouts"] * self.layouts
+            + WEIGHTS["excess_depth"] * excess_depth
+            + WEIGHTS["stylesheets"] * self.stylesheets
+            + WEIGHTS["pixmap_kb"] * self.pixmap_kb
+            + WEIGHTS["items"] * self.items
+            + WEIGHTS["eager_widgets"] * self.eager_widgets,
+            1,
+        )
+
+    def row(self):
+        return OrderedDict((f, getattr(self, f)) for f in FIELDS)
+
+    def finding(self, message):
+        self.findings.append(message)
+
+
+def baseClasses(ui):
+    """Return a dict mapping the custom widget classes of a .ui file to the Qt classes they extend."""
+    extends = {}
+    for cw in ui.iter("customwidget"):
+        extends[cw.findtext("class", "")] = cw.findtext("extends", "")
+    return extends
+
+
+def qtClass(cls, extends):
+    """Return the Qt class a (possibly custom) widget class is derived from."""
+    seen = set()
+    while cls in extends and cls not in seen:
+        seen.add(cls)
+        cls = extends[cls]
+    return cls
+
+
+def countItems(elem):
+    """Count the items (recursively) of an item widget."""
+    return sum(1 + countItems(item) for item in elem.findall("item"))
+
+
+def analyzeUi(path):
+    """
+    Estimate the runtime cost of a form.
+    Args:
+        path[str]: The name of the .ui file.
+    Returns:
+        A FormCost.
+    """
+    cost = FormCost(path)
+    ui = parseUi(path)
+    top = ui.find("widget")
+    if top is None:
+        return cost
+    extends = baseClasses(ui)
+
+    def walk(elem, depth):
+        for child in elem:
+            if child.tag == "widget":
+                cost.widgets += 1
+                checkWidget(child)
+                walk(child, depth)
+            elif child.tag == "layout":
+                cost.layouts += 1
+                if depth + 1 > cost.depth:
+                    cost.depth = depth + 1
+                    if cost.depth == MAX_LAYOUT_DEPTH + 1:
+                        cost.finding(
+                            "layouts nested more than %d deep at %s"
+                            % (MAX_LAYOUT_DEPTH, child.attrib.get("name", "?"))
+                        )
+                walk(child, depth + 1)
+            elif child.tag == "item" and elem.tag == "layout":
+                walk(child, depth)
+
+    def checkWidget(widget):
+        name = widget.attrib.get("name", "?")
+        cls = qtClass(widget.attrib.get("class", ""), extends)
+
+        style = findProperty(widget, "styleSheet")
+        if style is not None and (style.text or "").strip():
+            cost.stylesheets += 1
+
+        if cls in ITEM_WIDGETS:
+            items = countItems(widget)
+            cost.items += items
+            if items > MAX_ITEMS:
+                cost.finding("%d static items in %s %s" % (items, cls, name))
+
+        if cls in PAGE_WIDGETS:
+            pages = widget.findall("widget")
+            cost.pages += len(pages)
+            eager = sum(len(list(page.iter("widget"))) for page in pages[1:])
+            cost.eager_widgets += eager
+            if len(pages) > MAX_PAGES:
+                cost.finding(
+                    "%d eagerly built pages (%d widgets) in %s %s"
+                    % (len(pages), eager, cls, name)
+                )
+
+    cost.widgets += 1
+    walk(top, 0)
+
+    if cost.widgets > MAX_WIDGETS:
+        cost.finding("%d widgets" % cost.widgets)
+    if cost.stylesheets:
+        cost.finding("%d widgets with their own stylesheet" % cost.stylesheets)
+
+    pixmap_bytes = 0
+    for asset in assetFiles(ui, uiDir(path)):
+        try:
+            size = os.path.getsize(asset)
+        except OSError:
+            continue
+        pixmap_bytes += size
+        if size > MAX_PIXMAP_SIZE:
+            cost.finding("large pixmap %s (%d KB)" % (asset, size // 1024))
+    for image in ui.iter("image"):
+        data = image.find("data")
+        if data is None:
+            continue
+        size = int(data.attrib.get("length") or len(data.text or "") // 2)
+        pixmap_bytes += size
+        if size > MAX_PIXMAP_SIZE:
+            cost.finding(
+                "large inline image %s (%d KB)"
+                % (image.attrib.get("name", "?"), size // 1024)
+            )
+    cost.pixmap_kb = pixmap_bytes // 1024
+
+    return cost
+
+
+def cli(parser):
+    parser.add_argument(
+        "paths",
+        metavar="path",
+        nargs="+",
+        help=".ui file or directory to search for .ui files",
+    )
+    parser.add_argument(
+        "-s",
+        "--sort",
+        dest="sort",
+        choices=FIELDS,
+        default="score",
+        help="sort the report by FIELD [default: score]",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        dest="format",
+        choices=("text", "csv", "json"),
+        default="text",
+        help="report format [default: text]",
+    )
+    parser.add_argument(
+        "-n",
+        "--limit",
+        dest="limit",
+        type=int,
+        default=0,
+        metavar="N",
+        help="only report the first N forms",
+    )
+    parser.add_argument(
+        "--fail-above",
+        dest="fail_above",
+        type=float,
+        metavar="SCORE",
+        help="exit with status 1 if any form, reported or not, scores higher than SCORE",
+    )
+    return parser
+
+
+def run(opts):
+    costs = []
+    failed = 0
+    for path in uiFiles(opts.paths):
+        logging.info("Analyzing %s" % path)
+        try:
+            costs.append(analyzeUi(path))
+        except Exception as e:
+            logging.error("Unable to analyze %s: %s" % (path, e))
+            failed += 1
+
+    # The threshold applies to all forms, not only the reported ones.
+    above = opts.fail_above is not None and any(c.score > opts.fail_above for c in costs)
+
+    reverse = opts.sort != "path"
+    costs.sort(key=lambda c: getattr(c, opts.sort), reverse=reverse)
+    if opts.limit > 0:
+        costs = costs[: opts.limit]
+
+    if opts.format == "json":
+        rows = []
+        for cost in costs:
+            row = cost.row()
+            row["findings"] = cost.findings
+            rows.append(row)
+        json.dump(rows, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif opts.format == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(FIELDS + ("findings",))
+        for cost in costs:
+            writer.writerow(list(cost.row().values()) + ["; ".join(cost.findings)])
+    else:
+        print("%8s %7s %7s %5s %11s %9s %6s %5s  %s" % FIELDS)
+        for cost in costs:
+            print("%8.1f %7d %7d %5d %11d %9d %6d %5d  %s" % tuple(cost.row().values()))
+            for finding in cost.findings:
+                print("%s- %s" % (" " * 10, finding))
+
+    return 1 if above or failed else 0
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Profiling of the setupUi() of a form with the timing probes that the code
+generator adds with probes=True. The probe events are aggregated into a tree
+of the cost of each container, which is printed as a report or written in the
+folded stack format read by flame graph tools.
+"""
+
+import os
+import sys
+import types
+from collections import OrderedDict
+from io import StringIO
+
+from PyQt5 import QtCore, QtWidgets
+
+from ._previous import compileUi
+from .uitree import uiDir
+
+
+class ProbeNode:
+    """The time spent in a probe, summed over all the times it ran."""
+
+    def __init__(self, name):
+        self.name = name
+        self.total = 0.0
+        self.count = 0
+        self.children = OrderedDict()
+
+    def child(self, name):
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = ProbeNode(name)
+        return node
+
+    def selfTime(self):
+        return max(0.0, self.total - sum(c.total for c in self.children.values()))
+
+
+def probeTree(events, root=None):
+    """
+    Aggregate probe events into a tree.
+    Args:
+        events[list]: The (name, time) events of the generated module's
+            _probes list.
+        root[ProbeNode]: The tree to add to, or None for a new one.
+    Returns:
+        The root ProbeNode, whose children are the outermost probes.
+    """
+    if root is None:
+        root = ProbeNode("")
+    stack = [(root, None)]
+    for name, when in events:
+        if name is not None:
+            stack.append((stack[-1][0].child(name), when))
+        elif len(stack) > 1:
+            node, started = stack.pop()
+            node.total += when - started
+            node.count += 1
+    return root
+
+
+def formatTree(root, runs=1, min_fraction=0.001):
+    """
+    Return a report of a probe tree, with the average time of each probe
+    per run and its share of the total. Probes that take less than
+    min_fraction of the total are left out.
+    """
+    total = sum(c.total for c in root.children.values()) or 1.0
+    lines = ["%10s %10s %6s  %s" % ("total ms", "self ms", "%", "container")]
+
+    def add(node, depth):
+        if node.total / total < min_fraction:
+            return
+        lines.append(
+            "%10.3f %10.3f %6.1f  %s%s"
+            % (
+                1000 * node.total / runs,
+                1000 * node.selfTime() / runs,
+                100 * node.total / total,
+                "  " * depth,
+                node.name,
+            )
+        )
+        for child in sorted(node.children.values(), key=lambda c: -c.total):
+            add(child, depth + 1)
+
+    for child in root.children.values():
+        add(child, 0)
+    return "\n".join(lines) + "\n"
+
+
+def writeFolded(root, output, prefix="", runs=1):
+    """
+    Write a probe tree in the folded stack format of flame graph tools: one
+    "outer;inner;innermost microseconds" line per probe, using its self time.
+    """
+
+    def add(node, stack):
+        stack = stack + [node.name]
+        micros = int(round(1e6 * node.selfTime() / runs))
+        if micros:
+            output.write("%s %d\n" % (";".join(stack), micros))
+        for child in node.children.values():
+            add(child, stack)
+
+    for child in root.children.values():
+        add(child, [prefix] if prefix else [])
+
+
+def profileUi(uipath, runs=10, **compileUi_args):
+    """
+    Run the setupUi() of a form with timing probes.
+    Args:
+        uipath[str]: The name of the .ui file.
+        runs[int]: The number of times to create the form. The first one
+            is not measured, as it includes loading modules and resources.
+        compileUi_args: Any other keyword arguments of compileUi().
+    Returns:
+        A (tree, widget, uiclass) tuple of the root ProbeNode summed over the
+        runs, the widget created by the last run and the name of the form
+        class.
+    """
+    code = StringIO()
+    winfo = compileUi(uipath, code, probes=True, **compileUi_args)
+
+    # Resource and custom widget modules are imported relative to the form.
+    ui_dir = uiDir(uipath)
+    if ui_dir not in sys.path:
+        sys.path.append(ui_dir)
+    module = types.ModuleType(os.path.splitext(os.path.basename(uipath))[0])
+    exec(compile(code.getvalue(), uipath, "exec"), module.__dict__)
+
+    form_class = getattr(module, winfo["uiclass"])
+    # As in loadUiType(), a custom base class is one the form imports,
+    # otherwise it is in QtWidgets.
+    base_class = module.__dict__.get(winfo["baseclass"]) or getattr(QtWidgets, winfo["baseclass"], QtWidgets.QWidget)
+
+    root = ProbeNode("")
+    widget = None
+    for run in range(runs + 1):
+        if widget is not None:
+            widget.deleteLater()
+            QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+        del module._probes[:]
+        widget = base_class()
+        form = form_class()
+        form.setupUi(widget)
+        if run:
+            probeTree(module._probes, root)
+    return root, widget, winfo["uiclass"]
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Visual regression testing of Qt Designer .ui files. A perceptual hash and a
+thumbnail of each form rendered offscreen is kept per widget style and DPI.
+Forms whose .ui and resource files didn't change are not rendered again, and
+the renderings of those that did are compared pixel by pixel with the baseline
+thumbnail, as a matching hash can miss small changes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+from PyQt5 import QtCore, QtGui
+
+from .render import BASE_DPI, hashDistance, perceptualHash, pixelDiff, renderUi, setStyle, thumbnail
+from .uitree import assetFiles, parseUi, resourceFiles, uiDir, uiFiles
+
+# Changing this re-renders all forms.
+REGRESS_VERSION = 1
+
+# The file in the baseline directory that records the hashes.
+MANIFEST = "regress.json"
+
+# The statuses that make the run fail.
+FAILURES = ("changed", "error")
+
+
+def inputHash(uipath):
+    """Return the hash of everything a rendering of a form depends on: its .ui, .qrc and pixmap files."""
+    ui = parseUi(uipath)
+    ui_dir = uiDir(uipath)
+    digest = hashlib.sha1(
+        ("pyqtuidoc-regress %d %s\n" % (REGRESS_VERSION, QtCore.QT_VERSION_STR)).encode()
+    )
+    for path in [uipath] + resourceFiles(ui, ui_dir) + assetFiles(ui, ui_dir):
+        digest.update(path.encode("utf-8", "surrogateescape") + b"\0")
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b"\0missing")
+    return digest.hexdigest()
+
+
+def thumbName(rel_path, style, dpi):
+    """Return the name of the thumbnail of a rendering relative to the baseline directory."""
+    stem = os.path.splitext(rel_path)[0].replace(os.sep, "/")
+    return "%s.%s.%d.png" % (stem, style, dpi)
+
+
+def readManifest(baseline_dir):
+    try:
+        with open(os.path.join(baseline_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def writeManifest(baseline_dir, manifest):
+    path = os.path.join(baseline_dir, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def saveImage(image, path):
+    os.makedirs(os.path.dirname(path) or os.curdir, exist_ok=True)
+    if not image.save(path, "PNG"):
+        raise IOError("unable to write %s" % path)
+
+
+def checkForm(uipath, rel_path, style, dpi, manifest, opts):
+    """
+    Check one rendering of a form against the baseline, updating the
+    baseline where there is nothing to compare against.
+    Args:
+        uipath[str]: The name of the .ui file.
+        rel_path[str]: The name of the .ui file relative to the searched directory.
+        style[str]: The widget style.
+        dpi[int]: The DPI to render at.
+        manifest[dict]: The baseline manifest, updated in place.
+        opts[Namespace]: The options of the command.
+    Returns:
+        A (status, detail) tuple.
+    """
+    key = "%s|%s|%d" % (rel_path.replace(os.sep, "/"), style, dpi)
+    entry = manifest.get(key)
+    thumb_name = thumbName(rel_path, style, dpi)
+    thumb_path = os.path.join(opts.baseline, thumb_name)
+    input_hash = inputHash(uipath)
+
+    if entry and not opts.update:
+        if entry["input"] == input_hash and os.path.exists(thumb_path):
+            return "unchanged", ""
+
+    thumb = thumbnail(renderUi(uipath, dpi / float(BASE_DPI)))
+    phash = perceptualHash(thumb)
+
+    if entry is None or opts.update:
+        saveImage(thumb, thumb_path)
+        manifest[key] = {"input": input_hash, "phash": phash}
+        return ("new" if entry is None else "updated"), phash
+
+    baseline = QtGui.QImage(thumb_path)
+    if baseline.isNull():
+        # Only the hash of the baseline rendering is left to compare with.
+        fraction, diff = (0.0 if phash == entry["phash"] else 1.0), None
+    else:
+        fraction, diff = pixelDiff(thumb, baseline, opts.tolerance)
+
+    if fraction == 0 and phash == entry["phash"]:
+        # The rendering is the same, so remember the new inputs along with a
+        # thumbnail rendered from them.
+        saveImage(thumb, thumb_path)
+        entry["input"] = input_hash
+        return "same", phash
+
+    detail = "%.2f%% pixels, %d hash bits" % (100 * fraction, hashDistance(phash, entry["phash"]))
+    if fraction <= opts.max_diff:
+        return "similar", detail
+
+    if opts.out:
+        saveImage(thumb, os.path.join(opts.out, thumb_name))
+        if diff is not None:
+            saveImage(diff, os.path.join(opts.out, thumb_name[:-4] + ".diff.png"))
+    return "changed", detail
+
+
+def cli(parser):
+    parser.add_argument(
+        "paths",
+        metavar="path",
+        nargs="+",
+        help=".ui file or directory to search for .ui files",
+    )
+    parser.add_argument(
+        "-b",
+        "--baseline",
+        dest="baseline",
+        required=True,
+        metavar="DIR",
+        help="keep the hashes and thumbnails in DIR",
+    )
+    parser.add_argument(
+        "-o",
+        "--out",
+        dest="out",
+        metavar="DIR",
+        help="write the thumbnails and diffs of changed forms to DIR",
+    )
+    parser.add_argument(
+        "--styles",
+        dest="styles",
+        default="Fusion",
+        metavar="STYLES",
+        help="comma-separated widget styles to render with [default: Fusion]",
+    )
+    parser.add_argument(
+        "--dpi",
+        dest="dpi",
+        default=str(BASE_DPI),
+        metavar="DPIS",
+        help="comma-separated DPIs to render at [default: %d]" % BASE_DPI,
+    )
+    parser.add_argument(
+        "--tolerance",
+        dest="tolerance",
+        type=int,
+        default=16,
+        metavar="N",
+        help="ignore color channel differences up to N [default: 16]",
+    )
+    parser.add_argument(
+        "--max-diff",
+        dest="max_diff",
+        type=float,
+        default=0.001,
+        metavar="FRACTION",
+        help="accept renderings with up to FRACTION different pixels [default: 0.001]",
+    )
+    parser.add_argument(
+        "-u",
+        "--update",
+        dest="update",
+        action="store_true",
+        default=False,
+        help="render all forms and accept the renderings as the new baseline",
+    )
+    return parser
+
+
+def run(opts):
+    styles = [s.strip() for s in opts.styles.split(",") if s.strip()]
+    dpis = [int(d) for d in opts.dpi.split(",") if d.strip()]
+    manifest = readManifest(opts.baseline)
+    counts = {}
+
+    forms = []
+    for path in opts.paths:
+        root = path if os.path.isdir(path) else os.path.dirname(path)
+        forms.extend((ui, os.path.relpath(ui, root)) for ui in uiFiles([path]))
+
+    try:
+        # Styles are set for the whole application, so render one at a time.
+        for style in styles:
+            setStyle(style)
+            for uipath, rel_path in forms:
+                for dpi in dpis:
+                    try:
+                        status, detail = checkForm(uipath, rel_path, style, dpi, manifest, opts)
+                    except Exception as e:
+                        status, detail = "error", str(e)
+                    counts[status] = counts.get(status, 0) + 1
+                    message = "%-9s %s %s@%d %s" % (status, rel_path, style, dpi, detail)
+                    if status in FAILURES:
+                        logging.error(message)
+                    else:
+                        logging.info(message)
+    finally:
+        os.makedirs(opts.baseline, exist_ok=True)
+        writeManifest(opts.baseline, manifest)
+
+    print(", ".join("%d %s" % (n, status) for status, n in sorted(counts.items())))
+    return 1 if any(counts.get(s) for s in FAILURES) else 0
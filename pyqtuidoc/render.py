@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Offscreen rendering of Qt Designer .ui files to images, and the image
+helpers used to compare renderings cheaply: thumbnails, perceptual hashes and
+pixel diffs.
+"""
+
+import importlib
+import logging
+import os
+import sys
+
+from PyQt5 import QtCore, QtGui, QtWidgets, uic
+
+from .uitree import parseUi, resourceFiles, uiDir
+
+# The size of the box thumbnails are scaled to fit.
+THUMB_SIZE = 256
+
+# The DPI that corresponds to a device pixel ratio of 1.
+BASE_DPI = 96
+
+# The application created by application(), kept alive for the process.
+_app = None
+
+
+def application():
+    """Return the QApplication, creating one that renders offscreen if there is none."""
+    global _app
+
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = _app = QtWidgets.QApplication([sys.argv[0] if sys.argv else "pyqtuidoc"])
+    return app
+
+
+def setStyle(name):
+    """Set the widget style of the application, e.g. "Fusion"."""
+    app = application()
+    style = QtWidgets.QStyleFactory.create(name)
+    if style is None:
+        raise ValueError("unknown style %s" % name)
+    app.setStyle(style)
+
+
+def importResources(uipath):
+    """
+    Import the pyrcc5 generated modules of the .qrc files used by a form so
+    that its resource pixmaps can be loaded. Modules that can't be imported
+    are skipped.
+    """
+    ui_dir = uiDir(uipath)
+    if ui_dir not in sys.path:
+        sys.path.append(ui_dir)
+    for qrc_path in resourceFiles(parseUi(uipath), ui_dir):
+        name = os.path.splitext(os.path.basename(qrc_path))[0] + "_rc"
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logging.debug("Unable to import %s: %s" % (name, e))
+
+
+def renderUi(uipath, scale=1.0):
+    """
+    Render a form offscreen.
+    Args:
+        uipath[str]: The name of the .ui file.
+        scale[float]: The device pixel ratio to render at.
+    Returns:
+        A QImage of the form at its default size.
+    """
+    application()
+    importResources(uipath)
+    widget = uic.loadUi(uipath)
+    try:
+        widget.setAttribute(QtCore.Qt.WA_DontShowOnScreen)
+        widget.show()
+        application().processEvents()
+        size = widget.size()
+        image = QtGui.QImage(
+            int(size.width() * scale),
+            int(size.height() * scale),
+            QtGui.QImage.Format_ARGB32_Premultiplied,
+        )
+        image.setDevicePixelRatio(scale)
+        image.fill(QtCore.Qt.transparent)
+        widget.render(image)
+    finally:
+        widget.close()
+        widget.deleteLater()
+        application().sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+    return image
+
+
+def thumbnail(image, size=THUMB_SIZE):
+    """Return a copy of an image scaled down to fit a size x size box."""
+    image = image.copy()
+    image.setDevicePixelRatio(1.0)
+    if image.width() <= size and image.height() <= size:
+        return image
+    return image.scaled(
+        size, size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation
+    )
+
+
+def perceptualHash(image):
+    """
+    Return the difference hash of an image as 16 hex digits. Similar images
+    have hashes that differ in few bits.
+    """
+    small = image.scaled(
+        9, 8, QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation
+    ).convertToFormat(QtGui.QImage.Format_Grayscale8)
+    bits = 0
+    for y in range(8):
+        for x in range(8):
+            bits = (bits << 1) | (small.pixelColor(x, y).red() < small.pixelColor(x + 1, y).red())
+    return "%016x" % bits
+
+
+def hashDistance(a, b):
+    """Return the number of bits two perceptual hashes differ in."""
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def pixelDiff(a, b, tolerance=16):
+    """
+    Compare two images pixel by pixel.
+    Args:
+        a[QImage], b[QImage]: The images.
+        tolerance[int]: The largest difference of a color channel that is
+            not counted as a difference.
+    Returns:
+        A (fraction, diff) tuple of the fraction of pixels that differ and an
+        image with the differing pixels in red, or (1.0, None) if the images
+        have different sizes.
+    """
+    if a.size() != b.size():
+        return 1.0, None
+    fmt = QtGui.QImage.Format_ARGB32
+    a = a.convertToFormat(fmt)
+    b = b.convertToFormat(fmt)
+    diff = a.convertToFormat(QtGui.QImage.Format_Grayscale8).convertToFormat(fmt)
+    red = QtGui.QColor(QtCore.Qt.red).rgba()
+    changed = 0
+    for y in range(a.height()):
+        for x in range(a.width()):
+            pa = a.pixel(x, y)
+            pb = b.pixel(x, y)
+            if pa == pb:
+                continue
+            if max(abs(((pa >> s) & 0xFF) - ((pb >> s) & 0xFF)) for s in (0, 8, 16, 24)) > tolerance:
+                changed += 1
+                diff.setPixel(x, y, red)
+    return changed / float(max(1, a.width() * a.height())), diff
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Structural comparison of two versions of a Qt Designer .ui file. Every widget,
+layout, spacer and action subtree is hashed bottom-up so that unchanged
+subtrees are matched by their hash alone, and only the parts that differ are
+compared in detail. The result lists the objects that were added, removed or
+moved and the properties that changed, rather than lines of XML.
+"""
+
+import hashlib
+import json
+import sys
+from collections import OrderedDict
+
+from .docs import valueText
+from .uitree import parseUi
+
+# The elements that are compared as objects.
+NODE_TAGS = ("widget", "layout", "spacer", "action", "actiongroup")
+
+# The attributes of a layout <item> that give the position of its object.
+POSITION_ATTRS = ("row", "column", "rowspan", "colspan", "alignment")
+
+# The top-level sections of a form that are compared as sets of entries.
+SECTIONS = ("customwidgets", "resources", "connections", "tabstops", "buttongroups", "designerdata")
+
+
+class Node:
+    """A widget, layout, spacer or action of a form."""
+
+    __slots__ = ("elem", "key", "parent", "position", "children", "own", "hash")
+
+    def __init__(self, elem, key, parent, position):
+        self.elem = elem
+        self.key = key
+        self.parent = parent
+        self.position = position
+        self.children = []
+        self.own = None
+        self.hash = None
+
+    def label(self):
+        kind = self.elem.get("class") or self.elem.tag
+        return "%s (%s)" % (self.key, kind)
+
+
+def canonical(elem):
+    """Return the serialization of an element that ignores formatting whitespace."""
+    parts = [elem.tag]
+    parts.extend("%s=%s" % item for item in sorted(elem.attrib.items()))
+    text = (elem.text or "").strip()
+    if text:
+        parts.append(text)
+    parts.extend(canonical(child) for child in elem)
+    return "<%s>" % "\x1f".join(parts)
+
+
+def ownContent(elem):
+    """
+    Return the properties, attributes and other content of an object that
+    don't belong to the objects in it, as an OrderedDict of canonical values
+    by name.
+    """
+    own = OrderedDict()
+    own["class"] = elem.get("class", "")
+    for child in elem:
+        if child.tag in ("property", "attribute"):
+            name = child.get("name", "")
+            own["%s:%s" % (child.tag, name)] = canonical(child[0]) if len(child) else ""
+        elif child.tag == "addaction":
+            own.setdefault("actions", "")
+            own["actions"] += child.get("name", "") + " "
+        elif child.tag not in NODE_TAGS and child.tag != "item":
+            own[child.tag] = canonical(child)
+    return own
+
+
+def buildTree(ui):
+    """
+    Build the object tree of a form and hash it bottom-up.
+    Args:
+        ui[Element]: The <ui> element.
+    Returns:
+        A (root, nodes) tuple of the top-level Node and an OrderedDict of all
+        the Nodes by key. The key is the object name, or a path for objects
+        without one.
+    """
+    nodes = OrderedDict()
+    top = ui.find("widget")
+    if top is None:
+        return None, nodes
+
+    def children(elem):
+        """Yield the (child element, position) of the objects directly in an element."""
+        for child in elem:
+            if child.tag in NODE_TAGS:
+                yield child, ""
+            elif child.tag == "item":
+                position = ",".join(
+                    "%s=%s" % (a, child.get(a)) for a in POSITION_ATTRS if child.get(a) is not None
+                )
+                # Items of item views (e.g. QComboBox) are content, not objects.
+                for grandchild in child:
+                    if grandchild.tag in NODE_TAGS:
+                        yield grandchild, position
+
+    def newNode(elem, parent, position, index):
+        key = elem.get("name")
+        if not key or key in nodes:
+            key = "%s/%s[%d]" % (parent.key if parent else "", elem.get("class") or elem.tag, index)
+        node = nodes[key] = Node(elem, key, parent, position)
+        return node
+
+    # Hash the tree bottom-up without recursion, as forms can be deep.
+    root = newNode(top, None, "", 0)
+    stack = [(root, False)]
+    while stack:
+        node, done = stack.pop()
+        if not done:
+            stack.append((node, True))
+            for index, (child, position) in enumerate(children(node.elem)):
+                child_node = newNode(child, node, position, index)
+                node.children.append(child_node)
+                stack.append((child_node, False))
+            continue
+        node.own = ownContent(node.elem)
+        digest = hashlib.sha1()
+        digest.update(node.key.encode("utf-8"))
+        for name, value in node.own.items():
+            digest.update(("\0%s\0%s" % (name, value)).encode("utf-8"))
+        for child in node.children:
+            digest.update(("\1%s\1%s" % (child.position, child.hash)).encode("utf-8"))
+        node.hash = digest.hexdigest()
+    return root, nodes
+
+
+def displayValue(canonical_value, elem, name):
+    """Return the readable form of a property or attribute of an element."""
+    tag, _, prop = name.partition(":")
+    if not prop:
+        return canonical_value if tag in ("class", "actions") else "(changed)"
+    for child in elem.findall(tag):
+        if child.get("name") == prop:
+            return valueText(child[0]) if len(child) else ""
+    return ""
+
+
+def sectionEntries(ui, tag):
+    section = ui.find(tag)
+    if section is None:
+        return []
+    return [canonical(child) for child in section]
+
+
+def entryText(entry):
+    """Return a short form of the canonical serialization of a section entry."""
+    return " ".join(
+        part.strip("<>") for part in entry.replace("\x1f", " ").split() if part.strip("<>")
+    )
+
+
+def diffTrees(old_ui, new_ui):
+    """
+    Compare two versions of a form.
+    Args:
+        old_ui[Element], new_ui[Element]: The <ui> elements.
+    Returns:
+        A list of changes, each a dict with a "change" of "added", "removed",
+        "moved", "changed" or "section", the "object" and the details.
+    """
+    old_root, old_nodes = buildTree(old_ui)
+    new_root, new_nodes = buildTree(new_ui)
+    changes = []
+
+    # Identical forms are recognized by the hash of the top-level widget.
+    if old_root is None or new_root is None or old_root.hash != new_root.hash:
+        # Only report the outermost of the objects that were added or removed.
+        for key, node in new_nodes.items():
+            if key not in old_nodes and (node.parent is None or node.parent.key in old_nodes):
+                changes.append(
+                    dict(change="added", object=node.label(), parent=node.parent.key if node.parent else "")
+                )
+        for key, node in old_nodes.items():
+            if key not in new_nodes and (node.parent is None or node.parent.key in new_nodes):
+                changes.append(
+                    dict(change="removed", object=node.label(), parent=node.parent.key if node.parent else "")
+                )
+
+        pending = [new_root] if new_root is not None else []
+        while pending:
+            new = pending.pop()
+            old = old_nodes.get(new.key)
+            if old is None:
+                # Existing objects may have been moved into an added one.
+                pending.extend(reversed(new.children))
+                continue
+
+            old_parent = old.parent.key if old.parent else ""
+            new_parent = new.parent.key if new.parent else ""
+            if old_parent != new_parent or old.position != new.position:
+                changes.append(
+                    dict(
+                        change="moved",
+                        object=new.label(),
+                        old=("%s %s" % (old_parent, old.position)).strip(),
+                        new=("%s %s" % (new_parent, new.position)).strip(),
+                    )
+                )
+
+            # An unchanged subtree needs no further comparison.
+            if old.hash == new.hash:
+                continue
+
+            for name in OrderedDict.fromkeys(list(old.own) + list(new.own)):
+                before = old.own.get(name)
+                after = new.own.get(name)
+                if before != after:
+                    changes.append(
+                        dict(
+                            change="changed",
+                            object=new.label(),
+                            property=name.partition(":")[2] or name,
+                            old=None if before is None else displayValue(before, old.elem, name),
+                            new=None if after is None else displayValue(after, new.elem, name),
+                        )
+                    )
+            pending.extend(reversed(new.children))
+
+    for tag in SECTIONS:
+        old_entries = sectionEntries(old_ui, tag)
+        new_entries = sectionEntries(new_ui, tag)
+        if old_entries == new_entries:
+            continue
+        for entry in new_entries:
+            if entry not in old_entries:
+                changes.append(dict(change="section", object=tag, new=entryText(entry)))
+        for entry in old_entries:
+            if entry not in new_entries:
+                changes.append(dict(change="section", object=tag, old=entryText(entry)))
+    return changes
+
+
+def formatChange(change):
+    kind = change["change"]
+    if kind in ("added", "removed"):
+        where = " in %s" % change["parent"] if change["parent"] else ""
+        return "%s %s%s" % ("+" if kind == "added" else "-", change["object"], where)
+    if kind == "moved":
+        return "> %s: %s -> %s" % (change["object"], change["old"], change["new"])
+    if kind == "changed":
+        return "~ %s.%s: %s -> %s" % (
+            change["object"],
+            change["property"],
+            "(unset)" if change["old"] is None else change["old"],
+            "(unset)" if change["new"] is None else change["new"],
+        )
+    if "new" in change:
+        return "+ %s: %s" % (change["object"], change["new"])
+    return "- %s: %s" % (change["object"], change["old"])
+
+
+def cli(parser):
+    parser.add_argument("old", metavar="old.ui", help="the original version of the form")
+    parser.add_argument("new", metavar="new.ui", help="the changed version of the form")
+    parser.add_argument(
+        "-f",
+        "--format",
+        dest="format",
+        choices=("text", "json"),
+        default="text",
+        help="output format [default: text]",
+    )
+    parser.add_argument(
+        "--exit-code",
+        dest="exit_code",
+        action="store_true",
+        default=False,
+        help="exit with status 1 if the forms differ",
+    )
+    return parser
+
+
+def run(opts):
+    changes = diffTrees(parseUi(opts.old), parseUi(opts.new))
+    if opts.format == "json":
+        json.dump(changes, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for change in changes:
+            print(formatChange(change))
+    return 1 if opts.exit_code and changes else 0
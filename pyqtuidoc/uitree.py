@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Helpers for reading Qt Designer .ui and .qrc files as plain XML, without
+instantiating any widgets.
+"""
+
+import copy
+import os
+from xml.etree import ElementTree
+
+# The tags of an iconset that name a pixmap file.
+ICON_STATES = (
+    "normaloff",
+    "normalon",
+    "disabledoff",
+    "disabledon",
+    "activeoff",
+    "activeon",
+    "selectedoff",
+    "selectedon",
+)
+
+
+def parseUi(uifile):
+    """
+    Parse a .ui file.
+    Args:
+        uifile[str|file]: The file name or file-like object of the .ui file.
+    Returns:
+        The root <ui> element.
+    """
+    return ElementTree.parse(uifile).getroot()
+
+
+def uiFiles(paths):
+    """
+    Find .ui files.
+    Args:
+        paths[list]: The names of .ui files and of directories that are
+            searched recursively for .ui files.
+    Returns:
+        A sorted list of the names of the .ui files.
+    """
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, f) for f in files if f.endswith(".ui"))
+        else:
+            found.append(path)
+    return sorted(found)
+
+
+def uiDir(uifile):
+    """Return the directory relative file names in a .ui file refer to."""
+    name = getattr(uifile, "name", uifile)
+    if not isinstance(name, str):
+        return ""
+    return os.path.dirname(os.path.abspath(name))
+
+
+def findProperty(elem, name):
+    """
+    Return the value element of a property of a widget, layout or item, or
+    None if the property isn't set.
+    """
+    for prop in elem.findall("property"):
+        if prop.attrib.get("name") == name and len(prop):
+            return prop[0]
+    return None
+
+
+def resourceFiles(ui, ui_dir=""):
+    """Return the paths of the .qrc files included by a .ui file."""
+    paths = []
+    for include in ui.iter("include"):
+        loc = include.attrib.get("location")
+        if loc and loc.endswith(".qrc"):
+            path = os.path.normpath(os.path.join(ui_dir, loc))
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def readQrc(qrc_path):
+    """
+    Read the files listed in a .qrc file.
+    Args:
+        qrc_path[str]: The path of the .qrc file.
+    Returns:
+        A dict mapping resource paths (e.g. ":/icons/ok.png") to file paths.
+    """
+    qrc_dir = os.path.dirname(qrc_path)
+    files = {}
+    for qresource in parseUi(qrc_path).iter("qresource"):
+        prefix = qresource.attrib.get("prefix", "/").strip("/")
+        for entry in qresource.iter("file"):
+            if not entry.text:
+                continue
+            name = entry.attrib.get("alias", entry.text).strip("/")
+            rpath = ":/" + "/".join(p for p in (prefix, name) if p)
+            files[rpath] = os.path.normpath(os.path.join(qrc_dir, entry.text))
+    return files
+
+
+def pixmapNames(ui):
+    """Return the file and resource names of all pixmaps used by a .ui file."""
+    names = []
+
+    def add(name):
+        if name:
+            name = name.strip()
+            if name and name not in names:
+                names.append(name)
+
+    for iconset in ui.iter("iconset"):
+        if "theme" in iconset.attrib:
+            continue
+        add(iconset.text)
+        for state in ICON_STATES:
+            add(iconset.findtext(state))
+    for pixmap in ui.iter("pixmap"):
+        add(pixmap.text)
+    return names
+
+
+def assetFiles(ui, ui_dir=""):
+    """
+    Resolve the pixmaps used by a .ui file to file paths. Resource names are
+    looked up in the .qrc files included by the .ui file; names that can't be
+    resolved are skipped.
+    """
+    resources = {}
+    for qrc_path in resourceFiles(ui, ui_dir):
+        if os.path.isfile(qrc_path):
+            resources.update(readQrc(qrc_path))
+
+    paths = []
+    for name in pixmapNames(ui):
+        if name.startswith(":"):
+            path = resources.get(name)
+        else:
+            path = os.path.normpath(os.path.join(ui_dir, name))
+        if path and path not in paths:
+            paths.append(path)
+    return paths
+
+
+def findObject(elem, name):
+    """Return the widget or layout element with an object name, or None."""
+    for child in elem.iter():
+        if child.tag in ("widget", "layout") and child.attrib.get("name") == name:
+            return child
+    return None
+
+
+def objectNames(elem):
+    """Return the set of the object names of the widgets, layouts, spacers and actions in an element."""
+    return set(
+        child.attrib["name"]
+        for child in elem.iter()
+        if child.tag in ("widget", "layout", "spacer", "action", "actiongroup")
+        and "name" in child.attrib
+    )
+
+
+def subtreeWidget(top, name):
+    """
+    Extract a subtree of a form as the top-level widget of a new form.
+    Args:
+        top[Element]: The top-level <widget> element of the form.
+        name[str]: The object name of the widget or layout at the root of the
+            subtree. A layout is put in a plain QWidget.
+    Returns:
+        A new <widget> element. The actions of the form that are used in the
+        subtree are copied into it.
+    """
+    found = findObject(top, name)
+    if found is None:
+        raise ValueError("there is no widget or layout called %s" % name)
+
+    found = copy.deepcopy(found)
+    if found.tag == "layout":
+        widget = ElementTree.Element("widget", {"class": "QWidget", "name": name + "Widget"})
+        widget.append(found)
+    else:
+        widget = found
+
+    used = set(a.attrib.get("name") for a in widget.iter("addaction"))
+    for child in top:
+        if child.tag == "action" and child.attrib.get("name") in used:
+            widget.append(copy.deepcopy(child))
+        elif child.tag == "actiongroup" and objectNames(child) & used:
+            widget.append(copy.deepcopy(child))
+    return widget
+
+
+def subtreeResources(resources, pixmaps, ui_dir=""):
+    """
+    Return a copy of a <resources> element with only the .qrc files that are
+    needed for some pixmaps. .qrc files that can't be read are assumed to be
+    needed.
+    """
+    needed = set(p for p in pixmaps if p.startswith(":"))
+    new = ElementTree.Element(resources.tag, resources.attrib)
+    for include in resources.iter("include"):
+        loc = include.attrib.get("location")
+        if loc and loc.endswith(".qrc"):
+            try:
+                provided = readQrc(os.path.join(ui_dir, loc))
+            except (OSError, ElementTree.ParseError):
+                provided = None
+            if provided is not None and not needed & set(provided):
+                continue
+        new.append(copy.deepcopy(include))
+    return new
+
+
+def subtreeConnections(connections, widget, uiname):
+    """
+    Return a copy of a <connections> element with only the connections
+    between the objects of a subtree extracted by subtreeWidget(). Connections
+    of the root of the subtree refer to it by uiname, the name of the form
+    class, as it is now the top-level widget.
+    """
+    names = objectNames(widget)
+    root = widget.attrib.get("name")
+    new = ElementTree.Element(connections.tag, connections.attrib)
+    for conn in connections:
+        if conn.findtext("sender") in names and conn.findtext("receiver") in names:
+            conn = copy.deepcopy(conn)
+            for tag in ("sender", "receiver"):
+                elem = conn.find(tag)
+                if elem.text == root:
+                    elem.text = uiname
+            new.append(conn)
+    return new
+
+
+def subtreeTabstops(tabstops, widget):
+    """Return a copy of a <tabstops> element with only the widgets below the root of a subtree."""
+    names = objectNames(widget)
+    names.discard(widget.attrib.get("name"))
+    new = ElementTree.Element(tabstops.tag, tabstops.attrib)
+    for tabstop in tabstops:
+        if tabstop.text in names:
+            new.append(copy.deepcopy(tabstop))
+    return new
+
+
+def subtreeUi(ui, name, ui_dir=""):
+    """
+    Extract a subtree of a form as a new form.
+    Args:
+        ui[Element]: The root <ui> element of the form.
+        name[str]: The object name of the widget or layout at the root of the subtree.
+        ui_dir[str]: The directory of the .ui file. If given then file
+            pixmaps are made absolute so that the new form can be loaded from
+            anywhere.
+    Returns:
+        A new root <ui> element that only has the subtree, and the connections,
+        tab stops, button groups and resources it uses.
+    """
+    top = ui.find("widget")
+    if top is None:
+        raise ValueError("the form has no widgets")
+
+    widget = subtreeWidget(top, name)
+    new = ElementTree.Element("ui", ui.attrib)
+    for child in ui:
+        if child.tag == "widget":
+            new.append(widget)
+        elif child.tag == "connections":
+            new.append(subtreeConnections(child, widget, ui.findtext("class", "")))
+        elif child.tag == "tabstops":
+            new.append(subtreeTabstops(child, widget))
+        elif child.tag == "resources":
+            new.append(subtreeResources(child, pixmapNames(widget), ui_dir))
+        else:
+            new.append(copy.deepcopy(child))
+
+    if ui_dir:
+        for elem in widget.iter():
+            if elem.tag in ("pixmap", "iconset") + ICON_STATES:
+                path = (elem.text or "").strip()
+                if path and not path.startswith(":") and not os.path.isabs(path):
+                    elem.text = os.path.join(ui_dir, path)
+    return new
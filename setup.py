@@ -54,7 +54,7 @@ setup(
     long_description_content_type="text/markdown",
     python_requires=">=3.7",
     install_requires=get_requirements("requirements.txt"),
-    extras_require={"dev": ["twine>=3.2.0"]},
+    extras_require={"dev": ["pytest>=6.0", "twine>=3.2.0"]},
     packages=find_packages(),
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -0,0 +1,67 @@
+import io
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(ROOT, "tests", "data")
+GOLDEN = os.path.join(DATA, "golden")
+
+# The custom widgets of the test forms are imported from the data directory.
+sys.path.insert(0, DATA)
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5 import QtWidgets
+
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication(["pytest"])
+
+
+@pytest.fixture(autouse=True)
+def cacheDir(tmp_path, monkeypatch):
+    """Keep anything cached by a test out of the user's cache directory."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("PYQTUIDOC_CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def compileForm(monkeypatch):
+    """
+    Return a function generating the code of a form in the data directory, so
+    that the generated code doesn't depend on where the tests are run from.
+    """
+    from pyqtuidoc._previous import compileUi
+
+    monkeypatch.chdir(DATA)
+
+    def compileForm(name, **compileUi_args):
+        pyfile = io.StringIO()
+        compileUi(name, pyfile, **compileUi_args)
+        return pyfile.getvalue()
+
+    return compileForm
+
+
+@pytest.fixture
+def golden():
+    """
+    Return a function asserting that text is the expected output stored in
+    the golden directory under a name. With PYQTUIDOC_UPDATE_GOLDEN=1 the
+    expected output is written instead.
+    """
+
+    def golden(name, text):
+        path = os.path.join(GOLDEN, name)
+        if os.environ.get("PYQTUIDOC_UPDATE_GOLDEN"):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        with open(path, encoding="utf-8") as f:
+            assert text == f.read()
+
+    return golden
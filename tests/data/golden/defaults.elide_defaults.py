@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'defaults.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.setEnabled(True)
+        self.grid = QtWidgets.QGridLayout(Dialog)
+        self.grid.setSpacing(6)
+        self.grid.setObjectName("grid")
+        self.button = QtWidgets.QPushButton(Dialog)
+        self.button.setAutoDefault(False)
+        self.button.setMaximumSize(QtCore.QSize(100, 16777215))
+        self.button.setObjectName("button")
+        self.grid.addWidget(self.button, 0, 0, 1, 1)
+        self.edit = QtWidgets.QLineEdit(Dialog)
+        self.edit.setObjectName("edit")
+        self.grid.addWidget(self.edit, 0, 1, 1, 1)
+        self.spin = QtWidgets.QSpinBox(Dialog)
+        self.spin.setProperty("value", 5)
+        self.spin.setObjectName("spin")
+        self.grid.addWidget(self.spin, 1, 0, 1, 1)
+        self.frame = QtWidgets.QFrame(Dialog)
+        self.frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame.setObjectName("frame")
+        self.grid.addWidget(self.frame, 1, 1, 1, 1)
+        self.dspin = QtWidgets.QDoubleSpinBox(Dialog)
+        self.dspin.setObjectName("dspin")
+        self.grid.addWidget(self.dspin, 2, 0, 1, 1)
+        self.tool = QtWidgets.QToolButton(Dialog)
+        self.tool.setCheckable(True)
+        self.tool.setCheckable(False)
+        self.tool.setObjectName("tool")
+        self.grid.addWidget(self.tool, 2, 1, 1, 1)
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        pass
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'sample.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(400, 300)
+        MainWindow.setStyleSheet("*#label, #label * { color: red; }\n"
+"QLabel#label2, #label2 QLabel { color: blue; }")
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.label = QtWidgets.QLabel(self.centralwidget)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        self.label.setFont(font)
+        self.label.setObjectName("label")
+        self.verticalLayout.addWidget(self.label)
+        self.label2 = QtWidgets.QLabel(self.centralwidget)
+        self.label2.setFont(font)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label2.sizePolicy().hasHeightForWidth())
+        self.label2.setSizePolicy(sizePolicy)
+        self.label2.setObjectName("label2")
+        self.verticalLayout.addWidget(self.label2)
+        self.pushButton = QtWidgets.QPushButton(self.centralwidget)
+        sizePolicy.setHeightForWidth(self.pushButton.sizePolicy().hasHeightForWidth())
+        self.pushButton.setSizePolicy(sizePolicy)
+        self.pushButton.setObjectName("pushButton")
+        self.verticalLayout.addWidget(self.pushButton)
+        self.tabWidget = QtWidgets.QTabWidget(self.centralwidget)
+        self.tabWidget.setObjectName("tabWidget")
+        self.tab1 = QtWidgets.QWidget()
+        self.tab1.setObjectName("tab1")
+        self.gridLayout = QtWidgets.QGridLayout(self.tab1)
+        self.gridLayout.setObjectName("gridLayout")
+        self.treeWidget = QtWidgets.QTreeWidget(self.tab1)
+        self.treeWidget.setObjectName("treeWidget")
+        item_0 = QtWidgets.QTreeWidgetItem(self.treeWidget)
+        item_1 = QtWidgets.QTreeWidgetItem(item_0)
+        self.gridLayout.addWidget(self.treeWidget, 0, 0, 1, 1)
+        self.selector = YSelector(self.tab1)
+        self.selector.setObjectName("selector")
+        self.gridLayout.addWidget(self.selector, 0, 1, 1, 1)
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.gridLayout.addItem(spacerItem, 1, 0, 1, 2)
+        self.tabWidget.addTab(self.tab1, "")
+        self.tab2 = QtWidgets.QWidget()
+        self.tab2.setObjectName("tab2")
+        self.checkBox = QtWidgets.QCheckBox(self.tab2)
+        self.checkBox.setGeometry(QtCore.QRect(10, 10, 80, 20))
+        self.checkBox.setObjectName("checkBox")
+        self.tabWidget.addTab(self.tab2, "")
+        self.verticalLayout.addWidget(self.tabWidget)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        self.checkBox.toggled['bool'].connect(self.label.setVisible)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Main"))
+        self.label.setToolTip(_translate("MainWindow", "A label"))
+        self.label.setText(_translate("MainWindow", "Hello"))
+        self.label2.setText(_translate("MainWindow", "World", "greeting"))
+        self.pushButton.setText(_translate("MainWindow", "Press"))
+        self.treeWidget.headerItem().setText(0, _translate("MainWindow", "Col"))
+        __sortingEnabled = self.treeWidget.isSortingEnabled()
+        self.treeWidget.setSortingEnabled(False)
+        self.treeWidget.topLevelItem(0).setText(0, _translate("MainWindow", "Item A"))
+        self.treeWidget.topLevelItem(0).child(0).setText(0, _translate("MainWindow", "Child"))
+        self.treeWidget.setSortingEnabled(__sortingEnabled)
+        self.selector.setToolTip(_translate("MainWindow", "custom"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab1), _translate("MainWindow", "First"))
+        self.checkBox.setText(_translate("MainWindow", "Check"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab2), _translate("MainWindow", "Second"))
+from yselector import YSelector
+import icons_rc
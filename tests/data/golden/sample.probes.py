@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'sample.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+import time as _time
+
+# The (name, time) events of the timing probes.  A name of None stops the
+# most recently started probe.
+_probes = []
+
+
+def _probe(name):
+    _probes.append((name, _time.perf_counter()))
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        _probe('setupUi')
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(400, 300)
+        _probe('centralwidget')
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        _probe('verticalLayout')
+        self.verticalLayout = QtWidgets.QVBoxLayout(self.centralwidget)
+        self.verticalLayout.setObjectName("verticalLayout")
+        _probe('label')
+        self.label = QtWidgets.QLabel(self.centralwidget)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        self.label.setFont(font)
+        self.label.setObjectName("label")
+        self.verticalLayout.addWidget(self.label)
+        _probe(None)
+        _probe('label2')
+        self.label2 = QtWidgets.QLabel(self.centralwidget)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(12)
+        self.label2.setFont(font)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.label2.sizePolicy().hasHeightForWidth())
+        self.label2.setSizePolicy(sizePolicy)
+        self.label2.setEnabled(True)
+        self.label2.setObjectName("label2")
+        self.verticalLayout.addWidget(self.label2)
+        _probe(None)
+        _probe('pushButton')
+        self.pushButton = QtWidgets.QPushButton(self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.pushButton.sizePolicy().hasHeightForWidth())
+        self.pushButton.setSizePolicy(sizePolicy)
+        self.pushButton.setObjectName("pushButton")
+        self.verticalLayout.addWidget(self.pushButton)
+        _probe(None)
+        _probe('tabWidget')
+        self.tabWidget = QtWidgets.QTabWidget(self.centralwidget)
+        self.tabWidget.setObjectName("tabWidget")
+        _probe('tab1')
+        self.tab1 = QtWidgets.QWidget()
+        self.tab1.setObjectName("tab1")
+        _probe('gridLayout')
+        self.gridLayout = QtWidgets.QGridLayout(self.tab1)
+        self.gridLayout.setObjectName("gridLayout")
+        _probe('treeWidget')
+        self.treeWidget = QtWidgets.QTreeWidget(self.tab1)
+        self.treeWidget.setObjectName("treeWidget")
+        item_0 = QtWidgets.QTreeWidgetItem(self.treeWidget)
+        item_1 = QtWidgets.QTreeWidgetItem(item_0)
+        self.gridLayout.addWidget(self.treeWidget, 0, 0, 1, 1)
+        _probe(None)
+        _probe('selector')
+        self.selector = YSelector(self.tab1)
+        self.selector.setObjectName("selector")
+        self.gridLayout.addWidget(self.selector, 0, 1, 1, 1)
+        _probe(None)
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.gridLayout.addItem(spacerItem, 1, 0, 1, 2)
+        _probe(None)
+        self.tabWidget.addTab(self.tab1, "")
+        _probe(None)
+        _probe('tab2')
+        self.tab2 = QtWidgets.QWidget()
+        self.tab2.setObjectName("tab2")
+        _probe('checkBox')
+        self.checkBox = QtWidgets.QCheckBox(self.tab2)
+        self.checkBox.setGeometry(QtCore.QRect(10, 10, 80, 20))
+        self.checkBox.setObjectName("checkBox")
+        _probe(None)
+        self.tabWidget.addTab(self.tab2, "")
+        _probe(None)
+        self.verticalLayout.addWidget(self.tabWidget)
+        _probe(None)
+        _probe(None)
+        MainWindow.setCentralWidget(self.centralwidget)
+        _probe(None)
+        _probe('statusbar')
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+        _probe(None)
+
+        self.retranslateUi(MainWindow)
+        self.checkBox.toggled['bool'].connect(self.label.setVisible)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+        _probe(None)
+
+    def retranslateUi(self, MainWindow):
+        _probe('retranslateUi')
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Main"))
+        self.label.setStyleSheet(_translate("MainWindow", "color: red;"))
+        self.label.setToolTip(_translate("MainWindow", "A label"))
+        self.label.setText(_translate("MainWindow", "Hello"))
+        self.label2.setStyleSheet(_translate("MainWindow", "QLabel { color: blue; }"))
+        self.label2.setText(_translate("MainWindow", "World", "greeting"))
+        self.pushButton.setText(_translate("MainWindow", "Press"))
+        self.treeWidget.headerItem().setText(0, _translate("MainWindow", "Col"))
+        __sortingEnabled = self.treeWidget.isSortingEnabled()
+        self.treeWidget.setSortingEnabled(False)
+        self.treeWidget.topLevelItem(0).setText(0, _translate("MainWindow", "Item A"))
+        self.treeWidget.topLevelItem(0).child(0).setText(0, _translate("MainWindow", "Child"))
+        self.treeWidget.setSortingEnabled(__sortingEnabled)
+        self.selector.setToolTip(_translate("MainWindow", "custom"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab1), _translate("MainWindow", "First"))
+        self.checkBox.setText(_translate("MainWindow", "Check"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab2), _translate("MainWindow", "Second"))
+        _probe(None)
+from yselector import YSelector
+import icons_rc
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'sample.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, tab2):
+        tab2.setObjectName("tab2")
+        self.checkBox = QtWidgets.QCheckBox(tab2)
+        self.checkBox.setGeometry(QtCore.QRect(10, 10, 80, 20))
+        self.checkBox.setObjectName("checkBox")
+
+        self.retranslateUi(tab2)
+        QtCore.QMetaObject.connectSlotsByName(tab2)
+
+    def retranslateUi(self, tab2):
+        _translate = QtCore.QCoreApplication.translate
+        self.checkBox.setText(_translate("MainWindow", "Check"))
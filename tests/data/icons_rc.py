@@ -0,0 +1 @@
+# The resource module of icons.qrc.  The test forms only refer to it.
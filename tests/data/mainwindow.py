@@ -0,0 +1,15 @@
+from PyQt5 import QtCore, QtWidgets
+
+
+class MainWindow(QtWidgets.QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    @QtCore.pyqtSlot()
+    def on_pushButton_clicked(self):
+        self.calls.append("pushButton")
+
+    @QtCore.pyqtSlot(bool)
+    def on_checkBox_toggled(self, checked):
+        self.calls.append(("checkBox", checked))
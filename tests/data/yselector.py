@@ -0,0 +1,5 @@
+from PyQt5 import QtWidgets
+
+
+class YSelector(QtWidgets.QWidget):
+    pass
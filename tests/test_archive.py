@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import zipfile
+
+from conftest import DATA, ROOT
+
+from pyqtuidoc._previous import compileUiDir
+
+IMPORT_FORMS = """
+import sys
+sys.path.insert(0, sys.argv[1])
+import dialog
+import sub.window
+assert dialog.__loader__.__class__.__name__ == "zipimporter"
+assert sub.window.Ui_MainWindow.__name__ == "Ui_MainWindow"
+print(sub.__path__)
+"""
+
+
+def importForms(archive):
+    # A new interpreter, so that nothing is imported from earlier tests.
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join((ROOT, DATA)))
+    return subprocess.run(
+        [sys.executable, "-c", IMPORT_FORMS, archive],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+
+def test_archive_imports(tmp_path):
+    archive = str(tmp_path / "forms.zip")
+    compileUiDir(os.path.join(DATA, "forms"), recurse=True, archive=archive)
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.namelist() == ["dialog.py", "sub/", "sub/window.py"]
+    result = importForms(archive)
+    assert result.returncode == 0, result.stderr
+    assert "forms.zip" in result.stdout
+
+
+def test_archive_pycs_are_not_checked(tmp_path):
+    archive = str(tmp_path / "forms.zip")
+    compileUiDir(os.path.join(DATA, "forms"), recurse=True, archive=archive, compile_pyc=True)
+
+    # Replace the sources: the modules must still be imported from the pycs.
+    broken = str(tmp_path / "broken.zip")
+    with zipfile.ZipFile(archive) as zf, zipfile.ZipFile(broken, "w") as out:
+        assert zf.namelist() == ["dialog.py", "dialog.pyc", "sub/", "sub/window.py", "sub/window.pyc"]
+        for info in zf.infolist():
+            data = zf.read(info)
+            if info.filename.endswith(".py"):
+                data = b"raise ImportError('the source was read')\n"
+            out.writestr(info, data)
+
+    result = importForms(broken)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,49 @@
+import io
+import os
+
+from pyqtuidoc._previous import CompileCache, compileUi
+
+FORM = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <widget class="QPushButton" name="button">
+   <property name="icon">
+    <iconset>
+     <normaloff>icons/ok.png</normaloff>icons/ok.png</iconset>
+   </property>
+  </widget>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+def compileCached(uifile, cache, **compileUi_args):
+    pyfile = io.StringIO()
+    compileUi(uifile, pyfile, cache=cache, **compileUi_args)
+    return pyfile.getvalue()
+
+
+def test_cache_hit(tmp_path, compileForm):
+    cache = CompileCache(str(tmp_path / "ui-cache"))
+    first = compileCached("sample.ui", cache)
+    assert compileCached("sample.ui", cache) == first == compileForm("sample.ui")
+    assert compileCached("sample.ui", cache, share_values=True) != first
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_cache_key_has_the_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ("a", "b"):
+        os.mkdir(name)
+        with open(os.path.join(name, "form.ui"), "w") as f:
+            f.write(FORM)
+
+    cache = CompileCache(str(tmp_path / "ui-cache"))
+    assert 'QPixmap("a/icons/ok.png")' in compileCached("a/form.ui", cache)
+    assert 'QPixmap("b/icons/ok.png")' in compileCached("b/form.ui", cache)
+    with open("a/form.ui") as uifile:
+        assert 'QPixmap("icons/ok.png")' in compileCached(uifile, cache)
@@ -0,0 +1,65 @@
+import io
+import os
+import subprocess
+import sys
+
+from conftest import DATA, ROOT
+
+
+def test_default_output(compileForm, golden):
+    golden("sample.py", compileForm("sample.ui"))
+
+
+def test_generated_code_runs(compileForm, qapp):
+    from PyQt5 import QtWidgets
+
+    namespace = {}
+    exec(compileForm("sample.ui"), namespace)
+    window = QtWidgets.QMainWindow()
+    namespace["Ui_MainWindow"]().setupUi(window)
+    assert window.findChild(QtWidgets.QLabel, "label2").text() == "World"
+
+
+def test_command_line():
+    # The vendored compiler must be importable without PyQt5.uic's modules.
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-m", "pyqtuidoc._previous", os.path.join(DATA, "sample.ui")],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "class Ui_MainWindow(object):" in result.stdout
+
+
+def test_same_output_as_pyuic5(compileForm):
+    from PyQt5 import uic
+
+    for name in ("sample.ui", "resources.ui"):
+        expected = io.StringIO()
+        uic.compileUi(name, expected)
+        # The vendored compiler predates the type comments of PyQt 5.15.6.
+        assert compileForm(name) == expected.getvalue().replace(" # type: ignore", "")
+
+
+def test_targets_sort_suffixed_resources(compileForm):
+    from pyqtuidoc._previous import compileUiTargets
+
+    targets = [(io.StringIO(), dict(resource_suffix=suffix)) for suffix in ("_rc", "")]
+    compileUiTargets("resources.ui", targets)
+    imports = [[line for line in pyfile.getvalue().splitlines() if line.startswith("import ")] for pyfile, _ in targets]
+    assert imports == [["import a_b_rc", "import a_rc"], ["import a", "import a_b"]]
+
+
+def test_header_names_the_binding(compileForm):
+    from PyQt5.QtCore import PYQT_VERSION_STR
+
+    from pyqtuidoc._previous import __version__
+
+    pyqt5 = compileForm("sample.ui").splitlines()
+    pyside2 = compileForm("sample.ui", binding="PySide2").splitlines()
+    assert pyqt5[4] == "# Created by: PyQt5 UI code generator %s" % PYQT_VERSION_STR
+    assert pyside2[4] == "# Created by: qtuidocmake %s for PySide2" % __version__
+    assert "PyQt5" not in "\n".join(pyside2)
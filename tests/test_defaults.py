@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+
+from conftest import DATA, ROOT
+from PyQt5 import QtWidgets
+
+from pyqtuidoc._previous.Compiler.defaults import defaultValues
+
+# Compiles the form with a QCoreApplication running, which can't create widgets.
+CORE_APP = """
+import sys
+from PyQt5 import QtCore
+from pyqtuidoc._previous import compileUi
+
+app = QtCore.QCoreApplication([])
+compileUi("defaults.ui", sys.stdout, elide_defaults=sys.argv[1])
+"""
+
+# Compiles the form without an application, which must not be left behind.
+NO_APP = """
+import sys
+from PyQt5 import QtCore
+from pyqtuidoc._previous import compileUi
+
+compileUi("defaults.ui", sys.stdout, elide_defaults=sys.argv[1])
+assert QtCore.QCoreApplication.instance() is None
+"""
+
+
+def compileWith(script, directory):
+    return subprocess.run(
+        [sys.executable, "-c", script, directory],
+        cwd=DATA,
+        env=dict(os.environ, PYTHONPATH=ROOT),
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stdout
+
+
+def test_elide_defaults_output(compileForm, golden, qapp):
+    golden("defaults.elide_defaults.py", compileForm("defaults.ui", elide_defaults=True))
+
+
+def test_kept_setters(compileForm, qapp):
+    code = compileForm("defaults.ui", elide_defaults=True)
+    # Set to a value other than the default.
+    assert "self.button.setMaximumSize(" in code
+    # The default depends on whether the button is in a dialog.
+    assert "self.button.setAutoDefault(False)" in code
+    # The second setter undoes the first.
+    assert "self.tool.setCheckable(True)\n        self.tool.setCheckable(False)\n" in code
+    # The top-level widget may be a subclass.
+    assert "Dialog.setEnabled(True)" in code
+
+
+def test_dropped_setters(compileForm, qapp):
+    code = compileForm("defaults.ui", elide_defaults=True)
+    for setter in [
+        "self.button.setCheckable(",
+        "self.edit.setMaxLength(",
+        "self.edit.setEchoMode(",
+        "self.frame.setFrameShape(",
+        "self.dspin.setSingleStep(",
+    ]:
+        assert setter not in code
+
+
+def test_core_application_keeps_setters(compileForm, tmp_path):
+    assert compileWith(CORE_APP, str(tmp_path / "defaults")) == compileForm("defaults.ui")
+
+
+def test_core_application_uses_known_defaults(compileForm, qapp, tmp_path):
+    directory = str(tmp_path / "defaults")
+    elided = compileForm("defaults.ui", elide_defaults=directory)
+    assert compileWith(CORE_APP, directory) == elided
+
+
+def test_no_application_is_left_behind(compileForm, qapp, tmp_path):
+    assert compileWith(NO_APP, str(tmp_path / "defaults")) == compileForm("defaults.ui", elide_defaults=True)
+
+
+def test_default_values(qapp):
+    dialog = QtWidgets.QDialog()
+    assert defaultValues(QtWidgets.QPushButton)["autoDefault"] is False
+    assert defaultValues(QtWidgets.QPushButton, dialog)["autoDefault"] is True
+    assert "objectName" in defaultValues(QtWidgets.QPushButton)
+    assert defaultValues(type("NeedsArgument", (QtWidgets.QLabel,), {"__init__": lambda self, text: None})) is None
+    dialog.deleteLater()
@@ -0,0 +1,37 @@
+import os
+import sys
+
+from conftest import DATA
+
+from pyqtuidoc._previous.depends import uiDependencies, writeDepfile
+
+
+def test_sample_depfile(tmp_path, monkeypatch):
+    monkeypatch.delitem(sys.modules, "yselector", raising=False)
+    depfile = tmp_path / "sample.py.d"
+    deps = uiDependencies(os.path.join(DATA, "sample.ui"), ["yselector"])
+    writeDepfile(str(depfile), "sample.py", deps)
+
+    assert depfile.read_text() == (
+        "sample.py: \\\n %s \\\n %s \\\n %s\n"
+        % tuple(os.path.join(DATA, name).replace("\\", "/") for name in ["sample.ui", "icons.qrc", "yselector.py"])
+    )
+    assert "yselector" not in sys.modules
+
+
+def test_modules_are_not_imported(tmp_path, monkeypatch):
+    package = tmp_path / "widgets"
+    package.mkdir()
+    (package / "__init__.py").write_text("raise RuntimeError('imported')\n")
+    (package / "dial.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    deps = uiDependencies(os.path.join(DATA, "sample.ui"), ["widgets.dial", ".yselector"])
+    assert deps[-2:] == [str(package / "dial.py"), os.path.join(DATA, "yselector.py")]
+    assert "widgets" not in sys.modules
+
+
+def test_escaping(tmp_path):
+    depfile = tmp_path / "form.d"
+    writeDepfile(str(depfile), "out dir/form.py", ["a$b.ui", "c#d.qrc"])
+    assert depfile.read_text() == "out\\ dir/form.py: \\\n a$$b.ui \\\n c\\#d.qrc\n"
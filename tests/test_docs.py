@@ -0,0 +1,50 @@
+import os
+import shutil
+
+import pytest
+from conftest import DATA
+
+from pyqtuidoc.docs import buildSite
+
+
+@pytest.fixture
+def srcDir(tmp_path):
+    path = tmp_path / "src"
+    path.mkdir()
+    for name in ["index.ui", "index-0001.ui", "dialog.ui"]:
+        shutil.copy(os.path.join(DATA, "forms", "dialog.ui"), str(path / name))
+    return path
+
+
+def read(path):
+    with open(str(path), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_form_pages_dont_clash_with_the_index(srcDir, tmp_path):
+    site = tmp_path / "site"
+    assert buildSite(str(srcDir), str(site), jobs=1, shard_size=2) == (3, 0, 0)
+
+    assert "<h1>Forms</h1>" in read(site / "index.html")
+    assert "<h1>Forms 1</h1>" in read(site / "index-0001.html")
+    assert "<h1>index.ui</h1>" in read(site / "forms" / "index.html")
+    assert "<h1>index-0001.ui</h1>" in read(site / "forms" / "index-0001.html")
+    assert 'href="forms/index-0001.html"' in read(site / "index-0001.html")
+    assert '<a href="../index.html">Index</a>' in read(site / "forms" / "dialog.html")
+
+
+def test_unchanged_pages_are_skipped(srcDir, tmp_path):
+    site = str(tmp_path / "site")
+    buildSite(str(srcDir), site, jobs=1)
+    assert buildSite(str(srcDir), site, jobs=1) == (0, 3, 0)
+    assert buildSite(str(srcDir), site, jobs=1, force=True) == (3, 0, 0)
+
+
+@pytest.mark.parametrize("force", [False, True])
+def test_pages_of_deleted_forms_are_removed(srcDir, tmp_path, force):
+    site = tmp_path / "site"
+    buildSite(str(srcDir), str(site), jobs=1)
+    os.remove(str(srcDir / "dialog.ui"))
+    buildSite(str(srcDir), str(site), jobs=1, force=force)
+
+    assert sorted(os.listdir(str(site / "forms"))) == ["index-0001.html", "index.html"]
@@ -0,0 +1,36 @@
+from PyQt5 import QtCore, QtWidgets
+
+from pyqtuidoc.__main__ import classDefaults, dumpQObject, formatQObject
+
+
+class Mixin:
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        Mixin.created += 1
+        super().__init__(*args, **kwargs)
+
+
+class NeedsArgument(Mixin, QtWidgets.QLabel):
+    def __init__(self, text):
+        super().__init__(text)
+
+
+def test_only_changed_properties(qapp):
+    button = QtWidgets.QPushButton()
+    assert formatQObject(button) == "QPushButton"
+    button.setText("OK")
+    button.setCheckable(True)
+    button.setProperty("role", "accept")
+    assert dumpQObject(button) == {"text": "OK", "checkable": True, "role": "accept"}
+    assert formatQObject(button) == "QPushButton: text='OK', checkable=True, role='accept'"
+
+
+def test_defaults_of_the_nearest_qobject_base(qapp):
+    label = NeedsArgument("Name")
+    created = Mixin.created
+    defaults = dict((prop.name(), default) for prop, default in classDefaults(NeedsArgument))
+    # The mixin isn't a QObject so a QLabel was created instead.
+    assert Mixin.created == created
+    assert defaults["text"] == ""
+    assert dumpQObject(label) == {"text": "Name"}
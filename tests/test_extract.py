@@ -0,0 +1,108 @@
+import ast
+import io
+import json
+import os
+
+import pytest
+from conftest import DATA
+
+from pyqtuidoc._previous import compileUi
+from pyqtuidoc.extract import buildCatalog, extractFiles, extractUi, writeJson, writeTs
+from pyqtuidoc.uitree import uiFiles
+
+FORM = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Strings</class>
+ <widget class="QWidget" name="Strings">
+  <property name="windowTitle"><string>Open</string></property>
+  <layout class="QVBoxLayout" name="layout">
+   <item><widget class="QPushButton" name="open">
+    <property name="text"><string comment="verb">Open</string></property>
+    <property name="toolTip"><string extracomment="Shown on hover">Open a file</string></property>
+   </widget></item>
+   <item><widget class="QLabel" name="id">
+    <property name="text"><string notr="true">ID-42</string></property>
+   </widget></item>
+   <item><widget class="QLabel" name="again">
+    <property name="text"><string>Open</string></property>
+   </widget></item>
+  </layout>
+ </widget>
+</ui>
+"""
+
+
+@pytest.fixture
+def stringsUi(tmp_path):
+    path = tmp_path / "strings.ui"
+    path.write_text(FORM)
+    return str(path)
+
+
+def translateCalls(uipath):
+    """Return the (context, source, comment) of the _translate() calls of the code generated from a form."""
+    pyfile = io.StringIO()
+    compileUi(uipath, pyfile)
+    calls = set()
+    for node in ast.walk(ast.parse(pyfile.getvalue())):
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "_translate":
+            args = [ast.literal_eval(arg) for arg in node.args]
+            calls.add((args[0], args[1], args[2] if len(args) > 2 else ""))
+    return calls
+
+
+def test_same_strings_as_the_compiler(stringsUi, monkeypatch):
+    monkeypatch.chdir(DATA)
+    for path in uiFiles([DATA]) + [stringsUi]:
+        extracted = set((context, source, comment) for context, source, comment, _, _ in extractUi(path))
+        assert extracted == translateCalls(path), path
+
+
+def test_strings(stringsUi):
+    assert extractUi(stringsUi) == [
+        ("Strings", "Open", "", "", 5),
+        ("Strings", "Open", "verb", "", 8),
+        ("Strings", "Open a file", "", "Shown on hover", 9),
+        ("Strings", "Open", "", "", 15),
+    ]
+
+
+def test_catalog_merges_duplicates(stringsUi, tmp_path):
+    other = tmp_path / "sub" / "other.ui"
+    other.parent.mkdir()
+    other.write_text(FORM)
+    catalog = buildCatalog(extractFiles([stringsUi, str(other)], jobs=1), str(tmp_path))
+
+    output = io.StringIO()
+    writeJson(catalog, output)
+    rows = json.loads(output.getvalue())
+    assert [(row["source"], row["comment"]) for row in rows] == [("Open", ""), ("Open", "verb"), ("Open a file", "")]
+    assert rows[0]["locations"] == [
+        {"filename": "strings.ui", "line": 5},
+        {"filename": "strings.ui", "line": 15},
+        {"filename": "sub/other.ui", "line": 5},
+        {"filename": "sub/other.ui", "line": 15},
+    ]
+    assert rows[2]["extracomments"] == ["Shown on hover"]
+
+
+def test_ts_output(stringsUi, tmp_path):
+    output = io.StringIO()
+    writeTs(buildCatalog(extractFiles([stringsUi], jobs=1), str(tmp_path)), output, "de_DE")
+    ts = output.getvalue()
+    assert '<TS version="2.1" language="de_DE">' in ts
+    assert "<name>Strings</name>" in ts
+    assert "<comment>verb</comment>" in ts
+    assert "<extracomment>Shown on hover</extracomment>" in ts
+    assert "ID-42" not in ts
+
+
+def test_parallel_extraction_keeps_the_order():
+    paths = uiFiles([DATA])
+    assert list(extractFiles(paths, jobs=2)) == list(extractFiles(paths, jobs=1))
+
+
+def test_unreadable_files_are_skipped(stringsUi, tmp_path):
+    broken = tmp_path / "broken.ui"
+    broken.write_text("<ui><class>")
+    assert [os.path.basename(path) for path, _ in extractFiles([str(broken), stringsUi], jobs=1)] == ["strings.ui"]
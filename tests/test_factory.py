@@ -0,0 +1,36 @@
+import os
+import shutil
+
+from conftest import DATA
+
+from pyqtuidoc._previous import FormFactory
+
+
+def test_create_and_pool(qapp):
+    factory = FormFactory(os.path.join(DATA, "forms", "dialog.ui"))
+    first = factory.create()
+    assert first.windowTitle() == "Dialog"
+    assert first.buttonBox.parent() is first
+
+    factory.fill(2)
+    pooled = list(factory._pool)
+    assert factory.create() is pooled[-1]
+    assert factory.create() is pooled[0]
+    assert factory.create() not in pooled
+
+
+def test_reload_when_changed(qapp, tmp_path):
+    uifile = str(tmp_path / "dialog.ui")
+    shutil.copy(os.path.join(DATA, "forms", "dialog.ui"), uifile)
+    factory = FormFactory(uifile, check_interval=0)
+    factory.fill(1)
+    assert factory.create().windowTitle() == "Dialog"
+
+    with open(uifile) as f:
+        text = f.read().replace("<string>Dialog</string>", "<string>Changed</string>")
+    with open(uifile, "w") as f:
+        f.write(text)
+    os.utime(uifile, ns=(0, 0))
+
+    factory.fill(1)
+    assert factory.create().windowTitle() == "Changed"
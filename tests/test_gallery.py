@@ -0,0 +1,20 @@
+import os
+
+from conftest import DATA
+
+from pyqtuidoc.gallery import ThumbnailCache
+
+
+def test_thumbnail_is_written_atomically(tmp_path, qapp, monkeypatch):
+    monkeypatch.chdir(DATA)
+    cache = ThumbnailCache(str(tmp_path), size=64)
+    image = cache.thumbnail("sample.ui")
+    path = cache.path(cache.key("sample.ui"))
+
+    assert os.listdir(os.path.dirname(path)) == [os.path.basename(path)]
+    assert max(image.width(), image.height()) == 64
+
+    # Another gallery sharing the directory reads it rather than rendering.
+    monkeypatch.setattr("pyqtuidoc.gallery.renderUi", None)
+    again = ThumbnailCache(str(tmp_path), size=64).thumbnail("sample.ui")
+    assert again.size() == image.size()
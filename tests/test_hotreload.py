@@ -0,0 +1,55 @@
+from xml.etree import ElementTree
+
+from pyqtuidoc.hotreload import diffForms
+
+FORM = """<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="windowTitle"><string>%(title)s</string></property>
+  <layout class="QVBoxLayout" name="layout">
+   <item><widget class="QGroupBox" name="group">
+    <layout class="QHBoxLayout" name="groupLayout">
+     %(group)s
+    </layout>
+   </widget></item>
+   <item><widget class="QLabel" name="label">
+    <property name="text"><string>%(label)s</string></property>
+   </widget></item>
+  </layout>
+ </widget>
+ %(extra)s
+</ui>
+"""
+
+GROUP = '<item><widget class="QPushButton" name="ok"/></item>'
+
+
+def form(title="Form", group=GROUP, label="Label", extra=""):
+    return ElementTree.fromstring(FORM % dict(title=title, group=group, label=label, extra=extra))
+
+
+def test_unchanged():
+    assert diffForms(form(), form()) == ({}, [])
+
+
+def test_property_changes():
+    assert diffForms(form(), form(title="Other", label="Text")) == ({"Form": ["windowTitle"], "label": ["text"]}, [])
+
+
+def test_changed_subtree_is_rebuilt():
+    group = GROUP + '<item><widget class="QPushButton" name="cancel"/></item>'
+    assert diffForms(form(), form(group=group, label="Text")) == ({"label": ["text"]}, ["group"])
+
+
+def test_structural_changes_reload_the_form():
+    # The top level widget has a different class.
+    dialog = form()
+    dialog.find("widget").set("class", "QDialog")
+    assert diffForms(form(), dialog) is None
+    # A widget was added to the top level widget's layout.
+    added = form()
+    item = ElementTree.SubElement(added.find("widget/layout"), "item")
+    ElementTree.SubElement(item, "widget", {"class": "QLabel", "name": "new"})
+    assert diffForms(form(), added) is None
+    # Something outside the widget tree changed.
+    assert diffForms(form(), form(extra="<resources/>")) is None
@@ -0,0 +1,64 @@
+import importlib
+import os
+import shutil
+import sys
+
+import pytest
+from conftest import DATA
+
+from pyqtuidoc._previous import CompileCache
+from pyqtuidoc._previous.importer import UiLoader, installImportHook
+
+
+@pytest.fixture
+def uiPath(tmp_path, monkeypatch):
+    """Install the import hook for a copy of a form and forget it afterwards."""
+    path = tmp_path / "dialog.ui"
+    shutil.copy(os.path.join(DATA, "forms", "dialog.ui"), str(path))
+    monkeypatch.setattr(sys, "meta_path", list(sys.meta_path))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield str(path)
+    sys.modules.pop("dialog_ui", None)
+
+
+def signature(path, **compileUi_args):
+    return UiLoader("dialog_ui", path, compileUi_args)._signature()
+
+
+def test_import_is_cached(uiPath, tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    installImportHook(cache=CompileCache(str(tmp_path / "ui-cache")))
+    module = importlib.import_module("dialog_ui")
+    assert hasattr(module, "Ui_Dialog")
+
+    # Importing it again in another run with another cache reads the .pyc.
+    sys.modules.pop("dialog_ui")
+    monkeypatch.setattr(UiLoader, "get_source", None)
+    installImportHook(cache=CompileCache(str(tmp_path / "ui-cache")))
+    assert hasattr(importlib.import_module("dialog_ui"), "Ui_Dialog")
+
+
+def test_signature_ignores_the_cache(uiPath, tmp_path):
+    assert signature(uiPath, cache=CompileCache(str(tmp_path / "a"))) == signature(
+        uiPath, cache=CompileCache(str(tmp_path / "b"))
+    )
+
+
+def test_signature_depends_on_qt(uiPath, monkeypatch):
+    before = signature(uiPath, optimize=2)
+    monkeypatch.setattr("PyQt5.QtCore.QT_VERSION_STR", "0.0.0")
+    assert signature(uiPath, optimize=2) != before
+
+
+def test_signature_depends_on_options(uiPath):
+    assert signature(uiPath, optimize=2) != signature(uiPath, optimize=2, hoist_stylesheets=False)
+
+
+def test_signature_depends_on_slots(uiPath):
+    from mainwindow import MainWindow
+
+    class Window(MainWindow):
+        def on_buttonBox_accepted(self):
+            pass
+
+    assert signature(uiPath, wire_slots=MainWindow) != signature(uiPath, wire_slots=Window)
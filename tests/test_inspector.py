@@ -0,0 +1,62 @@
+from PyQt5 import QtCore, QtWidgets
+
+from pyqtuidoc.inspector import FETCH_BATCH, ObjectTreeModel
+
+# More children than fit in two batches.
+CHILDREN = 2 * FETCH_BATCH + 10
+
+
+def makeTree():
+    root = QtCore.QObject()
+    root.setObjectName("root")
+    for i in range(CHILDREN):
+        child = QtCore.QObject(root)
+        child.setObjectName("child%d" % i)
+        QtCore.QObject(child).setObjectName("grandchild%d" % i)
+    return root
+
+
+def test_children_are_fetched_in_batches(qapp):
+    root = makeTree()
+    model = ObjectTreeModel(root)
+    top = model.index(0, 0)
+
+    assert model.rowCount() == 1
+    assert model.rowCount(top) == 0
+    assert model.hasChildren(top)
+
+    for rows in (FETCH_BATCH, 2 * FETCH_BATCH, CHILDREN):
+        assert model.canFetchMore(top)
+        model.fetchMore(top)
+        assert model.rowCount(top) == rows
+
+    assert not model.canFetchMore(top)
+    last = model.index(CHILDREN - 1, 0, top)
+    assert model.data(last) == "child%d" % (CHILDREN - 1)
+    assert model.data(model.index(0, 1, top)) == "QObject"
+    assert model.parent(last) == top
+
+
+def test_nothing_is_wrapped_until_expanded(qapp):
+    root = makeTree()
+    model = ObjectTreeModel(root)
+    view = QtWidgets.QTreeView()
+    view.setModel(model)
+    view.show()
+    qapp.processEvents()
+    top = model.index(0, 0)
+
+    assert model.node(top).children == []
+    view.expand(top)
+    qapp.processEvents()
+    # The view may fetch more batches to fill its viewport.
+    assert model.rowCount(top) in (FETCH_BATCH, 2 * FETCH_BATCH, CHILDREN)
+
+    child = model.index(0, 0, top)
+    assert model.rowCount(child) == 0
+    assert model.node(child).children == []
+    view.expand(child)
+    qapp.processEvents()
+    assert model.data(model.index(0, 0, child)) == "grandchild0"
+    # Only the expanded child has wrapped its children.
+    assert all(model.node(model.index(row, 0, top)).children == [] for row in range(1, model.rowCount(top)))
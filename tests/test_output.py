@@ -0,0 +1,44 @@
+import importlib
+import os
+
+from pyqtuidoc._previous.output import writeAtomic, writeIfChanged
+
+
+def test_write_atomic_keeps_mode(tmp_path):
+    path = tmp_path / "form.py"
+    path.write_bytes(b"old")
+    os.chmod(path, 0o640)
+    writeAtomic(str(path), b"new")
+    assert path.read_bytes() == b"new"
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    assert os.listdir(tmp_path) == ["form.py"]
+
+
+def test_write_if_changed(tmp_path):
+    path = str(tmp_path / "form.py")
+    assert writeIfChanged(path, "x = 1\n")
+    os.utime(path, (0, 0))
+    assert not writeIfChanged(path, "x = 1\n")
+    assert os.stat(path).st_mtime == 0
+    assert writeIfChanged(path, "x = 2\n")
+    with open(path) as f:
+        assert f.read() == "x = 2\n"
+
+
+def test_write_atomic_new_file_follows_umask(tmp_path):
+    umask = os.umask(0o027)
+    try:
+        writeAtomic(str(tmp_path / "form.py"), b"new")
+    finally:
+        os.umask(umask)
+    assert os.stat(str(tmp_path / "form.py")).st_mode & 0o777 == 0o640
+    assert os.listdir(str(tmp_path)) == ["form.py"]
+
+
+def test_import_leaves_umask_alone(monkeypatch):
+    import pyqtuidoc._previous.output as output
+
+    calls = []
+    monkeypatch.setattr(os, "umask", calls.append)
+    importlib.reload(output)
+    assert calls == []
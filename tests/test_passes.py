@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from conftest import DATA, ROOT
+
+from pyqtuidoc._previous import CompileCache
+from pyqtuidoc._previous.Compiler.passes import Pipeline
+
+
+def selected(optimize=0, **pass_args):
+    return [p.name for p, value in Pipeline(optimize, **pass_args).selected]
+
+
+@pytest.mark.parametrize(
+    "optimize, names",
+    [
+        (0, []),
+        (1, ["share_values"]),
+        (2, ["hoist_stylesheets", "elide_defaults", "split_lines", "share_values"]),
+    ],
+)
+def test_levels(optimize, names):
+    assert selected(optimize) == names
+
+
+def test_unset_arguments_are_enabled_by_optimize():
+    assert selected(1, share_values=None, hoist_stylesheets=None) == ["share_values"]
+
+
+@pytest.mark.parametrize("name", ["hoist_stylesheets", "share_values", "elide_defaults"])
+def test_false_disables_a_pass(name):
+    assert name not in selected(2, **{name: False})
+
+
+def test_split_lines_0_disables_splitting():
+    assert "split_lines" not in selected(2, split_lines=0)
+    assert "split_lines" in selected(0, split_lines=50)
+
+
+@pytest.mark.parametrize("optimize", [1, 2])
+def test_optimize_output(compileForm, golden, qapp, optimize):
+    golden("sample.O%d.py" % optimize, compileForm("sample.ui", optimize=optimize))
+
+
+def test_opt_out_output(compileForm, qapp):
+    assert compileForm("sample.ui", optimize=2, hoist_stylesheets=False) == compileForm(
+        "sample.ui", share_values=True, elide_defaults=True, split_lines=200
+    )
+
+
+def test_opt_out_is_cached_separately(compileForm, qapp, tmp_path):
+    cache = CompileCache(str(tmp_path / "ui-cache"))
+    hoisted = compileForm("sample.ui", optimize=2, cache=cache)
+    kept = compileForm("sample.ui", optimize=2, hoist_stylesheets=False, cache=cache)
+    assert hoisted == compileForm("sample.ui", optimize=2)
+    assert kept == compileForm("sample.ui", optimize=2, hoist_stylesheets=False)
+    assert hoisted != kept
+
+
+def test_cli_no_switch(compileForm, qapp, tmp_path):
+    output = tmp_path / "sample.py"
+    subprocess.run(
+        [sys.executable, "-m", "pyqtuidoc._previous", "sample.ui", "-O2", "--no-hoist-stylesheets", "-o", str(output)],
+        cwd=DATA,
+        env=dict(os.environ, PYTHONPATH=ROOT),
+        check=True,
+    )
+    assert output.read_text() == compileForm("sample.ui", optimize=2, hoist_stylesheets=False)
@@ -0,0 +1,83 @@
+import json
+import os
+from argparse import ArgumentParser
+
+import pytest
+
+from pyqtuidoc import perflint
+
+FORM = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="layout">
+   %s
+  </layout>
+ </widget>
+</ui>
+"""
+
+LABEL = '<item><widget class="QLabel" name="label%d"/></item>'
+STYLED = '<item><widget class="QLabel" name="styled"><property name="styleSheet"><string>color: red</string></property></widget></item>'
+COMBO = '<item><widget class="QComboBox" name="combo"><item/><item/><item/></widget></item>'
+
+
+@pytest.fixture
+def forms(tmp_path):
+    (tmp_path / "a_small.ui").write_text(FORM % LABEL % 1)
+    (tmp_path / "b_styled.ui").write_text(FORM % (LABEL % 1 + STYLED))
+    (tmp_path / "c_items.ui").write_text(FORM % COMBO)
+    return tmp_path
+
+
+def run(capsys, *args):
+    opts = perflint.cli(ArgumentParser()).parse_args(list(args))
+    status = perflint.run(opts)
+    return status, capsys.readouterr().out
+
+
+def test_score(forms):
+    small = perflint.analyzeUi(str(forms / "a_small.ui"))
+    assert (small.widgets, small.layouts, small.depth) == (2, 1, 1)
+    assert small.score == 2.5
+
+    styled = perflint.analyzeUi(str(forms / "b_styled.ui"))
+    assert styled.stylesheets == 1
+    assert styled.score == 3 + 0.5 + 25
+    assert styled.findings == ["1 widgets with their own stylesheet"]
+
+    items = perflint.analyzeUi(str(forms / "c_items.ui"))
+    assert items.items == 3
+    assert items.score == 2 + 0.5 + 1.5
+
+
+@pytest.mark.parametrize(
+    "args, names",
+    [
+        ([], ["b_styled.ui", "c_items.ui", "a_small.ui"]),
+        (["--sort", "path"], ["a_small.ui", "b_styled.ui", "c_items.ui"]),
+        (["--sort", "items", "--limit", "1"], ["c_items.ui"]),
+    ],
+)
+def test_order(forms, capsys, args, names):
+    status, out = run(capsys, str(forms), "--format", "json", *args)
+    assert status == 0
+    assert [os.path.basename(row["path"]) for row in json.loads(out)] == names
+
+
+def test_fail_above(forms, capsys):
+    assert run(capsys, str(forms), "--fail-above", "28")[0] == 1
+    assert run(capsys, str(forms), "--fail-above", "29.5")[0] == 0
+
+
+def test_fail_above_counts_forms_beyond_the_limit(forms, capsys):
+    status, out = run(capsys, str(forms), "--sort", "path", "--limit", "1", "--fail-above", "10")
+    assert "b_styled.ui" not in out
+    assert status == 1
+
+
+def test_unreadable_form_fails(forms, capsys):
+    (forms / "d_broken.ui").write_text("<ui><widget")
+    status, out = run(capsys, str(forms))
+    assert status == 1
+    assert "a_small.ui" in out
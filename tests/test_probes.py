@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+
+from conftest import DATA, ROOT
+
+
+def test_profile_command(tmp_path):
+    folded = str(tmp_path / "sample.folded")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join((ROOT, DATA)))
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pyqtuidoc",
+            "--profile",
+            "--profile-runs",
+            "2",
+            "--profile-out",
+            folded,
+            os.path.join(DATA, "sample.ui"),
+        ],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert result.returncode == 0, result.stderr
+    names = [line.split()[-1] for line in result.stdout.splitlines() if line.strip()]
+    assert "setupUi" in names
+    assert "retranslateUi" in names
+    assert "treeWidget" in names
+    with open(folded) as f:
+        assert any(line.startswith("Ui_MainWindow;setupUi;centralwidget;") for line in f)
+
+
+def test_probes_output(compileForm, golden):
+    golden("sample.probes.py", compileForm("sample.ui", probes=True))
+
+
+def test_custom_base_class(qapp, tmp_path):
+    from pyqtuidoc.probes import profileUi
+    from yselector import YSelector
+
+    uipath = tmp_path / "custom.ui"
+    uipath.write_text(
+        """<ui version="4.0">
+ <class>Custom</class>
+ <widget class="YSelector" name="Custom">
+  <layout class="QVBoxLayout" name="layout">
+   <item><widget class="QLabel" name="label"/></item>
+  </layout>
+ </widget>
+ <customwidgets>
+  <customwidget><class>YSelector</class><extends>QWidget</extends><header>yselector.h</header></customwidget>
+ </customwidgets>
+</ui>
+"""
+    )
+    tree, widget, uiclass = profileUi(str(uipath), runs=1)
+    assert type(widget) is YSelector
+    assert uiclass == "Ui_Custom"
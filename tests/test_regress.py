@@ -0,0 +1,62 @@
+import argparse
+import os
+
+import pytest
+
+from pyqtuidoc.regress import checkForm, thumbName
+from pyqtuidoc.render import setStyle
+
+FORM = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="geometry"><rect><x>0</x><y>0</y><width>160</width><height>60</height></rect></property>
+  %s
+  <layout class="QVBoxLayout" name="layout">
+   <item><widget class="QLabel" name="label"><property name="text"><string>%s</string></property></widget></item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+@pytest.fixture
+def check(qapp, tmp_path):
+    """Return a function writing a form and checking it against the baseline."""
+    setStyle("Fusion")
+    uipath = str(tmp_path / "form.ui")
+    manifest = {}
+    opts = argparse.Namespace(
+        baseline=str(tmp_path / "baseline"), out=None, update=False, tolerance=16, max_diff=0.001
+    )
+
+    def check(text, tooltip=""):
+        with open(uipath, "w", encoding="utf-8") as f:
+            f.write(FORM % ('<property name="toolTip"><string>%s</string></property>' % tooltip, text))
+        return checkForm(uipath, "form.ui", "Fusion", 96, manifest, opts)[0]
+
+    check.opts = opts
+    check.thumb_path = os.path.join(opts.baseline, thumbName("form.ui", "Fusion", 96))
+    return check
+
+
+def test_unchanged_form_is_not_rendered(check):
+    assert check("Hello") == "new"
+    assert check("Hello") == "unchanged"
+
+
+def test_same_rendering_replaces_the_thumbnail(check):
+    check("Hello")
+    os.remove(check.thumb_path)
+    assert check("Hello", tooltip="Greeting") == "same"
+    assert os.path.exists(check.thumb_path)
+    assert check("Hello", tooltip="Greeting") == "unchanged"
+
+
+def test_small_change_is_compared_by_pixels(check):
+    # The renderings have the same hash.
+    check.opts.max_diff = 0
+    check("Hello")
+    assert check("Helio") == "changed"
@@ -0,0 +1,15 @@
+def test_root_output(compileForm, golden):
+    golden("sample.root.py", compileForm("sample.ui", root="tab2"))
+
+
+def test_root_keeps_only_the_subtree(compileForm):
+    code = compileForm("sample.ui", root="tabWidget")
+    assert "self.treeWidget = " in code
+    assert "self.label" not in code
+    # The connection uses a widget outside the subtree.
+    assert ".connect(" not in code
+
+
+def test_root_keeps_only_the_resources_it_uses(compileForm):
+    assert "import icons_rc" in compileForm("sample.ui", root="pushButton")
+    assert "import icons_rc" not in compileForm("sample.ui", root="tab2")
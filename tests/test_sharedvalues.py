@@ -0,0 +1,15 @@
+def test_share_values_output(compileForm, golden):
+    golden("sample.share_values.py", compileForm("sample.ui", share_values=True))
+
+
+def test_shared_values_are_set(compileForm, qapp):
+    from PyQt5 import QtWidgets
+
+    namespace = {}
+    exec(compileForm("sample.ui", share_values=True), namespace)
+    window = QtWidgets.QMainWindow()
+    namespace["Ui_MainWindow"]().setupUi(window)
+    label, label2 = window.findChild(QtWidgets.QLabel, "label"), window.findChild(QtWidgets.QLabel, "label2")
+    assert label.font().family() == label2.font().family() == "Arial"
+    assert label.font().pointSize() == label2.font().pointSize() == 12
+    assert label2.sizePolicy().verticalPolicy() == QtWidgets.QSizePolicy.Fixed
@@ -0,0 +1,87 @@
+import pytest
+from PyQt5 import QtCore, QtWidgets
+
+
+def setupWindow(compileForm, window_class, wire_slots):
+    namespace = {}
+    exec(compileForm("sample.ui", wire_slots=wire_slots), namespace)
+    window = window_class()
+    ui = namespace["Ui_MainWindow"]()
+    ui.setupUi(window)
+    return window, ui
+
+
+def test_wire_slots_output(compileForm, golden):
+    golden(
+        "sample.wire_slots.py",
+        compileForm("sample.ui", wire_slots="mainwindow:MainWindow"),
+    )
+
+
+def test_wired_slots_are_called_once(compileForm, qapp):
+    from mainwindow import MainWindow
+
+    window, ui = setupWindow(compileForm, MainWindow, MainWindow)
+    ui.pushButton.click()
+    ui.checkBox.click()
+    assert window.calls == ["pushButton", ("checkBox", True)]
+
+
+def test_other_class_falls_back_to_connect_slots_by_name(compileForm, qapp):
+    from mainwindow import MainWindow
+
+    class SubWindow(MainWindow):
+        def on_statusbar_messageChanged(self, message):
+            self.calls.append(message)
+
+    window, ui = setupWindow(compileForm, SubWindow, MainWindow)
+    ui.statusbar.showMessage("ready")
+    assert window.calls == ["ready"]
+
+
+class Recorder(QtWidgets.QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def on_checkBox_toggled(self, checked):
+        self.calls.append(("checkBox", checked))
+
+    def on_tabWidget_currentChanged(self, index):
+        self.calls.append(("tabWidget", index))
+
+
+class Undecorated(Recorder):
+    def on_pushButton_clicked(self, *args):
+        self.calls.append(("pushButton", args))
+
+
+class BothOverloads(Recorder):
+    @QtCore.pyqtSlot()
+    @QtCore.pyqtSlot(bool)
+    def on_pushButton_clicked(self, *args):
+        self.calls.append(("pushButton", args))
+
+
+def runWindow(compileForm, window_class, wire_slots):
+    window, ui = setupWindow(compileForm, window_class, wire_slots)
+    ui.pushButton.click()
+    ui.checkBox.click()
+    ui.tabWidget.setCurrentIndex(1)
+    ui.statusbar.showMessage("ready")
+    return window.calls
+
+
+@pytest.mark.parametrize("window_class", [Recorder, Undecorated, BothOverloads])
+def test_same_calls_as_connect_slots_by_name(compileForm, qapp, window_class):
+    from mainwindow import MainWindow
+
+    for cls in [MainWindow, window_class]:
+        assert runWindow(compileForm, cls, cls) == runWindow(compileForm, cls, None)
+
+
+@pytest.mark.parametrize("window_class", [Undecorated, BothOverloads])
+def test_slots_of_several_overloads_are_left_to_connect_slots_by_name(compileForm, window_class):
+    code = compileForm("sample.ui", wire_slots=window_class)
+    assert "_slotsWired" not in code
+    assert "        QtCore.QMetaObject.connectSlotsByName(MainWindow)\n" in code
@@ -0,0 +1,16 @@
+def test_split_output(compileForm, golden):
+    golden("sample.split_lines.py", compileForm("sample.ui", split_lines=10))
+
+
+def test_split_code_runs(compileForm, qapp):
+    from PyQt5 import QtWidgets
+
+    code = compileForm("sample.ui", split_lines=5)
+    assert code.count("    def ") > 2
+    namespace = {}
+    exec(code, namespace)
+    window = QtWidgets.QMainWindow()
+    ui = namespace["Ui_MainWindow"]()
+    ui.setupUi(window)
+    assert ui.treeWidget.topLevelItem(0).text(0) == "Item A"
+    assert ui.checkBox.parent() is ui.tab2
@@ -0,0 +1,49 @@
+from xml.etree.ElementTree import fromstring
+
+import pytest
+
+from pyqtuidoc._previous.Compiler.stylesheets import hoistStyleSheets
+
+FORM = """
+<widget class="QWidget" name="Form">
+ <property name="styleSheet"><string>%s</string></property>
+ <layout class="QVBoxLayout" name="layout">
+  <item>
+   <widget class="QGroupBox" name="box">
+    <property name="styleSheet"><string>QLabel { color: blue; }</string></property>
+    <layout class="QVBoxLayout" name="boxLayout">
+     <item><widget class="QLabel" name="label"/></item>
+    </layout>
+   </widget>
+  </item>
+  <item><widget class="QPushButton" name="okButton"/></item>
+ </layout>
+</widget>
+"""
+
+
+def hoisted(top_sheet):
+    widget = fromstring(FORM % top_sheet)
+    if not hoistStyleSheets(widget):
+        return None
+    return widget.find("property/string").text
+
+
+def test_hoist_output(compileForm, golden):
+    golden("sample.hoist_stylesheets.py", compileForm("sample.ui", hoist_stylesheets=True))
+
+
+def test_hex_colors_are_hoisted():
+    assert hoisted("QWidget { background: #ff0000; border: 1px solid #00ff00; }") == (
+        "QWidget { background: #ff0000; border: 1px solid #00ff00; }\n"
+        "QLabel#box, #box QLabel { color: blue; }"
+    )
+
+
+def test_unrelated_ids_are_hoisted():
+    assert hoisted("QPushButton#okButton { color: #123456; }") is not None
+
+
+@pytest.mark.parametrize("selector", ["QLabel#label", "#box", "#Form QLabel", "QWidget#box QLabel"])
+def test_conflicting_ids_are_not_hoisted(selector):
+    assert hoisted("%s { color: green; }" % selector) is None
@@ -0,0 +1,57 @@
+from xml.etree.ElementTree import fromstring
+
+from pyqtuidoc.uidiff import diffTrees, formatChange
+
+OLD = """<ui version="4.0">
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QLabel" name="label">
+     <property name="styleSheet"><string>color: red;</string></property>
+    </widget>
+   </item>
+   <item><widget class="QPushButton" name="button"/></item>
+  </layout>
+ </widget>
+</ui>
+"""
+
+WRAPPED = """<ui version="4.0">
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QGroupBox" name="box">
+     <layout class="QVBoxLayout" name="boxLayout">
+      <item>
+       <widget class="QLabel" name="label">
+        <property name="styleSheet"><string>color: blue;</string></property>
+       </widget>
+      </item>
+     </layout>
+    </widget>
+   </item>
+   <item><widget class="QPushButton" name="button"/></item>
+  </layout>
+ </widget>
+</ui>
+"""
+
+
+def diff(old, new):
+    return [formatChange(change) for change in diffTrees(fromstring(old), fromstring(new))]
+
+
+def test_identical_forms():
+    assert diff(OLD, OLD) == []
+
+
+def test_property_change():
+    assert diff(OLD, OLD.replace("red", "green")) == ["~ label (QLabel).styleSheet: color: red; -> color: green;"]
+
+
+def test_moved_into_added_container():
+    assert diff(OLD, WRAPPED) == [
+        "+ box (QGroupBox) in verticalLayout",
+        "> label (QLabel): verticalLayout -> boxLayout",
+        "~ label (QLabel).styleSheet: color: red; -> color: blue;",
+    ]